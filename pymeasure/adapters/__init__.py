@@ -21,27 +21,43 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 #
+import importlib
 import logging
 
 from .adapter import Adapter, FakeAdapter
+from .recording import RecordingAdapter, ReplayAdapter
+from .simulated import CommandModel, SimulatedAdapter
+from .telnet import TelnetAdapter
 
 log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
-try:
-    from pymeasure.adapters.visa import VISAAdapter
-except ImportError:
-    log.warning("PyVISA library could not be loaded")
+# Adapters depending on optional libraries are imported upon first access,
+# such that importing pymeasure does not load all communication libraries
+_lazy_adapters = {
+    'VISAAdapter': ('visa', "PyVISA library could not be loaded"),
+    'ConnectionRegistry': ('registry', "PyVISA library could not be loaded"),
+    'SharedVISAAdapter': ('registry', "PyVISA library could not be loaded"),
+    'connections': ('registry', "PyVISA library could not be loaded"),
+    'SerialAdapter': ('serial', "PySerial library could not be loaded"),
+    'PrologixAdapter': ('prologix', "PySerial library could not be loaded"),
+    'VXI11Adapter': ('vxi11', "VXI-11 library could not be loaded"),
+}
 
-try:
-    from pymeasure.adapters.serial import SerialAdapter
-    from pymeasure.adapters.prologix import PrologixAdapter
-except ImportError:
-    log.warning("PySerial library could not be loaded")
 
-try:
-    from pymeasure.adapters.vxi11 import VXI11Adapter
-except ImportError:
-    log.warning("VXI-11 library could not be loaded")
+def __getattr__(name):
+    if name not in _lazy_adapters:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, message = _lazy_adapters[name]
+    try:
+        module = importlib.import_module('.' + module_name, __name__)
+    except ImportError:
+        log.warning(message)
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
 
-from pymeasure.adapters.telnet import TelnetAdapter
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_adapters))
@@ -0,0 +1,297 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2021 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+
+import base64
+import gzip
+import json
+import logging
+import time
+
+import numpy as np
+
+from .adapter import Adapter
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+def _open(filename, mode):
+    if filename.endswith('.gz'):
+        return gzip.open(filename, mode + 't', encoding='utf-8')
+    return open(filename, mode, encoding='utf-8')
+
+
+def _encode(value):
+    """ Converts the result of an adapter method to a JSON compatible object """
+    if isinstance(value, np.ndarray):
+        return {'dtype': value.dtype.str,
+                'array': base64.b64encode(value.tobytes()).decode('ascii')}
+    if isinstance(value, (bytes, bytearray)):
+        return {'bytes': base64.b64encode(value).decode('ascii')}
+    return value
+
+
+def _decode(value):
+    """ Inverse of :func:`_encode` """
+    if isinstance(value, dict):
+        if 'array' in value:
+            return np.frombuffer(base64.b64decode(value['array']),
+                                 dtype=value['dtype']).copy()
+        if 'bytes' in value:
+            return base64.b64decode(value['bytes'])
+    return value
+
+
+class RecordingAdapter(Adapter):
+    """ Adapter which wraps another adapter and records all communication with
+    the instrument to a file, which can be served back by the
+    :class:`ReplayAdapter`. Each write, read and binary transfer is stored as
+    one JSON line with its start time, duration, command and reply. File
+    names ending with '.gz' are compressed. Plain files are flushed after
+    each line, so that a crash does not lose the recording, while compressed
+    files are flushed at most every `flush_interval` seconds, since each
+    flush ends a compressed block. The file is closed by :meth:`close`, or
+    at the end of a `with` block.
+
+    .. code-block:: python
+
+        with RecordingAdapter(VISAAdapter("GPIB::24"), "keithley2000.jsonl.gz") as adapter:
+            meter = Keithley2000(adapter)
+            ...
+
+    :param adapter: The :class:`Adapter` to which the communication is passed
+    :param filename: Name of the file to record to
+    :param flush_interval: Minimum time in seconds between the flushes of a
+        compressed file
+    """
+
+    def __init__(self, adapter, filename, flush_interval=1.):
+        super().__init__(preprocess_reply=adapter.preprocess_reply)
+        self.adapter = adapter
+        self.filename = filename
+        self.flush_interval = flush_interval if filename.endswith('.gz') else 0.
+        self._file = _open(filename, 'w')
+        self._start = self._flushed = time.perf_counter()
+
+    def _record(self, method, argument, function, *args, **kwargs):
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        duration = time.perf_counter() - start
+        event = [round(start - self._start, 6), round(duration, 6), method,
+                 _encode(argument), _encode(result)]
+        self._file.write(json.dumps(event, separators=(',', ':')) + '\n')
+        if start + duration - self._flushed >= self.flush_interval:
+            self._file.flush()
+            self._flushed = start + duration
+        return result
+
+    def write(self, command):
+        """ Writes a command to the wrapped adapter and records it
+
+        :param command: SCPI command string to be sent to the instrument
+        """
+        self._record('write', command, self.adapter.write, command)
+
+    def read(self):
+        """ Reads from the wrapped adapter and records the response
+
+        :returns: String ASCII response of the instrument.
+        """
+        return self._record('read', None, self.adapter.read)
+
+    def ask(self, command):
+        """ Asks the wrapped adapter and records command and response
+
+        :param command: SCPI command string to be sent to the instrument
+        :returns: String ASCII response of the instrument
+        """
+        return self._record('ask', command, self.adapter.ask, command)
+
+    def read_bytes(self, size):
+        """ Reads bytes from the wrapped adapter and records them
+
+        :param size: Number of bytes to read
+        """
+        return self._record('read_bytes', size, self.adapter.read_bytes, size)
+
+    def ask_values(self, command, **kwargs):
+        """ Calls `ask_values` of the wrapped adapter and records the values
+
+        :param command: SCPI command to be sent to the instrument
+        :param kwargs: Key-word arguments to pass onto the wrapped adapter
+        """
+        return self._record('ask_values', command, self.adapter.ask_values,
+                            command, **kwargs)
+
+    def binary_values(self, command, header_bytes=0, dtype=np.float32):
+        """ Queries binary data from the wrapped adapter and records the array
+
+        :param command: SCPI command to be sent to the instrument
+        :param header_bytes: Integer number of bytes to ignore in header
+        :param dtype: The NumPy data type to format the values with
+        :returns: NumPy array of values
+        """
+        return self._record('binary_values', command, self.adapter.binary_values,
+                            command, header_bytes, dtype)
+
+    def write_binary_values(self, command, values, **kwargs):
+        """ Writes binary data with the wrapped adapter and records the command
+
+        :param command: SCPI command to be sent to the instrument
+        :param values: iterable representing the binary values
+        :param kwargs: Key-word arguments to pass onto the wrapped adapter
+        """
+        return self._record('write_binary_values', command,
+                            self.adapter.write_binary_values,
+                            command, values, **kwargs)
+
+    def close(self):
+        """ Closes the recording file """
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __repr__(self):
+        return "<RecordingAdapter(adapter=%r, filename='%s')>" % (
+            self.adapter, self.filename)
+
+
+class ReplayAdapter(Adapter):
+    """ Adapter which serves the communication recorded by the
+    :class:`RecordingAdapter` back, such that drivers and procedures can be
+    run and profiled with realistic traffic without the instrument. Commands
+    have to be issued in the recorded order, otherwise a ValueError is raised.
+
+    .. code-block:: python
+
+        meter = Keithley2000(ReplayAdapter("keithley2000.jsonl.gz"))
+
+    :param filename: Name of the recorded file
+    :param realtime: If True, each call takes as long as it did while recording,
+        otherwise replies are returned immediately
+    :param check_commands: If True, commands are compared to the recorded ones
+    :param preprocess_reply: optional callable used to preprocess strings
+        received from the instrument. The callable returns the processed string.
+    """
+
+    def __init__(self, filename, realtime=False, check_commands=True,
+                 preprocess_reply=None):
+        super().__init__(preprocess_reply=preprocess_reply)
+        self.filename = filename
+        self.realtime = realtime
+        self.check_commands = check_commands
+        with _open(filename, 'r') as f:
+            self.events = [json.loads(line) for line in f if line.strip()]
+        self.position = 0
+
+    @property
+    def remaining(self):
+        """ Number of recorded calls that have not been replayed yet """
+        return len(self.events) - self.position
+
+    def rewind(self):
+        """ Starts replaying from the beginning of the recording """
+        self.position = 0
+
+    def _replay(self, method, argument=None):
+        if self.position >= len(self.events):
+            raise ValueError("ReplayAdapter: recording '%s' exhausted at %s(%r)" % (
+                self.filename, method, argument))
+        _, duration, recorded_method, recorded_argument, result = \
+            self.events[self.position]
+        if self.check_commands and (method != recorded_method or
+                                    _encode(argument) != recorded_argument):
+            raise ValueError(
+                "ReplayAdapter: %s(%r) does not match the recorded %s(%r) "
+                "at position %d" % (method, argument, recorded_method,
+                                    recorded_argument, self.position))
+        self.position += 1
+        if self.realtime:
+            time.sleep(duration)
+        return _decode(result)
+
+    def write(self, command):
+        """ Checks the command against the recording
+
+        :param command: SCPI command string to be sent to the instrument
+        """
+        self._replay('write', command)
+
+    def read(self):
+        """ Returns the recorded response
+
+        :returns: String ASCII response of the instrument.
+        """
+        return self._replay('read')
+
+    def ask(self, command):
+        """ Returns the recorded response to the command
+
+        :param command: SCPI command string to be sent to the instrument
+        :returns: String ASCII response of the instrument
+        """
+        return self._replay('ask', command)
+
+    def read_bytes(self, size):
+        """ Returns the recorded bytes
+
+        :param size: Number of bytes to read
+        """
+        return self._replay('read_bytes', size)
+
+    def ask_values(self, command, **kwargs):
+        """ Returns the recorded values
+
+        :param command: SCPI command to be sent to the instrument
+        :param kwargs: Ignored
+        """
+        return self._replay('ask_values', command)
+
+    def binary_values(self, command, header_bytes=0, dtype=np.float32):
+        """ Returns the recorded NumPy array
+
+        :param command: SCPI command to be sent to the instrument
+        :param header_bytes: Ignored
+        :param dtype: Ignored, the recorded data type is used
+        :returns: NumPy array of values
+        """
+        return self._replay('binary_values', command)
+
+    def write_binary_values(self, command, values, **kwargs):
+        """ Checks the command against the recording
+
+        :param command: SCPI command to be sent to the instrument
+        :param values: Ignored
+        :param kwargs: Ignored
+        """
+        return self._replay('write_binary_values', command)
+
+    def __repr__(self):
+        return "<ReplayAdapter(filename='%s')>" % self.filename
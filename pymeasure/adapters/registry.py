@@ -0,0 +1,262 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2021 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+
+import logging
+import threading
+
+import numpy as np
+import pyvisa
+
+from .visa import VISAAdapter, get_resource_manager
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+class SharedVISAAdapter(VISAAdapter):
+    """ VISA adapter which is handed out by the :class:`ConnectionRegistry`
+    to several users of the same resource. All communication is serialized
+    by a re-entrant :attr:`lock`, which can also be used as a context manager
+    to group several calls into one transaction.
+
+    .. code-block:: python
+
+        with adapter.lock:
+            adapter.write("INIT")
+            data = adapter.ask("FETCH?")
+
+    :param resource_name: VISA resource name that identifies the address
+    :param visa_library: VisaLibrary Instance, path of the VISA library or
+        VisaLibrary spec string (@py or @ni).
+    :param kwargs: Any valid key-word arguments for :class:`VISAAdapter`
+    """
+
+    def __init__(self, resource_name, visa_library='', **kwargs):
+        self.lock = threading.RLock()
+        self.visa_library = visa_library
+        super().__init__(resource_name, visa_library=visa_library, **kwargs)
+
+    def write(self, command):
+        with self.lock:
+            super().write(command)
+
+    def read(self):
+        with self.lock:
+            return super().read()
+
+    def read_bytes(self, size):
+        with self.lock:
+            return super().read_bytes(size)
+
+    def ask(self, command):
+        with self.lock:
+            return super().ask(command)
+
+    def ask_values(self, command, **kwargs):
+        with self.lock:
+            return super().ask_values(command, **kwargs)
+
+    def values(self, command, **kwargs):
+        with self.lock:
+            return super().values(command, **kwargs)
+
+    def binary_values(self, command, header_bytes=0, dtype=np.float32):
+        with self.lock:
+            return super().binary_values(command, header_bytes, dtype)
+
+    def write_binary_values(self, command, values, **kwargs):
+        with self.lock:
+            return super().write_binary_values(command, values, **kwargs)
+
+    def wait_for_srq(self, timeout=25, delay=0.1):
+        with self.lock:
+            super().wait_for_srq(timeout, delay)
+
+    def __repr__(self):
+        return "<SharedVISAAdapter(resource='%s')>" % self.resource_name
+
+
+class ConnectionRegistry(object):
+    """ Process-wide registry of VISA connections, keyed by VISA library and
+    resource name. It reuses a single ResourceManager per VISA library and
+    hands out one :class:`SharedVISAAdapter` per resource, which is closed once
+    all users have released it. Identification strings are cached, such that
+    repeated discovery does not query the instruments again.
+
+    A default registry is available as :data:`pymeasure.adapters.connections`
+    and is used by instruments created with :code:`shared=True`.
+
+    .. code-block:: python
+
+        from pymeasure.adapters import connections
+
+        adapter = connections.acquire("GPIB0::22::INSTR")
+        print(connections.identify("GPIB0::22::INSTR"))
+        connections.release(adapter)
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._adapters = {}
+        self._refcounts = {}
+        self._idn = {}
+
+    @staticmethod
+    def _key(resource_name, visa_library=''):
+        if isinstance(resource_name, int):
+            resource_name = "GPIB0::%d::INSTR" % resource_name
+        return visa_library, resource_name
+
+    def resource_manager(self, visa_library=''):
+        """ Returns the shared ResourceManager of a VISA library.
+
+        :param visa_library: VisaLibrary Instance, path of the VISA library or
+            VisaLibrary spec string (@py or @ni).
+        """
+        return get_resource_manager(visa_library)
+
+    def acquire(self, resource_name, visa_library='', **kwargs):
+        """ Returns the shared adapter for a resource, opening it if it is not
+        yet open, and increments its reference count. Keyword arguments are
+        only used when the resource is opened.
+
+        :param resource_name: VISA resource name that identifies the address
+        :param visa_library: VisaLibrary Instance, path of the VISA library or
+            VisaLibrary spec string (@py or @ni).
+        :param kwargs: Any valid key-word arguments for :class:`VISAAdapter`
+        :returns: :class:`SharedVISAAdapter` of the resource
+        """
+        key = self._key(resource_name, visa_library)
+        with self._lock:
+            adapter = self._adapters.get(key)
+            if adapter is not None:
+                self._refcounts[key] += 1
+                return adapter
+        # open outside of the lock, such that resources can be opened concurrently
+        new_adapter = SharedVISAAdapter(key[1], visa_library=visa_library, **kwargs)
+        with self._lock:
+            adapter = self._adapters.setdefault(key, new_adapter)
+            self._refcounts[key] = self._refcounts.get(key, 0) + 1
+        if adapter is not new_adapter:  # opened by another thread meanwhile
+            self._close(new_adapter)
+        else:
+            log.debug("Opened shared connection to %s." % key[1])
+        return adapter
+
+    def release(self, adapter):
+        """ Decrements the reference count of a shared adapter and closes its
+        connection once it is no longer used.
+
+        :param adapter: :class:`SharedVISAAdapter` obtained by :meth:`acquire`
+        """
+        key = self._key(adapter.resource_name, adapter.visa_library)
+        with self._lock:
+            if self._adapters.get(key) is not adapter:
+                raise ValueError("Adapter %r is not registered" % adapter)
+            self._refcounts[key] -= 1
+            if self._refcounts[key] <= 0:
+                del self._adapters[key]
+                del self._refcounts[key]
+                self._close(adapter)
+
+    def refcount(self, resource_name, visa_library=''):
+        """ Returns the number of users of a resource. """
+        with self._lock:
+            return self._refcounts.get(self._key(resource_name, visa_library), 0)
+
+    def identify(self, resource_name, visa_library='', refresh=False, **kwargs):
+        """ Returns the stripped reply to '*IDN?' of a resource. The reply is
+        cached, so that only the first call (or a call with :code:`refresh`)
+        communicates with the instrument. An already open shared connection
+        is reused, otherwise the resource is opened temporarily. A `timeout`
+        is applied to the query in both cases.
+
+        :param resource_name: VISA resource name that identifies the address
+        :param visa_library: VisaLibrary Instance, path of the VISA library or
+            VisaLibrary spec string (@py or @ni).
+        :param refresh: Queries the instrument even if a reply is cached
+        :param kwargs: Any valid key-word arguments for :class:`VISAAdapter`,
+            used if the resource has to be opened, except for `timeout` (in
+            ms), which is also set during the query of a reused connection
+        :returns: Identification string of the instrument
+        :raises ConnectionError: If the VISA communication failed, with the
+            resource name and the VISA error, which is chained
+        """
+        key = self._key(resource_name, visa_library)
+        with self._lock:
+            if not refresh and key in self._idn:
+                return self._idn[key]
+        try:
+            adapter = self.acquire(key[1], visa_library, **kwargs)
+            try:
+                timeout = kwargs.get('timeout')
+                previous = adapter.connection.timeout
+                if timeout is not None:
+                    adapter.connection.timeout = timeout
+                try:
+                    idn = adapter.ask("*IDN?").strip()
+                finally:
+                    adapter.connection.timeout = previous
+            finally:
+                self.release(adapter)
+        except pyvisa.VisaIOError as e:
+            raise ConnectionError("Visa IO Error of %s: %s" % (key[1], e)) from e
+        with self._lock:
+            self._idn[key] = idn
+        return idn
+
+    def forget(self, resource_name=None, visa_library=''):
+        """ Clears the cached identification of a resource, or of all
+        resources if no resource name is given.
+        """
+        with self._lock:
+            if resource_name is None:
+                self._idn.clear()
+            else:
+                self._idn.pop(self._key(resource_name, visa_library), None)
+
+    def close(self):
+        """ Closes all shared connections regardless of their reference count
+        and clears the identification cache.
+        """
+        with self._lock:
+            adapters = list(self._adapters.values())
+            self._adapters.clear()
+            self._refcounts.clear()
+            self._idn.clear()
+        for adapter in adapters:
+            self._close(adapter)
+
+    @staticmethod
+    def _close(adapter):
+        try:
+            adapter.connection.close()
+        except pyvisa.Error:
+            log.exception("Failed to close connection to %s" %
+                          adapter.resource_name)
+        adapter.connection = None
+
+
+connections = ConnectionRegistry()
@@ -0,0 +1,279 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2021 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+
+import logging
+import random
+import re
+import threading
+import time
+
+import numpy as np
+
+from .adapter import Adapter
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+# regular expression matching printf-style format specifiers of set commands
+_format_specifier = re.compile(r"%[-+ #0]*\d*(?:\.\d+)?[diouxXeEfFgGcrs]")
+
+
+def _default_reply(values, map_values):
+    """ Returns a plausible reply of an instrument for a property based on the
+    values of its definition """
+    if isinstance(values, dict) and values:
+        return str(next(iter(values.values())) if map_values else next(iter(values)))
+    if isinstance(values, (list, tuple, range)) and len(values):
+        return "0" if map_values else str(values[0])
+    return "0"
+
+
+class CommandModel(object):
+    """ Declarative model of the commands of a simulated instrument, which is
+    served by the :class:`SimulatedAdapter`. Queries return fixed strings or
+    the results of callables, set commands store their value in :attr:`state`,
+    from where it is returned by the corresponding query, and binary queries
+    return an IEEE 488.2 definite length block.
+
+    The model of a driver can be derived from its
+    :meth:`Instrument.control <pymeasure.instruments.Instrument.control>`,
+    :meth:`Instrument.measurement <pymeasure.instruments.Instrument.measurement>` and
+    :meth:`Instrument.setting <pymeasure.instruments.Instrument.setting>` definitions.
+
+    .. code-block:: python
+
+        model = CommandModel.from_instrument(Keithley2000, current=lambda: "1e-6")
+        model.add_binary("TRAC:DATA?", np.zeros(1000, dtype=np.float32))
+        meter = Keithley2000(SimulatedAdapter(model, latency=0.01, jitter=0.002))
+
+    :param strict: If True, unknown commands raise a ValueError, otherwise they
+        are ignored and unknown queries are answered with an empty string
+    """
+
+    def __init__(self, strict=True):
+        self.strict = strict
+        self.state = {}
+        self._queries = {}
+        self._settings = []
+
+    def add_query(self, command, reply):
+        """ Adds a query, which is answered with the reply
+
+        :param command: Query command string
+        :param reply: String reply or callable returning the reply
+        """
+        self._queries[command] = ('reply', reply)
+
+    def add_control(self, name, get_command=None, set_command=None, default="0"):
+        """ Adds a property, which can be read by the `get_command` and
+        written by the `set_command`
+
+        :param name: Name of the property in :attr:`state`
+        :param get_command: Query command string
+        :param set_command: Command string with a printf-style format specifier
+            for the value, like in :meth:`Instrument.control <pymeasure.instruments.Instrument.control>`
+        :param default: Initial value, a string or a callable returning one
+        """
+        self.state.setdefault(name, default)
+        if get_command is not None:
+            self._queries[get_command] = ('state', name)
+        if set_command is not None:
+            parts = []
+            position = 0
+            for match in _format_specifier.finditer(set_command):
+                parts.append(re.escape(set_command[position:match.start()]))
+                parts.append("(.+?)")
+                position = match.end()
+            parts.append(re.escape(set_command[position:]))
+            pattern = "".join(parts).replace("%%", "%") + "$"
+            self._settings.append((re.compile(pattern), name))
+
+    def add_binary(self, command, data):
+        """ Adds a query, which is answered with a binary block
+
+        :param command: Query command string
+        :param data: NumPy array or callable returning a NumPy array
+        """
+        self._queries[command] = ('reply', lambda: self.binary_block(
+            data() if callable(data) else data))
+
+    @staticmethod
+    def binary_block(data):
+        """ Returns the IEEE 488.2 definite length block of a NumPy array """
+        payload = np.asarray(data).tobytes()
+        length = str(len(payload)).encode()
+        return b"#%d%s%s" % (len(length), length, payload)
+
+    @classmethod
+    def from_instrument(cls, instrument_class, strict=True, **replies):
+        """ Returns a model of all properties of an instrument class which are
+        defined with :meth:`Instrument.control <pymeasure.instruments.Instrument.control>`,
+        :meth:`Instrument.measurement <pymeasure.instruments.Instrument.measurement>` or
+        :meth:`Instrument.setting <pymeasure.instruments.Instrument.setting>`.
+
+        :param instrument_class: Class of the instrument
+        :param strict: See :class:`CommandModel`
+        :param replies: Initial values of properties by name, strings or
+            callables returning a string
+        """
+        model = cls(strict=strict)
+        for klass in reversed(instrument_class.__mro__):
+            for name, attribute in vars(klass).items():
+                if not isinstance(attribute, property):
+                    continue
+                get_command = getattr(attribute.fget, 'get_command', None)
+                set_command = getattr(attribute.fset, 'set_command', None)
+                if get_command is None and set_command is None:
+                    continue
+                definition = attribute.fset if get_command is None else attribute.fget
+                default = replies.get(name, _default_reply(
+                    definition.values, definition.map_values))
+                model.add_control(name, get_command, set_command, default)
+        return model
+
+    def respond(self, command):
+        """ Processes a command and returns the reply, or None for commands
+        without reply. Several commands can be separated by semicolons.
+
+        :param command: Command string
+        :returns: String or bytes reply, or None
+        """
+        replies = [self._respond(part.strip()) for part in command.strip().split(';')]
+        replies = [reply for reply in replies if reply is not None]
+        if not replies:
+            return None
+        if len(replies) == 1:
+            return replies[0]
+        return ';'.join(replies)
+
+    def _respond(self, command):
+        if command in self._queries:
+            kind, reply = self._queries[command]
+            if kind == 'state':
+                reply = self.state[reply]
+            if callable(reply):
+                reply = reply()
+            return reply if isinstance(reply, bytes) else str(reply)
+        for pattern, name in self._settings:
+            match = pattern.match(command)
+            if match:
+                self.state[name] = match.group(1)
+                return None
+        if self.strict:
+            raise ValueError("CommandModel: unknown command '%s'" % command)
+        log.debug("CommandModel ignores unknown command '%s'" % command)
+        return "" if command.endswith('?') else None
+
+
+class SimulatedAdapter(Adapter):
+    """ Adapter which simulates an instrument in-process according to a
+    :class:`CommandModel`, for testing and benchmarking setups with many
+    instruments without hardware. Each command takes the configured latency
+    plus a random jitter and the time to transfer the command and its reply
+    at the given throughput.
+
+    :param model: :class:`CommandModel` of the instrument
+    :param latency: Processing time of a command in seconds
+    :param jitter: Maximum random time in seconds added to the latency
+    :param throughput: Transfer rate in bytes per second, or None for no limit
+    :param command_latency: Dictionary of latencies in seconds by command
+        header (the command up to the first space), which replace `latency`
+    :param seed: Seed of the random number generator of the jitter
+    :param preprocess_reply: optional callable used to preprocess strings
+        received from the instrument. The callable returns the processed string.
+    """
+
+    def __init__(self, model, latency=0, jitter=0, throughput=None,
+                 command_latency=None, seed=None, preprocess_reply=None):
+        super().__init__(preprocess_reply=preprocess_reply)
+        self.model = model
+        self.latency = latency
+        self.jitter = jitter
+        self.throughput = throughput
+        self.command_latency = command_latency or {}
+        self._random = random.Random(seed)
+        self._buffer = bytearray()
+        self._lock = threading.Lock()
+
+    def _delay(self, command, reply):
+        delay = self.command_latency.get(command.split(' ', 1)[0], self.latency)
+        if self.jitter:
+            delay += self._random.uniform(0, self.jitter)
+        if self.throughput:
+            delay += (len(command) + len(reply)) / self.throughput
+        return delay
+
+    def write(self, command):
+        """ Processes the command by the model and stores its reply
+
+        :param command: SCPI command string to be sent to the instrument
+        """
+        with self._lock:
+            reply = self.model.respond(command)
+            if reply is None:
+                reply = b""
+            elif not isinstance(reply, bytes):
+                reply = reply.encode()
+            delay = self._delay(command, reply)
+            if delay > 0:
+                time.sleep(delay)
+            self._buffer += reply
+
+    def read(self):
+        """ Returns all stored replies
+
+        :returns: String ASCII response of the instrument.
+        """
+        with self._lock:
+            reply = self._buffer.decode()
+            self._buffer.clear()
+        return reply
+
+    def read_bytes(self, size):
+        """ Returns a number of bytes of the stored replies
+
+        :param size: Number of bytes to read
+        """
+        with self._lock:
+            reply = bytes(self._buffer[:size])
+            del self._buffer[:size]
+        return reply
+
+    def binary_values(self, command, header_bytes=0, dtype=np.float32):
+        """ Returns a numpy array from a query for binary data
+
+        :param command: SCPI command to be sent to the instrument
+        :param header_bytes: Integer number of bytes to ignore in header
+        :param dtype: The NumPy data type to format the values with
+        :returns: NumPy array of values
+        """
+        self.write(command)
+        with self._lock:
+            binary = bytes(self._buffer)
+            self._buffer.clear()
+        return np.frombuffer(binary[header_bytes:], dtype=dtype)
+
+    def __repr__(self):
+        return "<SimulatedAdapter(latency=%g, jitter=%g)>" % (self.latency, self.jitter)
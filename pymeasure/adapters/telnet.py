@@ -32,26 +32,34 @@ class TelnetAdapter(Adapter):
     """ Adapter class for using the Python telnetlib package to allow
     communication to instruments
 
+    If a `read_termination` is given, replies are read until this termination
+    is received (or `timeout` has passed), so that queries return as soon as the
+    reply is complete instead of relying on a fixed `query_delay`.
+
     :param host: host address of the instrument
     :param port: TCPIP port
     :param query_delay: delay in seconds between write and read in the ask
         method
     :param preprocess_reply: optional callable used to preprocess strings
         received from the instrument. The callable returns the processed string.
+    :param read_termination: string marking the end of a reply. If None, the
+        read method returns whatever data is available after a blocking read.
     :param kwargs: Valid keyword arguments for telnetlib.Telnet, currently
-        this is only 'timeout'
+        this is only 'timeout', which is also used as the deadline for reads
     """
 
     def __init__(self, host, port=0, query_delay=0, preprocess_reply=None,
-                 **kwargs):
+                 read_termination=None, **kwargs):
         super().__init__(preprocess_reply=preprocess_reply)
         self.query_delay = query_delay
+        self.read_termination = read_termination
         safe_keywords = ['timeout']
         for kw in kwargs:
             if kw not in safe_keywords:
                 raise TypeError(
                     f"TelnetAdapter: unexpected keyword argument '{kw}', "
                     f"allowed are: {str(safe_keywords)}")
+        self.timeout = kwargs.get('timeout', None)
         self.connection = telnetlib.Telnet(host, port, **kwargs)
 
     def write(self, command):
@@ -62,13 +70,31 @@ class TelnetAdapter(Adapter):
         self.connection.write(command.encode())
 
     def read(self):
+        """ Reads a reply of the instrument. If `read_termination` is set, the
+        reply is read up to the termination, which is stripped. Otherwise
+        something is read with blocking the I/O and afterwards whatever else
+        is available is appended.
+
+        :returns: String ASCII response of the instrument.
+        """
+        if not self.read_termination:
+            return self._read_available()
+        termination = self.read_termination.encode()
+        reply = self.connection.read_until(termination, self.timeout)
+        if not reply.endswith(termination):
+            raise TimeoutError(
+                f"TelnetAdapter: no reply termination {termination!r} received "
+                f"within {self.timeout} s, received {reply!r}")
+        return reply[:-len(termination)].decode()
+
+    def _read_available(self):
         """ Read something even with blocking the I/O. After something is
         received check again to obtain a full reply.
 
         :returns: String ASCII response of the instrument.
         """
         return self.connection.read_some().decode() + \
-                self.connection.read_very_eager().decode()
+            self.connection.read_very_eager().decode()
 
     def ask(self, command):
         """ Writes a command to the instrument and returns the resulting ASCII
@@ -78,7 +104,8 @@ class TelnetAdapter(Adapter):
         :returns: String ASCII response of the instrument
         """
         self.write(command)
-        time.sleep(self.query_delay)
+        if self.query_delay:
+            time.sleep(self.query_delay)
         return self.read()
 
     def __repr__(self):
@@ -25,15 +25,42 @@
 import logging
 
 import copy
+import re
+import threading
+
 import pyvisa
 import numpy as np
-from pkg_resources import parse_version
 
 from .adapter import Adapter
 
 log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
+_resource_managers = {}
+_resource_managers_lock = threading.Lock()
+
+
+def get_resource_manager(visa_library=''):
+    """ Returns the process-wide PyVISA ResourceManager for a VISA library,
+    creating it upon first use. Sharing the ResourceManager avoids loading
+    the VISA library and opening a new session for every adapter.
+
+    :param visa_library: VisaLibrary Instance, path of the VISA library or
+        VisaLibrary spec string (@py or @ni).
+    :returns: :class:`pyvisa.ResourceManager` instance
+    """
+    with _resource_managers_lock:
+        manager = _resource_managers.get(visa_library)
+        if manager is not None:
+            try:
+                manager.session
+            except pyvisa.errors.InvalidSession:  # closed in the meantime
+                manager = None
+        if manager is None:
+            manager = pyvisa.ResourceManager(visa_library)
+            _resource_managers[visa_library] = manager
+        return manager
+
 
 # noinspection PyPep8Naming,PyUnresolvedReferences
 class VISAAdapter(Adapter):
@@ -56,7 +83,7 @@ class VISAAdapter(Adapter):
         if isinstance(resource_name, int):
             resource_name = "GPIB0::%d::INSTR" % resource_name
         self.resource_name = resource_name
-        self.manager = pyvisa.ResourceManager(visa_library)
+        self.manager = get_resource_manager(visa_library)
         safeKeywords = [
             'resource_name', 'timeout', 'chunk_size', 'lock', 'query_delay', 'send_end',
             'read_termination', 'write_termination'
@@ -74,7 +101,8 @@ class VISAAdapter(Adapter):
     def has_supported_version():
         """ Returns True if the PyVISA version is greater than 1.8 """
         if hasattr(pyvisa, '__version__'):
-            return parse_version(pyvisa.__version__) >= parse_version('1.8')
+            version = tuple(int(v) for v in re.findall(r"\d+", pyvisa.__version__)[:2])
+            return version >= (1, 8)
         else:
             return False
 
@@ -21,16 +21,28 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 #
+import importlib
 import logging
 
 log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
-try:
-    from .manager import Manager
-    from .plotter import Plotter
-except ImportError:
-    log.warning("Python bindings for Qt (PySide, PyQt) can not be imported")
+# Qt is imported upon first access of these classes, such that importing
+# pymeasure.display does not load the Qt bindings
+_lazy_classes = {'Manager': 'manager', 'Plotter': 'plotter'}
+
+
+def __getattr__(name):
+    if name not in _lazy_classes:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        module = importlib.import_module('.' + _lazy_classes[name], __name__)
+    except ImportError:
+        log.warning("Python bindings for Qt (PySide, PyQt) can not be imported")
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
 
 
 def run_in_ipython(app):
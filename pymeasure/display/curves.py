@@ -41,13 +41,73 @@ def _greyscale_colormap(x):
     """Simple greyscale colormap. Assumes x is already normalized."""
     return np.array([x,x,x,1])
 
+def decimation_step(size, width):
+    """ Returns the number of samples per bin, a power of two, to reduce
+    `size` samples to at most one minimum and maximum per pixel of `width`
+    """
+    if width <= 0 or size <= 2 * width:
+        return 1
+    return 2 ** int(np.ceil(np.log2(size / width)))
+
+
+def peak_indices(y, step):
+    """ Returns the sorted indices of the minimum and the maximum of each bin
+    of `step` values of y, so that decimated curves keep their peaks. The last
+    bin may be shorter. NaN values are only chosen for bins without numbers.
+    """
+    bins = -(-len(y) // step)
+    blocks = np.full(bins * step, np.nan)
+    blocks[:len(y)] = y
+    blocks = blocks.reshape(bins, step)
+    nans = np.isnan(blocks)
+    lower = np.where(nans, np.inf, blocks).argmin(axis=1)
+    upper = np.where(nans, -np.inf, blocks).argmax(axis=1)
+    offsets = np.arange(bins) * step
+    return np.column_stack((np.minimum(lower, upper) + offsets,
+                            np.maximum(lower, upper) + offsets)).ravel()
+
+
+def _merge_peaks(peaks, y, factor):
+    """ Merges the peak indices of each `factor` consecutive bins into the
+    peak indices of one bin, dropping the incomplete group at the end """
+    bins = len(peaks) // (2 * factor)
+    groups = peaks[:bins * 2 * factor].reshape(bins, 2 * factor)
+    values = y[groups]
+    nans = np.isnan(values)
+    lower = np.where(nans, np.inf, values).argmin(axis=1)
+    upper = np.where(nans, -np.inf, values).argmax(axis=1)
+    rows = np.arange(bins)
+    return np.sort(np.column_stack((groups[rows, lower], groups[rows, upper])),
+                   axis=1).ravel()
+
+
 class ResultsCurve(pg.PlotDataItem):
     """ Creates a curve loaded dynamically from a file through the Results
     object and supports error bars. The data can be forced to fully reload
     on each update, useful for cases when the data is changing across the full
     file instead of just appending.
+
+    Only the rows which arrived since the last update are read from the
+    results. Curves with more points than pixels are decimated to the minimum
+    and maximum of each pixel column, which keeps the peaks. The peaks of the
+    full curve are kept between updates, so that appending points costs in
+    proportion to the new points. When the view is zoomed in on a curve with
+    increasing x values, only the visible part is decimated and drawn.
+
+    An evicted curve keeps only the decimated points drawn as a preview, also
+    when the view changes, until it is updated explicitly, e.g. by
+    :meth:`.Manager.touch`.
+
+    Accelerated curves skip the check for non-finite values while their
+    data is finite, and otherwise only connect the finite points.
+
+    The error bars of the columns `xerr` and `yerr` are drawn at the points
+    of the curve which remain after the decimation.
     """
 
+    #: Width in pixels to decimate to when the curve is not shown in a view
+    DECIMATION_WIDTH = 2000
+
     def __init__(self, results, x, y, xerr=None, yerr=None,
                  force_reload=False, **kwargs):
         super().__init__(**kwargs)
@@ -55,37 +115,190 @@ class ResultsCurve(pg.PlotDataItem):
         self.pen = kwargs.get('pen', None)
         self.x, self.y = x, y
         self.force_reload = force_reload
+        self.xerr, self.yerr = xerr, yerr
         if xerr or yerr:
             self._errorBars = pg.ErrorBarItem(pen=kwargs.get('pen', None))
-            self.xerr, self.yerr = xerr, yerr
+            self._errorBars.setParentItem(self)
+        self.evicted = False
+        self.accelerated = False
+        self.clear_data()
+
+    def clear_data(self):
+        """ Discards the points read from the results, so that the next
+        update reads all of them, e.g. after changing the columns """
+        self._xdata = np.empty(0)
+        self._ydata = np.empty(0)
+        self._xerrdata = np.empty(0)
+        self._yerrdata = np.empty(0)
+        self._beam = 0
+        self._size = 0
+        self._rows = 0
+        self._increasing = True
+        self._finite = True
+        self._peaks = np.empty(0, dtype=int)
+        self._peaks_step = 1
+        self._peaks_end = 0
+        self._view = None
+        self._version = None
+
+    def needs_update(self):
+        """ Returns True if the results changed since the last update, or if
+        it is not known whether they changed. Evicted curves are not updated
+        until they are updated explicitly. """
+        if self.evicted:
+            return False
+        version = getattr(self.results, 'version', None)
+        return self.force_reload or version is None or version != self._version
+
+    def evict(self):
+        """ Drops the points read from the results, keeping a copy of the
+        decimated points drawn as a preview """
+        if self.xData is not None:
+            self.setData(np.array(self.xData), np.array(self.yData))
+        if hasattr(self, '_errorBars'):
+            self._errorBars.setOpts(**{
+                key: np.array(self._errorBars.opts[key])
+                for key in ('x', 'y', 'left', 'right', 'top', 'bottom')
+                if self._errorBars.opts[key] is not None})
+        self.clear_data()
+        self.evicted = True
 
     def update(self):
         """Updates the data by polling the results"""
+        self.evicted = False
+        self._version = getattr(self.results, 'version', None)
         if self.force_reload:
             self.results.reload()
         data = self.results.data  # get the current snapshot
 
-        # Set x-y data
-        self.setData(data[self.x], data[self.y])
+        if self.force_reload or len(data) < self._rows:
+            self.clear_data()
+        if len(data) > self._rows:
+            new_data = data.iloc[self._rows:]
+            errors = [None if column is None else new_data[column].to_numpy(dtype=float)
+                      for column in (self.xerr, self.yerr)]
+            self._append(new_data[self.x].to_numpy(dtype=float),
+                         new_data[self.y].to_numpy(dtype=float), *errors)
+            self._rows = len(data)
+
+        # Set x-y data and error bars
+        self.redraw()
+
+    def _append(self, x, y, xerr=None, yerr=None):
+        """ Appends points and their errors to the buffers, which grow by
+        doubling """
+        size = self._size + len(x)
+        names = ['_xdata', '_ydata']
+        names += [name for name, errors in (('_xerrdata', xerr), ('_yerrdata', yerr))
+                  if errors is not None]
+        if size > len(self._xdata):
+            capacity = max(size, 2 * len(self._xdata), 1024)
+            for name in names:
+                buffer = np.empty(capacity)
+                buffer[:self._size] = getattr(self, name)[:self._size]
+                setattr(self, name, buffer)
+        for name, errors in (('_xerrdata', xerr), ('_yerrdata', yerr)):
+            if errors is not None:
+                getattr(self, name)[self._size:size] = errors
+                if np.isfinite(errors).any():
+                    self._beam = max(self._beam, np.nanmax(errors))
+        if self._increasing and len(x):
+            previous = self._xdata[self._size - 1:self._size]
+            self._increasing = bool(np.all(np.diff(np.concatenate((previous, x))) >= 0))
+        self._xdata[self._size:size] = x
+        self._ydata[self._size:size] = y
+        self._size = size
+        self._finite = self._finite and bool(np.isfinite(x).all() and np.isfinite(y).all())
+
+    def _view_window(self):
+        """ Returns the visible x range, or None if the whole curve is to be
+        drawn, and the width of the view in pixels """
+        view = self.getViewBox()
+        if not isinstance(view, pg.ViewBox):
+            return None, self.DECIMATION_WIDTH
+        width = int(view.width()) or self.DECIMATION_WIDTH
+        if view.autoRangeEnabled()[0] or not self._increasing:
+            return None, width
+        return tuple(view.viewRange()[0]), width
+
+    def _full_peaks(self, width):
+        """ Returns the peak indices of the whole curve, extending and merging
+        the peaks of the previous update """
+        y = self._ydata[:self._size]
+        step = decimation_step(self._size, width)
+        if step < self._peaks_step:
+            self._peaks, self._peaks_end = np.empty(0, dtype=int), 0
+        elif step > self._peaks_step:
+            factor = step // self._peaks_step
+            self._peaks = _merge_peaks(self._peaks, y, factor)
+            self._peaks_end = len(self._peaks) // 2 * step
+        self._peaks_step = step
+
+        end = self._peaks_end + (self._size - self._peaks_end) // step * step
+        if end > self._peaks_end:
+            self._peaks = np.concatenate((self._peaks, self._peaks_end +
+                                          peak_indices(y[self._peaks_end:end], step)))
+            self._peaks_end = end
+        tail = end + peak_indices(y[end:], step) if end < self._size else []
+        return np.concatenate(([0], self._peaks, tail, [self._size - 1])).astype(int)
+
+    def set_accelerated(self, accelerated):
+        """ Sets whether the curve is drawn with the accelerated options """
+        if accelerated != self.accelerated:
+            self.accelerated = accelerated
+            if self._size:
+                self.redraw()
+
+    def _draw_options(self):
+        """ Returns the options of setData for the accelerated drawing """
+        if not self.accelerated:
+            return {'skipFiniteCheck': False, 'connect': 'auto'}
+        return {'skipFiniteCheck': self._finite,
+                'connect': 'all' if self._finite else 'finite'}
+
+    def redraw(self):
+        """ Draws the points of the curve, decimated to the width of the view
+        and clipped to the visible range """
+        window, width = self._view_window()
+        self._view = (window, width, self._size)
+        x, y = self._xdata[:self._size], self._ydata[:self._size]
+        start, stop = 0, self._size
+        if window is not None:
+            # keep one point beyond each edge to draw the lines to the edges
+            start = max(np.searchsorted(x, window[0]) - 1, 0)
+            stop = min(np.searchsorted(x, window[1], side='right') + 1, self._size)
+
+        step = decimation_step(stop - start, width)
+        if step == 1:
+            points = slice(start, stop)
+        elif window is None:
+            points = self._full_peaks(width)
+        else:
+            points = np.concatenate(([start], start + peak_indices(y[start:stop], step),
+                                     [stop - 1]))
+        self.setData(x[points], y[points], **self._draw_options())
 
         # Set error bars if enabled at construction
         if hasattr(self, '_errorBars'):
-            self._errorBars.setOpts(
-                x=data[self.x],
-                y=data[self.y],
-                top=data[self.yerr],
-                bottom=data[self.yerr],
-                left=data[self.xerr],
-                right=data[self.yerr],
-                beam=max(data[self.xerr], data[self.yerr])
-            )
+            xerr = self._xerrdata[:self._size][points] if self.xerr else None
+            yerr = self._yerrdata[:self._size][points] if self.yerr else None
+            self._errorBars.setData(x=x[points], y=y[points], left=xerr, right=xerr,
+                                    top=yerr, bottom=yerr, beam=self._beam)
+
+    def viewRangeChanged(self, vb=None, ranges=None, changed=None):
+        super().viewRangeChanged(vb, ranges, changed)
+        if not self.evicted and self._size and self._view != self._view_window() + (self._size,):
+            self.redraw()
 
 
 # TODO: Add method for changing x and y
 
 class ResultsImage(pg.ImageItem):
     """ Creates an image loaded dynamically from a file through the Results
-    object."""
+    object. Only the pixels of the data points which arrived since the last
+    update are set, and the values are mapped to colors by pyqtgraph with the
+    levels and lookup table of the image. Pixels without data are transparent.
+    """
     def __init__(self, results, x, y, z, force_reload=False):
         self.results = results
         self.x = x
@@ -99,108 +312,197 @@ class ResultsImage(pg.ImageItem):
         self.yend = getattr(self.results.procedure, self.y + '_end')
         self.ystep = getattr(self.results.procedure, self.y + '_step')
         self.ysize = int(np.ceil((self.yend - self.ystart) / self.ystep)) + 1
-        self.img_data = np.zeros((self.ysize,self.xsize,4))
+        self.img_data = np.full((self.ysize, self.xsize), np.nan)
         self.force_reload = force_reload
         if 'matplotlib.cm' in sys.modules:
             self.colormap = viridis
         else:
             self.colormap = _greyscale_colormap
+        self.lut = self.make_lut(self.colormap)
+        self._rows = 0  # number of data points in the image
+        self._levels = None
+        self._version = None
+
+        # the image is transposed, since pyqtgraph assumes column-major order
+        super().__init__(image=self.img_data.T, lut=self.lut, autoLevels=False)
 
-        super().__init__(image=self.img_data)
-        
         # Scale and translate image so that the pixels are in the coorect
         # position in "data coordinates"
         self.scale(self.xstep, self.ystep)
         self.translate(int(self.xstart/self.xstep)-0.5,
                        int(self.ystart/self.ystep)-0.5) # 0.5 so pixels centered
 
+    @staticmethod
+    def make_lut(colormap, size=256):
+        """ Returns the lookup table of RGBA values of a colormap, which maps
+        normalized values to RGBA tuples """
+        colors = np.array([colormap(value) for value in np.linspace(0, 1, size)])
+        return (255 * np.clip(colors, 0, 1)).astype(np.ubyte)
+
+    def clear_img(self):
+        """ Removes all data points from the image """
+        self.img_data[:] = np.nan
+        self._rows = 0
+        self._levels = None
+        self._version = None
+
+    def needs_update(self):
+        """ Returns True if the results changed since the last update, or if
+        it is not known whether they changed """
+        version = getattr(self.results, 'version', None)
+        return self.force_reload or version is None or version != self._version
+
     def update_img(self):
+        self._version = getattr(self.results, 'version', None)
         if self.force_reload:
             self.results.reload()
 
         data = self.results.data
-        zmin = data[self.z].min()
-        zmax = data[self.z].max()
+        if self.force_reload or len(data) < self._rows:
+            self.clear_img()
+        if len(data) == self._rows:
+            return
 
         # populate the image array with the new data
-        for idx, row in data.iterrows():
-            xdat = row[self.x]
-            ydat = row[self.y]
-            xidx, yidx = self.find_img_index(xdat, ydat)
-            self.img_data[yidx,xidx,:] = self.colormap((row[self.z] - zmin)/(zmax-zmin))
-
-        # set image data, need to transpose since pyqtgraph assumes column-major order
-        self.setImage(image=np.transpose(self.img_data,axes=(1,0,2)))
+        new = data.iloc[self._rows:]
+        xidx, yidx = self.find_img_index(new[self.x].to_numpy(dtype=float),
+                                         new[self.y].to_numpy(dtype=float))
+        z = new[self.z].to_numpy(dtype=float)
+        self.img_data[yidx, xidx] = z
+        self._rows = len(data)
+
+        if np.isfinite(z).any():
+            zmin, zmax = np.nanmin(z), np.nanmax(z)
+            if self._levels is not None:
+                zmin, zmax = min(zmin, self._levels[0]), max(zmax, self._levels[1])
+            self._levels = (zmin, zmax)
+
+        self.setImage(image=self.img_data.T, levels=self._levels, lut=self.lut,
+                      autoLevels=False)
 
     def find_img_index(self, x, y):
         """ Finds the integer image indices corresponding to the
-        closest x and y points of the data given some x and y data.
+        closest x and y points of the data given some x and y data,
+        which can be numbers or arrays.
         """
-
-        indices = [self.xsize-1,self.ysize-1] # default to the final pixel
-        if self.xstart <= x <= self.xend: # only change if within reasonable range
-            indices[0] = self.round_up((x - self.xstart)/self.xstep)
-        if self.ystart <= y <= self.yend:
-            indices[1] = self.round_up((y - self.ystart)/self.ystep)
-
-        return indices
+        x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+        # default to the final pixel, only change if within reasonable range
+        xidx = np.where((self.xstart <= x) & (x <= self.xend),
+                        self.round_up((x - self.xstart) / self.xstep), self.xsize - 1)
+        yidx = np.where((self.ystart <= y) & (y <= self.yend),
+                        self.round_up((y - self.ystart) / self.ystep), self.ysize - 1)
+        xidx, yidx = xidx.astype(int), yidx.astype(int)
+        if xidx.ndim == 0:
+            return [int(xidx), int(yidx)]
+        return xidx, yidx
 
     def round_up(self, x):
         """Convenience function since numpy rounds to even"""
-        if x%1 >= 0.5:
-            return int(x) + 1
-        else:
-            return int(x)
+        rounded = np.floor(np.asarray(x) + 0.5).astype(int)
+        return int(rounded) if rounded.ndim == 0 else rounded
 
     # TODO: colormap selection
 
 
 class BufferCurve(pg.PlotDataItem):
     """ Creates a curve based on a predefined buffer size and allows
-    data to be added dynamically, in additon to supporting error bars
+    data to be added dynamically, in additon to supporting error bars.
+    In rolling mode, the buffer keeps the last points and the oldest points
+    are dropped, so that data can be streamed indefinitely. The curve is
+    redrawn at most every redraw_time seconds, or on each change if
+    redraw_time is None.
     """
 
     data_updated = QtCore.QSignal()
 
-    def __init__(self, errors=False, **kwargs):
+    def __init__(self, errors=False, redraw_time=0.1, **kwargs):
         super().__init__(**kwargs)
         if errors:
             self._errorBars = pg.ErrorBarItem(pen=kwargs.get('pen', None))
         self._buffer = None
-
-    def prepare(self, size, dtype=np.float32):
-        """ Prepares the buffer based on its size, data type """
-        if hasattr(self, '_errorBars'):
-            self._buffer = np.empty((size, 4), dtype=dtype)
-        else:
-            self._buffer = np.empty((size, 2), dtype=dtype)
+        self.redraw_time = redraw_time
+        self._redraw_timer = QtCore.QTimer()
+        self._redraw_timer.setSingleShot(True)
+        self._redraw_timer.timeout.connect(self.redraw)
+
+    def prepare(self, size, dtype=np.float32, rolling=False):
+        """ Prepares the buffer based on its size, data type, and whether
+        the oldest points are dropped when it is full """
+        columns = 4 if hasattr(self, '_errorBars') else 2
+        # A rolling buffer stores each point twice, at i and i + size, so
+        # that the points are always contiguous from the oldest one
+        self._buffer = np.empty((2 * size if rolling else size, columns), dtype=dtype)
+        self._size = size
+        self.rolling = rolling
         self._ptr = 0
+        self._start = 0
+        self._beam = 0
 
     def append(self, x, y, xError=None, yError=None):
         """ Appends data to the curve with optional errors """
+        self.extend([x], [y], [xError], [yError])
+
+    def extend(self, xs, ys, xErrors=None, yErrors=None):
+        """ Appends arrays of data to the curve with optional errors """
         if self._buffer is None:
             raise Exception("BufferCurve buffer must be prepared")
-        if len(self._buffer) <= self._ptr:
+        columns = [xs, ys]
+        if hasattr(self, '_errorBars'):
+            columns += [np.nan if errors is None else errors
+                        for errors in (xErrors, yErrors)]
+        points = np.column_stack(np.broadcast_arrays(
+            *[np.asarray(column, dtype=float) for column in columns]))
+        count = len(points)
+        if not self.rolling and self._ptr + count > self._size:
             raise Exception("BufferCurve overflow")
+        if count > self._size:
+            points = points[-self._size:]
+
+        # the positions of the points dropped from a long array are skipped
+        first = self._start + self._ptr + count - len(points)
+        positions = (first + np.arange(len(points))) % self._size
+        self._buffer[positions] = points
+        if self.rolling:
+            self._buffer[positions + self._size] = points
+        total = self._ptr + count
+        self._start = (self._start + max(total - self._size, 0)) % self._size
+        self._ptr = min(total, self._size)
+
+        if hasattr(self, '_errorBars') and np.isfinite(points[:, 2:]).any():
+            self._beam = max(self._beam, np.nanmax(points[:, 2:]))
+
+        if not self.redraw_time:
+            self.redraw()
+        elif not self._redraw_timer.isActive():
+            self._redraw_timer.start(int(self.redraw_time * 1e3))
+
+    @property
+    def points(self):
+        """ Array of the points in the buffer from the oldest one, with the
+        columns x, y, and the x and y errors if enabled """
+        if self._buffer is None:
+            return None
+        return self._buffer[self._start:self._start + self._ptr]
+
+    def redraw(self):
+        """ Sets the data of the curve and the error bars to the buffer """
+        points = self.points
 
         # Set x-y data
-        self._buffer[self._ptr, :2] = [x, y]
-        self.setData(self._buffer[:self._ptr, :2])
+        self.setData(points[:, 0], points[:, 1])
 
         # Set error bars if enabled at construction
         if hasattr(self, '_errorBars'):
-            self._buffer[self._ptr, 2:] = [xError, yError]
             self._errorBars.setOpts(
-                x=self._buffer[:self._ptr, 0],
-                y=self._buffer[:self._ptr, 1],
-                top=self._buffer[:self._ptr, 3],
-                bottom=self._buffer[:self._ptr, 3],
-                left=self._buffer[:self._ptr, 2],
-                right=self._buffer[:self._ptr, 2],
-                beam=np.max(self._buffer[:self._ptr, 2:])
+                x=points[:, 0],
+                y=points[:, 1],
+                top=points[:, 3],
+                bottom=points[:, 3],
+                left=points[:, 2],
+                right=points[:, 2],
+                beam=self._beam
             )
 
-        self._ptr += 1
         self.data_updated.emit()
 
 
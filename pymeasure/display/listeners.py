@@ -23,6 +23,7 @@
 #
 
 import logging
+from queue import Empty
 
 from .Qt import QtCore
 from .thread import StoppableQThread
@@ -31,13 +32,7 @@ from ..experiment.procedure import Procedure
 log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
-try:
-    import zmq
-    import cloudpickle
-except ImportError:
-    zmq = None
-    cloudpickle = None
-    log.warning("ZMQ and cloudpickle are required for TCP communication")
+_EMPTY = object()  # marks that no message is waiting in a queue
 
 
 class QListener(StoppableQThread):
@@ -55,6 +50,7 @@ class QListener(StoppableQThread):
         :param timeout: Timeout in seconds to recheck stop flag
         """
         super().__init__()
+        import zmq  # only required for TCP communication
 
         self.port = port
         self.topic = topic
@@ -71,6 +67,7 @@ class QListener(StoppableQThread):
         self.timeout = timeout
 
     def receive(self, flags=0):
+        import cloudpickle
         topic, record = self.subscriber.recv_serialized(
             deserialize=lambda msg: (msg[0].decode(), cloudpickle.loads(msg[1])),
             flags=flags
@@ -88,12 +85,14 @@ class QListener(StoppableQThread):
 class Monitor(QtCore.QThread):
     """ Monitor listens for status and progress messages
     from a Worker through a queue to ensure no messages
-    are losts
+    are losts. The results records which are waiting in the
+    queue are emitted together as a list.
     """
 
     status = QtCore.QSignal(int)
     progress = QtCore.QSignal(float)
     log = QtCore.QSignal(object)
+    results = QtCore.QSignal(object)
     worker_running = QtCore.QSignal()
     worker_failed = QtCore.QSignal()
     worker_finished = QtCore.QSignal()  # Distinguished from QThread.finished
@@ -103,13 +102,30 @@ class Monitor(QtCore.QThread):
         super().__init__()
         self.queue = queue
 
-    def run(self):
+    def _next_results(self, records):
+        """ Adds the results records which are waiting in the queue to the
+        records, and returns the next other message or _EMPTY """
         while True:
-            data = self.queue.get()
-            if data is None:
-                break
+            try:
+                data = self.queue.get_nowait()
+            except Empty:
+                return _EMPTY
+            if data is None or data[0] != 'results':
+                return data
+            records.append(data[1])
+
+    def run(self):
+        data = self.queue.get()
+        while data is not None:
             topic, data = data
-            if topic == 'status':
+            if topic == 'results':
+                records = [data]
+                data = self._next_results(records)
+                self.results.emit(records)
+                if data is _EMPTY:
+                    data = self.queue.get()
+                continue
+            elif topic == 'status':
                 self.status.emit(data)
                 if data == Procedure.RUNNING:
                     self.worker_running.emit()
@@ -123,5 +139,52 @@ class Monitor(QtCore.QThread):
                 self.progress.emit(data)
             elif topic == 'log':
                 self.log.emit(data)
+            data = self.queue.get()
 
         log.info("Monitor caught stop command")
+
+
+class ResultsSubscription(QtCore.QObject):
+    """ Shares the data of a :class:`.Results` object between several views.
+    The data is read from the results once by :meth:`poll`, if they changed,
+    and the views read this snapshot through the same interface as the
+    results, e.g. :class:`.ResultsCurve` and :class:`.ResultsImage` objects
+    which are constructed with the subscription instead of the results.
+    """
+
+    updated = QtCore.QSignal()
+
+    def __init__(self, results, parent=None):
+        super().__init__(parent)
+        self.results = results
+        self.procedure = results.procedure
+        self.data_filename = results.data_filename
+        self.version = 0
+        self._results_version = None
+        self._data = None
+
+    def poll(self):
+        """ Takes a snapshot of the data if the results changed since the
+        last poll, and returns True if there is a new snapshot """
+        version = getattr(self.results, 'version', None)
+        if self._data is not None and version is not None and version == self._results_version:
+            return False
+        self._results_version = version
+        data = self.results.data
+        if self._data is not None and data is self._data:
+            return False
+        self._data = data
+        self.version += 1
+        self.updated.emit()
+        return True
+
+    @property
+    def data(self):
+        if self._data is None:
+            self.poll()
+        return self._data
+
+    def reload(self):
+        self.results.reload()
+        self._data = None
+        self._results_version = None
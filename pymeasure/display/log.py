@@ -24,6 +24,8 @@
 
 import logging
 
+from collections import deque
+from itertools import islice
 from logging import Handler
 
 from .Qt import QtCore
@@ -41,3 +43,31 @@ class LogHandler(QtCore.QObject, Handler):
 
     def emit(self, record):
         self.record.emit(self.format(record))
+
+
+class BufferedLogHandler(Handler):
+    """ Keeps the last log records in a ring buffer of at most max_records,
+    from which a widget reads the new records in batches, instead of being
+    signalled for every record. The records are formatted only when read.
+    """
+
+    def __init__(self, max_records=10000):
+        Handler.__init__(self)
+        self.records = deque(maxlen=max_records)
+        self.count = 0  # number of records handled
+
+    def emit(self, record):
+        # called with the lock of the handler acquired
+        self.records.append(record)
+        self.count += 1
+
+    def since(self, count):
+        """ Returns the retained records which were handled after the first
+        `count` records, and the number of records handled so far """
+        self.acquire()
+        try:
+            new = min(self.count - count, len(self.records))
+            records = list(islice(reversed(self.records), max(new, 0)))
+            return records[::-1], self.count
+        finally:
+            self.release()
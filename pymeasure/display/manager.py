@@ -23,12 +23,15 @@
 #
 
 import logging
+import warnings
 
-from os.path import basename
+from collections import OrderedDict, deque
+from collections.abc import MutableSequence
+from os.path import basename, exists
 
 from .Qt import QtCore
 from .listeners import Monitor
-from ..experiment import Procedure
+from ..experiment import Procedure, Results
 from ..experiment.workers import Worker
 
 log = logging.getLogger(__name__)
@@ -53,64 +56,168 @@ class Experiment(QtCore.QObject):
         self.curve = curve
         self.browser_item = browser_item
 
+    def evict(self):
+        """ Drops the data of the results and the curve from memory, which
+        is read from the data file again when the curve is updated """
+        self.results.unload()
+        self.curve.evict()
+
+    @property
+    def evicted(self):
+        return self.curve.evicted
+
 class ExperimentQueue(QtCore.QObject):
     """ Represents a Queue of Experiments and allows queries to
     be easily preformed
+
+    The Experiments are indexed by their data filename and browser item, and
+    the queued Experiments are kept in a separate deque, such that the
+    queries do not depend on the number of Experiments. Appending and removing
+    Experiments takes constant time, and so does indexing them by position,
+    unless Experiments were removed since the last indexing.
     """
 
     def __init__(self):
         super().__init__()
-        self.queue = []
+        self._experiments = {}  # insertion-ordered set of the Experiments
+        self._order = []  # the Experiments by position, or None after removals
+        self._pending = deque()  # Experiments, which were queued when appended
+        self._filenames = {}  # number of Experiments by data file basename
+        self._browser_items = {}  # by id, as the items are not hashable
+
+    @property
+    def queue(self):
+        """ List-like view of the Experiments in the order they were appended.
+        Changing the ExperimentQueue through this view is deprecated, use
+        :meth:`append` and :meth:`remove` instead. """
+        return _QueueView(self)
+
+    def _ordered(self):
+        """ Returns the list of the Experiments by position """
+        if self._order is None:
+            self._order = list(self._experiments)
+        return self._order
 
     def append(self, experiment):
-        self.queue.append(experiment)
+        self._experiments[experiment] = None
+        if self._order is not None:
+            self._order.append(experiment)
+        filename = basename(experiment.data_filename)
+        self._filenames[filename] = self._filenames.get(filename, 0) + 1
+        self._browser_items[id(experiment.browser_item)] = experiment
+        if experiment.procedure.status == Procedure.QUEUED:
+            self._pending.append(experiment)
 
     def remove(self, experiment):
-        if experiment not in self.queue:
+        if experiment not in self._experiments:
             raise Exception("Attempting to remove an Experiment that is "
                             "not in the ExperimentQueue")
         else:
             if experiment.procedure.status == Procedure.RUNNING:
                 raise Exception("Attempting to remove a running experiment")
             else:
-                self.queue.pop(self.queue.index(experiment))
+                del self._experiments[experiment]
+                self._order = None
+                filename = basename(experiment.data_filename)
+                self._filenames[filename] -= 1
+                if not self._filenames[filename]:
+                    del self._filenames[filename]
+                self._browser_items.pop(id(experiment.browser_item), None)
+                # removed from the pending Experiments by next()
 
     def __contains__(self, value):
         if isinstance(value, Experiment):
-            return value in self.queue
+            return value in self._experiments
         if isinstance(value, str):
-            for experiment in self.queue:
-                if basename(experiment.data_filename) == basename(value):
-                    return True
-            return False
+            return basename(value) in self._filenames
         return False
 
     def __getitem__(self, key):
-        return self.queue[key]
+        return self._ordered()[key]
+
+    def __iter__(self):
+        return iter(list(self._experiments))  # a copy, so that Experiments can be removed meanwhile
+
+    def __len__(self):
+        return len(self._experiments)
+
+    def _next(self):
+        """ Returns the next queued experiment or None """
+        pending = self._pending
+        while pending:
+            experiment = pending[0]
+            if (experiment.procedure.status == Procedure.QUEUED and
+                    experiment in self._experiments):
+                return experiment
+            pending.popleft()  # started or removed
+        return None
 
     def next(self):
         """ Returns the next experiment on the queue
         """
-        for experiment in self.queue:
-            if experiment.procedure.status == Procedure.QUEUED:
-                return experiment
-        raise StopIteration("There are no queued experiments")
+        experiment = self._next()
+        if experiment is None:
+            raise StopIteration("There are no queued experiments")
+        return experiment
 
     def has_next(self):
         """ Returns True if another item is on the queue
         """
-        try:
-            self.next()
-        except StopIteration:
-            return False
-
-        return True
+        return self._next() is not None
 
     def with_browser_item(self, item):
-        for experiment in self.queue:
-            if experiment.browser_item is item:
-                return experiment
-        return None
+        return self._browser_items.get(id(item))
+
+
+class _QueueView(MutableSequence):
+    """ List-like view of the Experiments of an :class:`.ExperimentQueue`,
+    which is returned by its queue property. Changes of the view are applied
+    to the ExperimentQueue with a FutureWarning. """
+
+    def __init__(self, experiments):
+        self._experiments = experiments
+
+    def __getitem__(self, key):
+        return self._experiments[key]
+
+    def __len__(self):
+        return len(self._experiments)
+
+    def __contains__(self, experiment):
+        return experiment in self._experiments
+
+    def __iter__(self):
+        return iter(self._experiments)
+
+    def __eq__(self, other):
+        return list(self) == list(other) if isinstance(other, (list, tuple, _QueueView)) \
+            else NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def __setitem__(self, key, experiment):
+        raise TypeError("Experiments of the queue can not be replaced")
+
+    def __delitem__(self, key):
+        experiments = self._experiments[key]
+        for experiment in experiments if isinstance(key, slice) else [experiments]:
+            self.remove(experiment)
+
+    def insert(self, index, experiment):
+        if index < len(self):
+            raise ValueError("Experiments can only be appended to the queue")
+        self.append(experiment)
+
+    def append(self, experiment):
+        warnings.warn("Don't append to ExperimentQueue.queue, use "
+                      "ExperimentQueue.append() instead", FutureWarning)
+        self._experiments.append(experiment)
+
+    def remove(self, experiment):
+        warnings.warn("Don't remove from ExperimentQueue.queue, use "
+                      "ExperimentQueue.remove() instead", FutureWarning)
+        self._experiments.remove(experiment)
 
 
 class Manager(QtCore.QObject):
@@ -119,6 +226,18 @@ class Manager(QtCore.QObject):
     aborted. When instantiated, the Manager is linked to a :class:`.Browser`
     and a PyQtGraph `PlotItem` within the user interface, which are updated
     in accordance with the execution status of the Experiments.
+
+    If a :class:`.QueueJournal` is given, the queued Experiments and their
+    status transitions are recorded in it, such that the queue can be restored
+    after the program was closed or crashed.
+
+    If `max_loaded` is given, only the data of this many Experiments is kept
+    in memory. The data of the least recently used Experiments which are not
+    queued or running is evicted, keeping a decimated preview of their
+    curves. The data of hidden Experiments is evicted before that of shown
+    ones. Experiments are used when they are loaded, when they finish, and
+    when :meth:`touch` is called, e.g. when they are shown, which reads the
+    data of evicted Experiments from the data files again.
     """
     _is_continuous = True
     _start_on_add = True
@@ -130,10 +249,15 @@ class Manager(QtCore.QObject):
     abort_returned = QtCore.QSignal(object)
     log = QtCore.QSignal(object)
 
-    def __init__(self, plot, browser, port=5888, log_level=logging.INFO, parent=None):
+    def __init__(self, plot, browser, port=5888, log_level=logging.INFO, journal=None,
+                 max_loaded=None, parent=None):
         super().__init__(parent)
 
+        self.journal = journal
+        self.max_loaded = max_loaded
+        self._recent = OrderedDict()  # Experiments by id, least recently used first
         self.experiments = ExperimentQueue()
+        self._sequences = deque()
         self._worker = None
         self._running_experiment = None
         self._monitor = None
@@ -163,6 +287,8 @@ class Manager(QtCore.QObject):
         if self.is_running():
             self._running_experiment.procedure.status = status
             self._running_experiment.browser_item.setStatus(status)
+            if self.journal is not None:
+                self.journal.update_status(self._running_experiment.data_filename, status)
 
     def _update_log(self, record):
         self.log.emit(record)
@@ -173,26 +299,143 @@ class Manager(QtCore.QObject):
         self.plot.addItem(experiment.curve)
         self.browser.add(experiment)
         self.experiments.append(experiment)
+        self.touch(experiment)
+
+    def touch(self, experiment):
+        """ Marks the data of an Experiment as recently used, updates its
+        curve if it was evicted or its data changed, and evicts the data of
+        the least recently used Experiments beyond `max_loaded`, hidden ones
+        first
+        """
+        self._recent.pop(id(experiment), None)
+        self._recent[id(experiment)] = experiment
+        if experiment.evicted or experiment.curve.needs_update():
+            experiment.curve.update()
+        if self.max_loaded is None:
+            return
+        loaded = [e for e in self._recent.values() if not e.evicted]
+        excess = len(loaded) - self.max_loaded
+        candidates = [e for e in loaded if e is not experiment and
+                      e is not self._running_experiment and
+                      e.procedure.status != Procedure.QUEUED]
+        # sorting is stable, so the hidden and the shown ones stay in LRU order
+        candidates.sort(key=lambda e: e.browser_item.checkState(0) == QtCore.Qt.Checked)
+        for experiment in candidates[:max(excess, 0)]:
+            log.debug("Evicting the data of %s" % experiment.data_filename)
+            experiment.evict()
+
+    def restore(self, procedure_class, new_experiment):
+        """ Restores the Experiments recorded in the queue journal, with the
+        status they had when the program was closed. The status of Experiments
+        which were running is set to aborted. If Experiments are still queued,
+        the queue is paused until :meth:`resume` is called.
+
+        :param procedure_class: The class of the recorded procedures
+        :param new_experiment: Callable returning a new Experiment for Results
+        :returns: True if queued Experiments were restored
+        """
+        queued = False
+        for entry in self.journal.entries():
+            if entry.data_filename in self.experiments:
+                continue
+            if not exists(entry.data_filename):
+                log.warning("Data file %s of the queue journal is missing" % entry.data_filename)
+                continue
+            procedure = procedure_class()
+            procedure.set_parameters(entry.parameters, except_missing=False)
+            results = Results(procedure, entry.data_filename)
+            status = entry.status
+            if status == Procedure.RUNNING:  # interrupted
+                status = Procedure.ABORTED
+                self.journal.update_status(entry.data_filename, status)
+            procedure.status = status
+            experiment = new_experiment(results)
+            experiment.browser_item.setStatus(status)
+            if status == Procedure.QUEUED:
+                queued = True
+            else:
+                self._redraw(experiment)
+                experiment.browser_item.setProgress(100)
+            self.load(experiment)
+        if queued:
+            self.pause()
+        log.info("Restored %d experiments from the queue journal" % len(self.journal))
+        return queued
+
+    def _redraw(self, experiment):
+        """ Updates the plotted data of an Experiment """
+        experiment.curve.update()
 
     def queue(self, experiment):
         """ Adds an experiment to the queue.
         """
+        if self.journal is not None:
+            self.journal.add(experiment.results)
         self.load(experiment)
         self.queued.emit(experiment)
         if self._start_on_add and not self.is_running():
             self.next()
 
+    def queue_sequence(self, procedures, queue):
+        """ Adds a sequence of procedures, which are taken one at a time
+        from the iterable `procedures` once the queue has run empty, and are
+        queued by calling `queue(procedure=procedure)`. This allows queuing a
+        lazily generated :class:`.Sequence` of any length, without creating
+        all of its results files and curves up front. One procedure is taken
+        ahead, so that :meth:`has_next` knows whether another one exists.
+
+        :param procedures: Iterable of :class:`.Procedure` objects
+        :param queue: Function that creates the :class:`.Experiment` of a
+            procedure and adds it with :meth:`queue`, e.g. the `queue` method
+            of the :class:`.ManagedWindow`
+        """
+        procedures = iter(procedures)
+        for procedure in procedures:
+            self._sequences.append([procedures, queue, procedure])
+            break
+        if self._start_on_add and not self.is_running():
+            self.next()
+
+    def has_next(self):
+        """ Returns True if there is a queued experiment or a pending
+        procedure of a sequence
+        """
+        return self.experiments.has_next() or bool(self._sequences)
+
+    def _pull_sequence(self):
+        """ Queues the next procedure of the pending sequences and returns
+        True if there is one
+        """
+        if self._sequences:
+            sequence = self._sequences[0]
+            procedures, queue, procedure = sequence
+            try:
+                sequence[2] = next(procedures)
+            except StopIteration:
+                self._sequences.popleft()
+            start_on_add, self._start_on_add = self._start_on_add, False
+            try:
+                queue(procedure=procedure)
+            finally:
+                self._start_on_add = start_on_add
+            return True
+        return False
+
     def remove(self, experiment):
         """ Removes an Experiment
         """
         self.experiments.remove(experiment)
+        if self.journal is not None:
+            self.journal.remove(experiment.data_filename)
         self.browser.takeTopLevelItem(
             self.browser.indexOfTopLevelItem(experiment.browser_item))
         self.plot.removeItem(experiment.curve)
+        self._recent.pop(id(experiment), None)
 
     def clear(self):
-        """ Remove all Experiments
+        """ Remove all Experiments and the pending procedures of sequences
         """
+        self._sequences.clear()
         for experiment in self.experiments[:]:
             self.remove(experiment)
 
@@ -204,12 +447,17 @@ class Manager(QtCore.QObject):
         if self.is_running():
             raise Exception("Another procedure is already running")
         else:
+            if not self.experiments.has_next():
+                self._pull_sequence()
             if self.experiments.has_next():
                 log.debug("Manager is initiating the next experiment")
                 experiment = self.experiments.next()
                 self._running_experiment = experiment
 
-                self._worker = Worker(experiment.results, port=self.port, log_level=self.log_level)
+                # the plots get the data from the worker while it runs
+                experiment.results.start_live()
+                self._worker = Worker(experiment.results, port=self.port, log_level=self.log_level,
+                                      monitor_results=True)
 
                 self._monitor = Monitor(self._worker.monitor_queue)
                 self._monitor.worker_running.connect(self._running)
@@ -219,6 +467,7 @@ class Manager(QtCore.QObject):
                 self._monitor.progress.connect(self._update_progress)
                 self._monitor.status.connect(self._update_status)
                 self._monitor.log.connect(self._update_log)
+                self._monitor.results.connect(self._update_results)
 
                 self._monitor.start()
                 self._worker.start()
@@ -227,11 +476,16 @@ class Manager(QtCore.QObject):
         if self.is_running():
             self.running.emit(self._running_experiment)
 
+    def _update_results(self, records):
+        if self.is_running():
+            self._running_experiment.results.add_records(records)
+
     def _clean_up(self):
         self._worker.join()
         del self._worker
         self._monitor.wait()
         del self._monitor
+        self._running_experiment.results.stop_live()
         self._worker = None
         self._running_experiment = None
         log.debug("Manager has cleaned up after the Worker")
@@ -254,10 +508,18 @@ class Manager(QtCore.QObject):
         self._clean_up()
         experiment.browser_item.setProgress(100.)
         experiment.curve.update()
+        self.touch(experiment)
         self.finished.emit(experiment)
         if self._is_continuous:  # Continue running procedures
             self.next()
 
+    def pause(self):
+        """ Pauses processing of the queue after the running Experiment,
+        until :meth:`resume` is called.
+        """
+        self._start_on_add = False
+        self._is_continuous = False
+
     def resume(self):
         """ Resume processing of the queue.
         """
@@ -273,8 +535,7 @@ class Manager(QtCore.QObject):
             raise Exception("Attempting to abort when no experiment "
                             "is running")
         else:
-            self._start_on_add = False
-            self._is_continuous = False
+            self.pause()
 
             self._worker.stop()
 
@@ -302,14 +563,9 @@ class ImageExperimentQueue(ExperimentQueue):
         super().__init__()
 
     def __contains__(self, value):
-        if isinstance(value, ImageExperiment):
-            return value in self.queue
-        if isinstance(value, str):
-            for experiment in self.queue:
-                if basename(experiment.data_filename) == basename(value):
-                    return True
+        if isinstance(value, Experiment) and not isinstance(value, ImageExperiment):
             return False
-        return False
+        return super().__contains__(value)
 
 class ImageManager(Manager):
     """
@@ -326,8 +582,10 @@ class ImageManager(Manager):
     abort_returned = QtCore.QSignal(object)
     log = QtCore.QSignal(object)
 
-    def __init__(self, plot, im_plot, browser, port=5888, log_level=logging.INFO, parent=None):
-        super().__init__(plot, browser, port=5888, log_level=logging.INFO, parent=None)
+    def __init__(self, plot, im_plot, browser, port=5888, log_level=logging.INFO, journal=None,
+                 max_loaded=None, parent=None):
+        super().__init__(plot, browser, port=5888, log_level=logging.INFO, journal=journal,
+                         max_loaded=max_loaded, parent=None)
         # overrides necessary variables to make image features work
         self.experiments = ImageExperimentQueue()
 
@@ -337,15 +595,22 @@ class ImageManager(Manager):
         """ Removes an Experiment
         """
         self.experiments.remove(experiment)
+        if self.journal is not None:
+            self.journal.remove(experiment.data_filename)
         self.browser.takeTopLevelItem(
             self.browser.indexOfTopLevelItem(experiment.browser_item))
         self.im_plot.removeItem(experiment.image)
         self.plot.removeItem(experiment.curve)
+        self._recent.pop(id(experiment), None)
         
     def load(self, experiment): 
         super().load(experiment)
         self.im_plot.addItem(experiment.image)
 
+    def _redraw(self, experiment):
+        super()._redraw(experiment)
+        experiment.image.update_img()
+
     def _finish(self):
         log.debug("Manager's running experiment has finished")
         experiment = self._running_experiment
@@ -353,6 +618,7 @@ class ImageManager(Manager):
         experiment.browser_item.setProgress(100.)
         experiment.image.update_img()
         experiment.curve.update()
+        self.touch(experiment)
         self.finished.emit(experiment)
         if self._is_continuous:  # Continue running procedures
             self.next()
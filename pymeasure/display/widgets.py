@@ -24,44 +24,103 @@
 
 import logging
 
+import numbers
 import os
 import re
+import time
 import pyqtgraph as pg
 from functools import partial
-import numpy
-from collections import ChainMap
-from itertools import product
 
 from .browser import Browser
 from .curves import ResultsCurve, Crosshairs, ResultsImage
 from .inputs import BooleanInput, IntegerInput, ListInput, ScientificInput, StringInput
-from .log import LogHandler
+from .listeners import ResultsSubscription
+from .log import BufferedLogHandler
 from .Qt import QtCore, QtGui
 from ..experiment import parameters, Procedure
-from ..experiment.results import Results
+from ..experiment.index import ResultsIndex
+from ..experiment.sequencer import (SAFE_FUNCTIONS, SequenceEvaluationException, Sequence,
+                                    SequenceItem, eval_string, read_sequence_file)
 
 log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
 
+def opengl_available():
+    """ Returns True if the plots can be drawn with OpenGL, which is not the
+    case on the headless offscreen and minimal platforms """
+    platform = QtGui.QApplication.platformName()
+    return hasattr(QtGui, 'QOpenGLWidget') and platform not in ('offscreen', 'minimal')
+
+
+class RefreshTimer(QtCore.QTimer):
+    """ Times the refreshes of a plot at the refresh time, and increases the
+    interval when refreshing takes longer than the BUDGET fraction of it, up
+    to MAX_BACKOFF times the refresh time, so that plotting large data does
+    not block the user interface. The interval decreases again once
+    refreshing is fast.
+
+    :param refresh_time: The shortest interval between refreshes in seconds
+    """
+
+    BUDGET = 0.5
+    MAX_BACKOFF = 16
+    frame_time_changed = QtCore.QSignal(float, float)
+
+    def __init__(self, refresh_time, parent=None):
+        super().__init__(parent)
+        self.refresh_time = refresh_time
+        self.frame_time = 0.
+        self.setInterval(int(refresh_time * 1e3))
+
+    def record(self, frame_time):
+        """ Adapts the interval to the time in seconds of the last refresh,
+        and emits the frame_time_changed signal with the frame time and
+        the new interval """
+        self.frame_time = frame_time
+        interval = self.interval() / 1e3
+        if frame_time > self.BUDGET * interval:
+            interval = min(2 * interval, self.MAX_BACKOFF * self.refresh_time)
+        elif frame_time < self.BUDGET * interval / 4:
+            interval = max(interval / 2, self.refresh_time)
+        self.setInterval(int(interval * 1e3))
+        self.frame_time_changed.emit(frame_time, interval)
+
+
 class PlotFrame(QtGui.QFrame):
     """ Combines a PyQtGraph Plot with Crosshairs. Refreshes
-    the plot based on the refresh_time, and allows the axes
-    to be changed on the fly, which updates the plotted data
+    the curves whose data changed, at most every refresh_time, and allows
+    the axes to be changed on the fly, which updates the plotted data.
+    The refresh interval is increased while refreshing is slow, and the
+    time of the last refresh is shown below the plot.
+    The units of the axes are taken from the column names, e.g.
+    'Voltage (V)', or from the `units` dictionary by column name.
+
+    If `accelerated` is True, the plot is drawn with OpenGL where it is
+    available, and the curves skip the checks for non-finite values while
+    their data is finite. If it is 'auto', the accelerated rendering is used
+    while more than ACCELERATION_POINTS points are drawn.
     """
 
     LABEL_STYLE = {'font-size': '10pt', 'font-family': 'Arial', 'color': '#000000'}
+    ACCELERATION_POINTS = 100000
     updated = QtCore.QSignal()
     x_axis_changed = QtCore.QSignal(str)
     y_axis_changed = QtCore.QSignal(str)
 
-    def __init__(self, x_axis=None, y_axis=None, refresh_time=0.2, check_status=True, parent=None):
+    def __init__(self, x_axis=None, y_axis=None, refresh_time=0.2, check_status=True,
+                 units=None, accelerated=False, parent=None):
         super().__init__(parent)
+        self.units = units or {}
+        self.accelerated = accelerated
+        self.accelerating = False
         self.refresh_time = refresh_time
         self.check_status = check_status
         self._setup_ui()
         self.change_x_axis(x_axis)
         self.change_y_axis(y_axis)
+        if accelerated is True:
+            self.set_accelerating(True)
 
     def _setup_ui(self):
         self.setAutoFillBackground(False)
@@ -80,8 +139,16 @@ class PlotFrame(QtGui.QFrame):
         self.coordinates.setAlignment(
             QtCore.Qt.AlignRight | QtCore.Qt.AlignTrailing | QtCore.Qt.AlignVCenter)
 
+        self.frame_time = QtGui.QLabel(self)
+        self.frame_time.setStyleSheet("background: #fff; color: #888")
+        self.frame_time.setToolTip("Time to update the plotted data")
+
+        hbox = QtGui.QHBoxLayout()
+        hbox.addWidget(self.frame_time)
+        hbox.addWidget(self.coordinates)
+
         vbox.addWidget(self.plot_widget)
-        vbox.addWidget(self.coordinates)
+        vbox.addLayout(hbox)
         self.setLayout(vbox)
 
         self.plot = self.plot_widget.getPlotItem()
@@ -90,23 +157,74 @@ class PlotFrame(QtGui.QFrame):
                                      pen=pg.mkPen(color='#AAAAAA', style=QtCore.Qt.DashLine))
         self.crosshairs.coordinates.connect(self.update_coordinates)
 
-        self.timer = QtCore.QTimer()
-        self.timer.timeout.connect(self.update_curves)
-        self.timer.timeout.connect(self.crosshairs.update)
-        self.timer.timeout.connect(self.updated)
-        self.timer.start(int(self.refresh_time * 1e3))
+        self.timer = RefreshTimer(self.refresh_time)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.frame_time_changed.connect(self.update_frame_time)
+        self.timer.start()
 
     def update_coordinates(self, x, y):
         self.coordinates.setText("(%g, %g)" % (x, y))
 
-    def update_curves(self):
+    def update_frame_time(self, frame_time, interval):
+        text = "%.0f ms" % (frame_time * 1e3)
+        if interval > self.refresh_time:
+            text += ", refreshing every %.1f s" % interval
+        self.frame_time.setText(text)
+
+    def refresh(self):
+        """ Updates the changed data and adapts the refresh interval to the
+        time it took """
+        start = time.perf_counter()
+        if self.update_curves():
+            if self.accelerated == 'auto':
+                self.choose_rendering()
+            self.timer.record(time.perf_counter() - start)
+            self.crosshairs.update()
+        self.updated.emit()
+
+    def drawn_points(self):
+        """ Returns the number of points drawn by the curves """
+        return sum(len(item.xData) for item in self.plot.items
+                   if isinstance(item, ResultsCurve) and item.xData is not None)
+
+    def choose_rendering(self):
+        """ Switches to the accelerated rendering when more than
+        ACCELERATION_POINTS points are drawn, and back when less than half
+        of them are drawn """
+        points = self.drawn_points()
+        if points > self.ACCELERATION_POINTS:
+            self.set_accelerating(True)
+        elif points < self.ACCELERATION_POINTS / 2:
+            self.set_accelerating(False)
+
+    def set_accelerating(self, accelerating):
+        """ Switches the accelerated rendering of the plot and its curves on
+        or off, using OpenGL only where it is available """
+        if accelerating == self.accelerating:
+            return
+        self.accelerating = accelerating
+        if opengl_available():
+            self.plot_widget.useOpenGL(accelerating)
         for item in self.plot.items:
             if isinstance(item, ResultsCurve):
+                item.set_accelerated(accelerating)
+        log.debug("Accelerated rendering of the plot is %s" % ("on" if accelerating else "off"))
+
+    def update_curves(self):
+        """ Updates the curves whose results changed since their last update,
+        and returns the number of updated curves """
+        updated = 0
+        for item in self.plot.items:
+            if isinstance(item, ResultsCurve) and item.needs_update():
+                item.set_accelerated(self.accelerating)
                 if self.check_status:
                     if item.results.procedure.status == Procedure.RUNNING:
                         item.update()
+                        updated += 1
                 else:
                     item.update()
+                    updated += 1
+        return updated
 
     def parse_axis(self, axis):
         """ Returns the units of an axis by searching the string
@@ -122,12 +240,13 @@ class PlotFrame(QtGui.QFrame):
                 label = re.sub(units_pattern, '', axis)
                 return label, match.groupdict()['units']
         else:
-            return axis, None
+            return axis, self.units.get(axis)
 
     def change_x_axis(self, axis):
         for item in self.plot.items:
             if isinstance(item, ResultsCurve):
                 item.x = axis
+                item.clear_data()
                 item.update()
         label, units = self.parse_axis(axis)
         self.plot.setLabel('bottom', label, units=units, **self.LABEL_STYLE)
@@ -138,6 +257,7 @@ class PlotFrame(QtGui.QFrame):
         for item in self.plot.items:
             if isinstance(item, ResultsCurve):
                 item.y = axis
+                item.clear_data()
                 item.update()
         label, units = self.parse_axis(axis)
         self.plot.setLabel('left', label, units=units, **self.LABEL_STYLE)
@@ -147,13 +267,16 @@ class PlotFrame(QtGui.QFrame):
 
 class PlotWidget(QtGui.QWidget):
     """ Extends the PlotFrame to allow different columns
-    of the data to be dynamically choosen
+    of the data to be dynamically choosen. The rendering is
+    accelerated as set by `accelerated`, see :class:`.PlotFrame`.
     """
 
     def __init__(self, columns, x_axis=None, y_axis=None, refresh_time=0.2, check_status=True,
-                 parent=None):
+                 units=None, accelerated=False, parent=None):
         super().__init__(parent)
         self.columns = columns
+        self.units = units
+        self.accelerated = accelerated
         self.refresh_time = refresh_time
         self.check_status = check_status
         self._setup_ui()
@@ -185,7 +308,9 @@ class PlotWidget(QtGui.QWidget):
             self.columns[0],
             self.columns[1],
             self.refresh_time,
-            self.check_status
+            self.check_status,
+            self.units,
+            self.accelerated
         )
         self.updated = self.plot_frame.updated
         self.plot = self.plot_frame.plot
@@ -223,6 +348,7 @@ class PlotWidget(QtGui.QWidget):
                              )
         curve.setSymbol(None)
         curve.setSymbolBrush(None)
+        curve.set_accelerated(self.plot_frame.accelerating)
         return curve
 
     def update_x_column(self, index):
@@ -236,8 +362,8 @@ class PlotWidget(QtGui.QWidget):
 
 class ImageFrame(QtGui.QFrame):
     """ Combines a PyQtGraph Plot with Crosshairs. Refreshes
-    the plot based on the refresh_time, and allows the axes
-    to be changed on the fly, which updates the plotted data
+    the images whose data changed, at most every refresh_time, and allows
+    the axes to be changed on the fly, which updates the plotted data
     """
 
     LABEL_STYLE = {'font-size': '10pt', 'font-family': 'Arial', 'color': '#000000'}
@@ -246,8 +372,10 @@ class ImageFrame(QtGui.QFrame):
     y_axis_changed = QtCore.QSignal(str)
     z_axis_changed = QtCore.QSignal(str)
 
-    def __init__(self, x_axis, y_axis, z_axis=None, refresh_time=0.2, check_status=True, parent=None):
+    def __init__(self, x_axis, y_axis, z_axis=None, refresh_time=0.2, check_status=True,
+                 units=None, parent=None):
         super().__init__(parent)
+        self.units = units or {}
         self.refresh_time = refresh_time
         self.check_status = check_status
         self._setup_ui()
@@ -256,6 +384,7 @@ class ImageFrame(QtGui.QFrame):
             if isinstance(item, ResultsImage):
                 item.x = x_axis
                 item.y = y_axis
+                item.clear_img()
                 item.update_img()
         xlabel, xunits = self.parse_axis(x_axis)
         self.plot.setLabel('bottom', xlabel, units=xunits, **self.LABEL_STYLE)
@@ -284,8 +413,16 @@ class ImageFrame(QtGui.QFrame):
         self.coordinates.setAlignment(
             QtCore.Qt.AlignRight | QtCore.Qt.AlignTrailing | QtCore.Qt.AlignVCenter)
 
+        self.frame_time = QtGui.QLabel(self)
+        self.frame_time.setStyleSheet("background: #fff; color: #888")
+        self.frame_time.setToolTip("Time to update the plotted data")
+
+        hbox = QtGui.QHBoxLayout()
+        hbox.addWidget(self.frame_time)
+        hbox.addWidget(self.coordinates)
+
         vbox.addWidget(self.plot_widget)
-        vbox.addWidget(self.coordinates)
+        vbox.addLayout(hbox)
         self.setLayout(vbox)
 
         self.plot = self.plot_widget.getPlotItem()
@@ -294,23 +431,43 @@ class ImageFrame(QtGui.QFrame):
                                      pen=pg.mkPen(color='#AAAAAA', style=QtCore.Qt.DashLine))
         self.crosshairs.coordinates.connect(self.update_coordinates)
 
-        self.timer = QtCore.QTimer()
-        self.timer.timeout.connect(self.update_curves)
-        self.timer.timeout.connect(self.crosshairs.update)
-        self.timer.timeout.connect(self.updated)
-        self.timer.start(int(self.refresh_time * 1e3))
+        self.timer = RefreshTimer(self.refresh_time)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.frame_time_changed.connect(self.update_frame_time)
+        self.timer.start()
 
     def update_coordinates(self, x, y):
         self.coordinates.setText("(%g, %g)" % (x, y))
 
+    def update_frame_time(self, frame_time, interval):
+        text = "%.0f ms" % (frame_time * 1e3)
+        if interval > self.refresh_time:
+            text += ", refreshing every %.1f s" % interval
+        self.frame_time.setText(text)
+
+    def refresh(self):
+        """ Updates the changed data and adapts the refresh interval to the
+        time it took """
+        start = time.perf_counter()
+        if self.update_curves():
+            self.timer.record(time.perf_counter() - start)
+        self.crosshairs.update()
+        self.updated.emit()
+
     def update_curves(self):
+        """ Updates the images whose results changed since their last update,
+        and returns the number of updated images """
+        updated = 0
         for item in self.plot.items:
-            if isinstance(item, ResultsImage):
+            if isinstance(item, ResultsImage) and item.needs_update():
                 if self.check_status:
                     if item.results.procedure.status == Procedure.RUNNING:
                         item.update_img()
+                        updated += 1
                 else:
-                    item.update()
+                    item.update_img()
+                    updated += 1
+        return updated
 
     def parse_axis(self, axis):
         """ Returns the units of an axis by searching the string
@@ -326,12 +483,13 @@ class ImageFrame(QtGui.QFrame):
                 label = re.sub(units_pattern, '', axis)
                 return label, match.groupdict()['units']
         else:
-            return axis, None
+            return axis, self.units.get(axis)
 
     def change_z_axis(self, axis):
         for item in self.plot.items:
             if isinstance(item, ResultsImage):
                 item.z = axis
+                item.clear_img()
                 item.update_img()
         label, units = self.parse_axis(axis)
         if units is not None:
@@ -348,9 +506,10 @@ class ImageWidget(QtGui.QWidget):
     """
 
     def __init__(self, columns, x_axis, y_axis, z_axis=None, refresh_time=0.2, check_status=True,
-                 parent=None):
+                 units=None, parent=None):
         super().__init__(parent)
         self.columns = columns
+        self.units = units
         self.refresh_time = refresh_time
         self.check_status = check_status
         self.x_axis = x_axis
@@ -376,7 +535,8 @@ class ImageWidget(QtGui.QWidget):
             self.y_axis,
             self.columns[0],
             self.refresh_time,
-            self.check_status
+            self.check_status,
+            self.units
         )
         self.updated = self.image_frame.updated
         self.plot = self.image_frame.plot
@@ -516,29 +676,219 @@ class InputsWidget(QtGui.QWidget):
         return self._procedure
 
 
+class ReadoutWidget(QtGui.QWidget):
+    """ Shows the last values of data columns as numbers, with the units
+    taken from the column names or the `units` dictionary
+    """
+
+    def __init__(self, columns, units=None, parent=None):
+        super().__init__(parent)
+        self.columns = columns
+        self.units = units or {}
+        self._setup_ui()
+        self._layout()
+
+    def _setup_ui(self):
+        self.labels = {}
+        self.values = {}
+        for column in self.columns:
+            self.labels[column] = QtGui.QLabel(column, self)
+            value = QtGui.QLabel("-", self)
+            value.setStyleSheet("font-size: 16pt")
+            value.setAlignment(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+            self.values[column] = value
+
+    def _layout(self):
+        layout = QtGui.QGridLayout(self)
+        for i, column in enumerate(self.columns):
+            layout.addWidget(self.labels[column], 0, i)
+            layout.addWidget(self.values[column], 1, i)
+        self.setLayout(layout)
+
+    def clear(self):
+        for value in self.values.values():
+            value.setText("-")
+
+    def update_values(self, data):
+        """ Shows the values of the last row of a DataFrame """
+        if len(data) == 0:
+            return self.clear()
+        row = data.iloc[-1]
+        for column in self.columns:
+            value = row.get(column)
+            if isinstance(value, numbers.Number):
+                text = "%g" % value
+                units = self.units.get(column)
+                if units and '(' not in column:
+                    text += " %s" % units
+            else:
+                text = str(value)
+            self.values[column].setText(text)
+
+
+class DashboardWidget(QtGui.QWidget):
+    """ Shows several plots, images and numeric readouts of the data of one
+    experiment, which share one :class:`.ResultsSubscription`, so that the
+    data is read once per refresh for all views. The views are refreshed by
+    one timer, which backs off like the one of the :class:`.PlotFrame`.
+
+    :param plots: List of (x, y) column pairs, one for each plot
+    :param images: List of (x, y, z) columns, one for each image
+    :param readouts: List of the columns whose last values are shown
+    :param columns: Number of views in a row of the grid
+    """
+
+    def __init__(self, plots=(), images=(), readouts=(), columns=2, refresh_time=0.2,
+                 units=None, parent=None):
+        super().__init__(parent)
+        self.plots = plots
+        self.images = images
+        self.readouts = readouts
+        self.columns = columns
+        self.refresh_time = refresh_time
+        self.units = units
+        self.subscription = None
+        self._setup_ui()
+        self._layout()
+
+    def _setup_ui(self):
+        self.plot_frames = [PlotFrame(x, y, refresh_time=self.refresh_time, check_status=False,
+                                      units=self.units) for x, y in self.plots]
+        self.image_frames = [ImageFrame(x, y, z, refresh_time=self.refresh_time,
+                                        check_status=False, units=self.units)
+                             for x, y, z in self.images]
+        self.readout = ReadoutWidget(self.readouts, units=self.units, parent=self)
+        self.timer = RefreshTimer(self.refresh_time)
+        for frame in self.frames:
+            frame.timer.stop()  # refreshed by the timer of the dashboard
+            self.timer.frame_time_changed.connect(frame.update_frame_time)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start()
+
+    def _layout(self):
+        vbox = QtGui.QVBoxLayout(self)
+        if self.readouts:
+            vbox.addWidget(self.readout)
+        grid = QtGui.QGridLayout()
+        for i, frame in enumerate(self.frames):
+            grid.addWidget(frame, i // self.columns, i % self.columns)
+        vbox.addLayout(grid)
+        self.setLayout(vbox)
+
+    @property
+    def frames(self):
+        return self.plot_frames + self.image_frames
+
+    def set_results(self, results, pen=None):
+        """ Shows the data of a :class:`.Results` object in all the views """
+        self.clear()
+        self.subscription = ResultsSubscription(results, parent=self)
+        if pen is None:
+            pen = pg.mkPen(color=pg.intColor(0), width=2)
+        for frame in self.plot_frames:
+            curve = ResultsCurve(self.subscription, frame.x_axis, frame.y_axis, pen=pen,
+                                 antialias=False)
+            frame.plot.addItem(curve)
+        for frame in self.image_frames:
+            frame.plot.addItem(ResultsImage(self.subscription, frame.x_axis, frame.y_axis,
+                                            frame.z_axis))
+        self.refresh()
+
+    def clear(self):
+        """ Removes the data of the experiment from all the views """
+        for frame in self.frames:
+            for item in frame.plot.items[:]:
+                if isinstance(item, (ResultsCurve, ResultsImage)):
+                    frame.plot.removeItem(item)
+        self.readout.clear()
+        if self.subscription is not None:
+            self.subscription.deleteLater()
+        self.subscription = None
+
+    def refresh(self):
+        """ Reads the data once, if it changed, and updates all the views """
+        if self.subscription is None or not self.subscription.poll():
+            return
+        start = time.perf_counter()
+        for frame in self.frames:
+            frame.update_curves()
+            frame.crosshairs.update()
+        if self.readouts:
+            self.readout.update_values(self.subscription.data)
+        self.timer.record(time.perf_counter() - start)
+
+
 class LogWidget(QtGui.QWidget):
-    def __init__(self, parent=None):
+    """ Shows the last max_lines log records of its handler, which are
+    added in batches every refresh_time. The records can be filtered by
+    their level and searched for a text, which is matched against the
+    messages of all the retained records.
+    """
+
+    LEVELS = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
+
+    def __init__(self, max_lines=10000, refresh_time=0.2, parent=None):
         super().__init__(parent)
+        self.max_lines = max_lines
+        self.refresh_time = refresh_time
+        self._count = 0  # number of records of the handler which were read
         self._setup_ui()
         self._layout()
 
     def _setup_ui(self):
         self.view = QtGui.QPlainTextEdit()
         self.view.setReadOnly(True)
-        self.handler = LogHandler()
+        self.view.setMaximumBlockCount(self.max_lines)
+        self.handler = BufferedLogHandler(self.max_lines)
         self.handler.setFormatter(logging.Formatter(
             fmt='%(asctime)s : %(message)s (%(levelname)s)',
             datefmt='%m/%d/%Y %I:%M:%S %p'
         ))
-        self.handler.record.connect(self.view.appendPlainText)
+
+        self.level = QtGui.QComboBox(self)
+        self.level.addItems(self.LEVELS)
+        self.level.currentIndexChanged.connect(self.refilter)
+        self.search = QtGui.QLineEdit(self)
+        self.search.setPlaceholderText("Search")
+        self.search.textChanged.connect(self.refilter)
+
+        self.timer = QtCore.QTimer()
+        self.timer.timeout.connect(self.update_view)
+        self.timer.start(int(self.refresh_time * 1e3))
 
     def _layout(self):
         vbox = QtGui.QVBoxLayout(self)
         vbox.setSpacing(0)
 
+        hbox = QtGui.QHBoxLayout()
+        hbox.addWidget(self.search)
+        hbox.addWidget(self.level)
+
+        vbox.addLayout(hbox)
         vbox.addWidget(self.view)
         self.setLayout(vbox)
 
+    def _lines(self, records):
+        """ Returns the formatted lines of the records which pass the level
+        and search filters, which are applied before formatting """
+        level = getattr(logging, self.level.currentText())
+        text = self.search.text().lower()
+        return [self.handler.format(record) for record in records
+                if record.levelno >= level and text in record.getMessage().lower()]
+
+    def update_view(self):
+        """ Appends the records handled since the last update """
+        records, self._count = self.handler.since(self._count)
+        lines = self._lines(records)
+        if lines:
+            self.view.appendPlainText("\n".join(lines))
+
+    def refilter(self):
+        """ Shows the retained records which pass the current filters """
+        records, self._count = self.handler.since(0)
+        self.view.setPlainText("\n".join(self._lines(records)))
+        self.view.moveCursor(QtGui.QTextCursor.End)
+
 
 class ResultsDialog(QtGui.QFileDialog):
     def __init__(self, columns, x_axis=None, y_axis=None, parent=None):
@@ -581,71 +931,32 @@ class ResultsDialog(QtGui.QFileDialog):
         self.plot.clear()
         if not os.path.isdir(filename) and filename != '':
             try:
-                results = Results.load(str(filename))
-            except ValueError:
+                # metadata and downsampled data, without parsing the whole file
+                # or writing an index into the directory
+                preview = ResultsIndex.lookup(str(filename), read_only=True)
+            except (ValueError, UnicodeDecodeError):
                 return
-            except Exception as e:
-                raise e
 
-            curve = ResultsCurve(results,
+            curve = ResultsCurve(preview,
                                  x=self.plot_widget.plot_frame.x_axis,
                                  y=self.plot_widget.plot_frame.y_axis,
                                  pen=pg.mkPen(color=(255, 0, 0), width=1.75),
                                  antialias=True
                                  )
-            curve.update()
-
-            self.plot.addItem(curve)
+            try:
+                curve.update()
+            except KeyError:  # columns of another procedure
+                log.warning("Data file %s does not contain the plotted columns" % filename)
+            else:
+                self.plot.addItem(curve)
 
             self.preview_param.clear()
-            for key, param in results.procedure.parameter_objects().items():
-                new_item = QtGui.QTreeWidgetItem([param.name, str(param)])
+            for name, value in preview.parameters.items():
+                new_item = QtGui.QTreeWidgetItem([name, value])
                 self.preview_param.addTopLevelItem(new_item)
             self.preview_param.sortItems(0, QtCore.Qt.AscendingOrder)
 
 
-""" This defines a list of functions that can be used to generate a sequence. """
-SAFE_FUNCTIONS = {
-    'range': range,
-    'sorted': sorted,
-    'list': list,
-    'arange': numpy.arange,
-    'linspace': numpy.linspace,
-    'arccos': numpy.arccos,
-    'arcsin': numpy.arcsin,
-    'arctan': numpy.arctan,
-    'arctan2': numpy.arctan2,
-    'ceil': numpy.ceil,
-    'cos': numpy.cos,
-    'cosh': numpy.cosh,
-    'degrees': numpy.degrees,
-    'e': numpy.e,
-    'exp': numpy.exp,
-    'fabs': numpy.fabs,
-    'floor': numpy.floor,
-    'fmod': numpy.fmod,
-    'frexp': numpy.frexp,
-    'hypot': numpy.hypot,
-    'ldexp': numpy.ldexp,
-    'log': numpy.log,
-    'log10': numpy.log10,
-    'modf': numpy.modf,
-    'pi': numpy.pi,
-    'power': numpy.power,
-    'radians': numpy.radians,
-    'sin': numpy.sin,
-    'sinh': numpy.sinh,
-    'sqrt': numpy.sqrt,
-    'tan': numpy.tan,
-    'tanh': numpy.tanh,
-}
-
-
-class SequenceEvaluationException(Exception):
-    """Raised when the evaluation of a sequence string goes wrong."""
-    pass
-
-
 class SequencerWidget(QtGui.QWidget):
     """
     Widget that allows to generate a sequence of measurements with varying
@@ -814,8 +1125,10 @@ class SequencerWidget(QtGui.QWidget):
 
     def queue_sequence(self):
         """
-        Obtain a list of parameters from the sequence tree, enter these into
-        procedures, and queue these procedures.
+        Obtain the sequence of parameters from the sequence tree and queue
+        the corresponding procedures. The procedures are made lazily by the
+        `make_procedure` method of the parent, only when the manager is about
+        to run them, with the inputs at the time of queuing the sequence.
         """
 
         self.queue_button.setEnabled(False)
@@ -829,13 +1142,10 @@ class SequencerWidget(QtGui.QWidget):
                 "Queuing %d measurements based on the entered sequences." % len(sequence)
             )
 
-            for entry in sequence:
-                QtGui.QApplication.processEvents()
-                parameters = dict(ChainMap(*entry[::-1]))
-
-                procedure = self._parent.make_procedure()
-                procedure.set_parameters(parameters)
-                self._parent.queue(procedure=procedure)
+            # parameters of the inputs at the time of queuing the sequence
+            parameters = self._parent.make_procedure().parameter_values()
+            procedures = sequence.procedures(self._parent.make_procedure, **parameters)
+            self._parent.manager.queue_sequence(procedures, self._parent.queue)
 
         finally:
             self.queue_button.setEnabled(True)
@@ -853,104 +1163,31 @@ class SequencerWidget(QtGui.QWidget):
         if len(fileName) == 0:
             return
 
-        content = []
-
-        with open(fileName, "r") as file:
-            content = file.readlines()
-
-        pattern = re.compile("([-]+) \"(.*?)\", \"(.*?)\"")
-        for line in content:
-            line = line.strip()
-            match = pattern.search(line)
-
-            if not match:
-                continue
-
-            level = len(match.group(1)) - 1
-
-            if level < 0:
-                continue
-
-            parameter = match.group(2)
-            sequence = match.group(3)
-
+        for level, parameter, sequence in read_sequence_file(fileName):
             self._add_tree_item(
-                level=level, 
-                parameter=parameter, 
+                level=level,
+                parameter=parameter,
                 sequence=sequence,
             )
 
     def _generate_sequence_from_tree(self):
         """
-        Generate a list of parameters from the sequence tree.
+        Generate a :class:`.Sequence` of parameters from the sequence tree,
+        which yields the parameter sets on demand.
         """
 
-        iterator = QtGui.QTreeWidgetItemIterator(self.tree)
-        sequences = []
-        current_sequence = [[] for i in range(self.MAXDEPTH)]
-        temp_sequence = [[] for i in range(self.MAXDEPTH)]
-
-        while iterator.value():
-            item = iterator.value()
-            depth = self._depth_of_child(item)
-
-            name = self.tree.itemWidget(item, 1).currentText()
-            parameter = self.names_inv[name]
-            values = self.eval_string(
-                self.tree.itemWidget(item, 2).text(),
-                name, depth,
-            )
-
-            try:
-                sequence_entry = [{parameter: value} for value in values]
-            except TypeError:
-                log.error(
-                    "TypeError, likely no sequence for one of the parameters"
+        def items(parent, depth):
+            for i in range(parent.childCount()):
+                item = parent.child(i)
+                name = self.tree.itemWidget(item, 1).currentText()
+                yield SequenceItem(
+                    self.names_inv[name],
+                    self.eval_string(self.tree.itemWidget(item, 2).text(), name, depth),
+                    children=items(item, depth + 1),
+                    depth=depth,
                 )
-            else:
-                current_sequence[depth].extend(sequence_entry)
-
-            iterator += 1
-            next_depth = self._depth_of_child(iterator.value())
-
-            for depth_idx in range(depth, next_depth, -1):
-                temp_sequence[depth_idx].extend(current_sequence[depth_idx])
 
-                if depth_idx != 0:
-                    sequence_products = list(product(
-                        current_sequence[depth_idx - 1],
-                        temp_sequence[depth_idx]
-                    ))
-
-                    for i in range(len(sequence_products)):
-                        try:
-                            element = sequence_products[i][1]
-                        except IndexError:
-                            log.error(
-                                "IndexError, likely empty nested parameter"
-                            )
-                        else:
-                            if isinstance(element, tuple):
-                                sequence_products[i] = (
-                                    sequence_products[i][0], *element)
-
-                    temp_sequence[depth_idx - 1].extend(sequence_products)
-                    temp_sequence[depth_idx] = []
-
-                current_sequence[depth_idx] = []
-                current_sequence[depth_idx - 1] = []
-
-            if depth == next_depth:
-                temp_sequence[depth].extend(current_sequence[depth])
-                current_sequence[depth] = []
-
-        sequences = temp_sequence[0]
-
-        for idx in range(len(sequences)):
-            if not isinstance(sequences[idx], tuple):
-                sequences[idx] = (sequences[idx],)
-
-        return sequences
+        return Sequence(items(self.tree.invisibleRootItem(), 0))
 
     @staticmethod
     def _depth_of_child(item):
@@ -964,48 +1201,8 @@ class SequencerWidget(QtGui.QWidget):
             depth += 1
         return depth
 
-    @staticmethod
-    def eval_string(string, name=None, depth=None):
-        """
-        Evaluate the given string. The string is evaluated using a list of
-        pre-defined functions that are deemed safe to use, to prevent the
-        execution of malicious code. For this purpose, also any built-in
-        functions or global variables are not available.
-
-        :param string: String to be interpreted.
-        :param name: Name of the to-be-interpreted string, only used for
-            error messages.
-        :param depth: Depth of the to-be-interpreted string, only used
-            for error messages.
-        """
-
-        evaluated_string = None
-        if len(string) > 0:
-            try:
-                evaluated_string = eval(
-                    string, {"__builtins__": None}, SAFE_FUNCTIONS
-                )
-            except TypeError:
-                log.error("TypeError, likely a typo in one of the " +
-                          "functions for parameter '{}', depth {}".format(
-                              name, depth
-                          ))
-                raise SequenceEvaluationException()
-            except SyntaxError:
-                log.error("SyntaxError, likely unbalanced brackets " +
-                          "for parameter '{}', depth {}".format(name, depth))
-                raise SequenceEvaluationException()
-            except ValueError:
-                log.error("ValueError, likely wrong function argument " +
-                          "for parameter '{}', depth {}".format(name, depth))
-                raise SequenceEvaluationException()
-        else:
-            log.error("No sequence entered for " +
-                      "for parameter '{}', depth {}".format(name, depth))
-            raise SequenceEvaluationException()
+    eval_string = staticmethod(eval_string)
 
-        evaluated_string = numpy.array(evaluated_string)
-        return evaluated_string
 
 class DirectoryLineEdit(QtGui.QLineEdit):
     """
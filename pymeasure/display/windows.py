@@ -35,6 +35,7 @@ from .curves import ResultsCurve
 from .manager import Manager, Experiment, ImageExperiment, ImageManager
 from .Qt import QtCore, QtGui
 from .widgets import (
+    DashboardWidget,
     PlotWidget,
     BrowserWidget,
     InputsWidget,
@@ -44,6 +45,8 @@ from .widgets import (
     ImageWidget,
     DirectoryLineEdit,
 )
+from ..experiment.journal import QueueJournal
+from ..experiment.procedure import Procedure
 from ..experiment.results import Results
 
 log = logging.getLogger(__name__)
@@ -150,12 +153,24 @@ class ManagedWindow(QtGui.QMainWindow):
 
     .. _pyqtgraph.PlotItem: http://www.pyqtgraph.org/documentation/graphicsItems/plotitem.html
 
+    If a `journal_file` is given, the queued experiments are recorded in a
+    :class:`~pymeasure.experiment.journal.QueueJournal` in this file and are
+    restored with their status when the window is opened again, e.g. after
+    a crash. Restored experiments which are still queued are started with
+    the "Resume" button.
+
+    If `max_loaded_experiments` is given, only the data of this many
+    experiments is kept in memory. The data of the least recently shown or
+    finished experiments is evicted, hidden ones first, keeping a decimated
+    preview of their curves, and is read from the data files again when
+    they are shown.
 
     """
 
     def __init__(self, procedure_class, inputs=(), displays=(), x_axis=None, y_axis=None,
                  log_channel='', log_level=logging.INFO, parent=None, sequencer=False,
-                 sequencer_inputs=None, sequence_file=None, inputs_in_scrollarea=False, directory_input=False):
+                 sequencer_inputs=None, sequence_file=None, inputs_in_scrollarea=False, directory_input=False,
+                 journal_file=None, max_loaded_experiments=None):
         super().__init__(parent)
         app = QtCore.QCoreApplication.instance()
         app.aboutToQuit.connect(self.quit)
@@ -167,6 +182,8 @@ class ManagedWindow(QtGui.QMainWindow):
         self.sequence_file = sequence_file
         self.inputs_in_scrollarea = inputs_in_scrollarea
         self.directory_input = directory_input
+        self.journal_file = journal_file
+        self.max_loaded_experiments = max_loaded_experiments
         self.log = logging.getLogger(log_channel)
         self.log_level = log_level
         log.setLevel(log_level)
@@ -175,6 +192,8 @@ class ManagedWindow(QtGui.QMainWindow):
         self._setup_ui()
         self._layout()
         self.setup_plot(self.plot)
+        if self.journal_file is not None:
+            self.restore_experiments()
 
     def _setup_ui(self):
         self.log_widget = LogWidget()
@@ -193,7 +212,9 @@ class ManagedWindow(QtGui.QMainWindow):
         self.abort_button.setEnabled(False)
         self.abort_button.clicked.connect(self.abort)
 
-        self.plot_widget = PlotWidget(self.procedure_class.DATA_COLUMNS, self.x_axis, self.y_axis)
+        units = self.procedure_class.measurement_schema().units
+        self.plot_widget = PlotWidget(self.procedure_class.DATA_COLUMNS, self.x_axis, self.y_axis,
+                                      units=units)
         self.plot = self.plot_widget.plot
 
         self.browser_widget = BrowserWidget(
@@ -218,7 +239,10 @@ class ManagedWindow(QtGui.QMainWindow):
             parent=self
         )
 
-        self.manager = Manager(self.plot, self.browser, log_level=self.log_level, parent=self)
+        journal = QueueJournal(self.journal_file) if self.journal_file is not None else None
+        self.manager = Manager(self.plot, self.browser, log_level=self.log_level,
+                               journal=journal, max_loaded=self.max_loaded_experiments,
+                               parent=self)
         self.manager.abort_returned.connect(self.abort_returned)
         self.manager.queued.connect(self.queued)
         self.manager.running.connect(self.running)
@@ -285,6 +309,7 @@ class ManagedWindow(QtGui.QMainWindow):
         tabs = QtGui.QTabWidget(self.main)
         tabs.addTab(self.plot_widget, "Results Graph")
         tabs.addTab(self.log_widget, "Experiment Log")
+        self.tabs = tabs
 
         splitter = QtGui.QSplitter(QtCore.Qt.Vertical)
         splitter.addWidget(tabs)
@@ -315,7 +340,8 @@ class ManagedWindow(QtGui.QMainWindow):
             else:
                 experiment.curve.x = self.plot_widget.plot_frame.x_axis
                 experiment.curve.y = self.plot_widget.plot_frame.y_axis
-                experiment.curve.update()
+                experiment.curve.clear_data()
+                self.manager.touch(experiment)
                 self.plot.addItem(experiment.curve)
 
     def browser_item_menu(self, position):
@@ -380,6 +406,18 @@ class ManagedWindow(QtGui.QMainWindow):
     def clear_experiments(self):
         self.manager.clear()
 
+    def restore_experiments(self):
+        """ Restores the experiments recorded in the queue journal of the
+        manager, with the status they had when the window was closed. The status
+        of experiments which were running is set to aborted, and experiments
+        which are still queued are only run after the "Resume" button is used.
+        """
+        if self.manager.restore(self.procedure_class, self.new_experiment):
+            self.abort_button.setText("Resume")
+            self.abort_button.clicked.disconnect()
+            self.abort_button.clicked.connect(self.resume)
+            self.abort_button.setEnabled(True)
+
     def open_experiment(self):
         dialog = ResultsDialog(self.procedure_class.DATA_COLUMNS, self.x_axis, self.y_axis)
         if dialog.exec_():
@@ -512,7 +550,7 @@ class ManagedWindow(QtGui.QMainWindow):
         self.abort_button.setText("Abort")
         self.abort_button.clicked.disconnect()
         self.abort_button.clicked.connect(self.abort)
-        if self.manager.experiments.has_next():
+        if self.manager.has_next():
             self.manager.resume()
         else:
             self.abort_button.setEnabled(False)
@@ -527,14 +565,14 @@ class ManagedWindow(QtGui.QMainWindow):
         self.browser_widget.clear_button.setEnabled(False)
 
     def abort_returned(self, experiment):
-        if self.manager.experiments.has_next():
+        if self.manager.has_next():
             self.abort_button.setText("Resume")
             self.abort_button.setEnabled(True)
         else:
             self.browser_widget.clear_button.setEnabled(True)
 
     def finished(self, experiment):
-        if not self.manager.experiments.has_next():
+        if not self.manager.has_next():
             self.abort_button.setEnabled(False)
             self.browser_widget.clear_button.setEnabled(True)
 
@@ -544,6 +582,78 @@ class ManagedWindow(QtGui.QMainWindow):
             raise ValueError("No directory input in the ManagedWindow")
         return self.directory_line.text()
 
+
+class ManagedDashboardWindow(ManagedWindow):
+    """
+    Extends the :class:`.ManagedWindow` with a dashboard tab, which shows
+    several plots, images and numeric readouts of the running experiment,
+    or of the last one which ran. All the views of the dashboard share one
+    subscription to the data of the experiment, which is read once per
+    refresh, see :class:`.DashboardWidget`. While the experiment runs, its
+    curve in the main plot reads the same subscription.
+
+    :param plots: List of (x, y) column pairs, one for each plot
+    :param images: List of (x, y, z) columns, one for each image, which
+        require the procedure to have the parameters of the image grid as
+        for the :class:`.ManagedImageWindow`
+    :param readouts: List of the columns whose last values are shown
+    :param dashboard_columns: Number of views in a row of the dashboard
+
+    The other arguments are those of the :class:`.ManagedWindow`.
+    """
+
+    def __init__(self, procedure_class, plots=(), images=(), readouts=(),
+                 dashboard_columns=2, **kwargs):
+        self.dashboard_plots = plots
+        self.dashboard_images = images
+        self.dashboard_readouts = readouts
+        self.dashboard_columns = dashboard_columns
+        self._subscribed = None  # the experiment whose curve reads the subscription
+        super().__init__(procedure_class, **kwargs)
+
+    def _setup_ui(self):
+        super()._setup_ui()
+        self.dashboard = DashboardWidget(
+            self.dashboard_plots,
+            self.dashboard_images,
+            self.dashboard_readouts,
+            columns=self.dashboard_columns,
+            units=self.procedure_class.measurement_schema().units,
+            parent=self
+        )
+        self.manager.failed.connect(self._unsubscribe)
+
+    def _layout(self):
+        super()._layout()
+        self.tabs.insertTab(1, self.dashboard, "Dashboard")
+
+    def running(self, experiment):
+        super().running(experiment)
+        self._unsubscribe()
+        self.dashboard.set_results(experiment.results, pen=experiment.curve.opts['pen'])
+        # the main plot reads the data of the dashboard, instead of reading it again
+        experiment.curve.results = self.dashboard.subscription
+        self._subscribed = experiment
+
+    def _unsubscribe(self, *args):
+        """ Lets the curve of the experiment read its results again, which
+        also reads the data which arrived after the last refresh """
+        experiment, self._subscribed = self._subscribed, None
+        if experiment is not None:
+            experiment.curve.results = experiment.results
+            experiment.curve.update()
+
+    def abort_returned(self, experiment):
+        self._unsubscribe()
+        super().abort_returned(experiment)
+        self.dashboard.refresh()
+
+    def finished(self, experiment):
+        self._unsubscribe()
+        super().finished(experiment)
+        self.dashboard.refresh()
+
+
 # TODO: Inheret from ManagedWindow to share code and features
 class ManagedImageWindow(QtGui.QMainWindow):
     """
@@ -571,17 +681,23 @@ class ManagedImageWindow(QtGui.QMainWindow):
 
     .. _pyqtgraph.PlotItem: http://www.pyqtgraph.org/documentation/graphicsItems/plotitem.html
 
+    If a `journal_file` is given, the queued experiments are recorded in a
+    :class:`~pymeasure.experiment.journal.QueueJournal` in this file and are
+    restored with their status when the window is opened again, e.g. after
+    a crash. Restored experiments which are still queued are started with
+    the "Resume" button.
 
     """
 
     def __init__(self, procedure_class, x_axis, y_axis, z_axis=None, inputs=(), displays=(),
-                 log_channel='', log_level=logging.INFO, parent=None):
+                 log_channel='', log_level=logging.INFO, parent=None, journal_file=None):
         super().__init__(parent)
         app = QtCore.QCoreApplication.instance()
         app.aboutToQuit.connect(self.quit)
         self.procedure_class = procedure_class
         self.inputs = inputs
         self.displays = displays
+        self.journal_file = journal_file
         self.log = logging.getLogger(log_channel)
         self.log_level = log_level
         log.setLevel(log_level)
@@ -591,6 +707,8 @@ class ManagedImageWindow(QtGui.QMainWindow):
         self._layout()
         self.setup_im_plot(self.im_plot)
         self.setup_plot(self.plot)
+        if self.journal_file is not None:
+            self.restore_experiments()
 
     def _setup_ui(self):
         self.log_widget = LogWidget()
@@ -604,8 +722,11 @@ class ManagedImageWindow(QtGui.QMainWindow):
         self.abort_button.setEnabled(False)
         self.abort_button.clicked.connect(self.abort)
 
-        self.image_widget = ImageWidget(self.procedure_class.DATA_COLUMNS, self.x_axis, self.y_axis, self.z_axis)
-        self.plot_widget = PlotWidget(self.procedure_class.DATA_COLUMNS, self.x_axis, self.y_axis)
+        units = self.procedure_class.measurement_schema().units
+        self.image_widget = ImageWidget(self.procedure_class.DATA_COLUMNS, self.x_axis, self.y_axis,
+                                        self.z_axis, units=units)
+        self.plot_widget = PlotWidget(self.procedure_class.DATA_COLUMNS, self.x_axis, self.y_axis,
+                                      units=units)
         self.im_plot = self.image_widget.plot
         self.plot = self.plot_widget.plot
 
@@ -631,7 +752,9 @@ class ManagedImageWindow(QtGui.QMainWindow):
             parent=self
         )
 
-        self.manager = ImageManager(self.plot, self.im_plot, self.browser, log_level=self.log_level, parent=self)
+        journal = QueueJournal(self.journal_file) if self.journal_file is not None else None
+        self.manager = ImageManager(self.plot, self.im_plot, self.browser, log_level=self.log_level,
+                                    journal=journal, parent=self)
         self.manager.abort_returned.connect(self.abort_returned)
         self.manager.queued.connect(self.queued)
         self.manager.running.connect(self.running)
@@ -698,7 +821,8 @@ class ManagedImageWindow(QtGui.QMainWindow):
                 # add regular plot
                 experiment.curve.x = self.plot_widget.plot_frame.x_axis
                 experiment.curve.y = self.plot_widget.plot_frame.y_axis
-                experiment.curve.update()
+                experiment.curve.clear_data()
+                self.manager.touch(experiment)
                 self.plot.addItem(experiment.curve)
                 # add/update image plot
                 experiment.image.update_img()
@@ -766,6 +890,18 @@ class ManagedImageWindow(QtGui.QMainWindow):
     def clear_experiments(self):
         self.manager.clear()
 
+    def restore_experiments(self):
+        """ Restores the experiments recorded in the queue journal of the
+        manager, with the status they had when the window was closed. The status
+        of experiments which were running is set to aborted, and experiments
+        which are still queued are only run after the "Resume" button is used.
+        """
+        if self.manager.restore(self.procedure_class, self.new_experiment):
+            self.abort_button.setText("Resume")
+            self.abort_button.clicked.disconnect()
+            self.abort_button.clicked.connect(self.resume)
+            self.abort_button.setEnabled(True)
+
     def open_experiment(self):
         dialog = ResultsDialog(self.procedure_class.DATA_COLUMNS, self.x_axis, self.y_axis)
         if dialog.exec_():
@@ -917,7 +1053,7 @@ class ManagedImageWindow(QtGui.QMainWindow):
         self.abort_button.setText("Abort")
         self.abort_button.clicked.disconnect()
         self.abort_button.clicked.connect(self.abort)
-        if self.manager.experiments.has_next():
+        if self.manager.has_next():
             self.manager.resume()
         else:
             self.abort_button.setEnabled(False)
@@ -932,13 +1068,13 @@ class ManagedImageWindow(QtGui.QMainWindow):
         self.browser_widget.clear_button.setEnabled(False)
 
     def abort_returned(self, experiment):
-        if self.manager.experiments.has_next():
+        if self.manager.has_next():
             self.abort_button.setText("Resume")
             self.abort_button.setEnabled(True)
         else:
             self.browser_widget.clear_button.setEnabled(True)
 
     def finished(self, experiment):
-        if not self.manager.experiments.has_next():
+        if not self.manager.has_next():
             self.abort_button.setEnabled(False)
             self.browser_widget.clear_button.setEnabled(True)
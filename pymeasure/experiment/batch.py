@@ -0,0 +1,310 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2021 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+
+import argparse
+import importlib
+import importlib.util
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+from .index import ResultsIndex
+from .procedure import Procedure
+from .results import Results
+from .sequencer import Sequence
+from .workers import Worker
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+def load_procedure_class(name):
+    """ Returns a :class:`.Procedure` class given by its import path, e.g.
+    'package.module:MyProcedure', or by a Python file, e.g.
+    'procedures.py:MyProcedure'.
+    """
+    module_name, separator, class_name = name.rpartition(':')
+    if not separator:
+        module_name, _, class_name = name.rpartition('.')
+    if not module_name or not class_name:
+        raise ValueError("Procedure class '%s' is not of the form "
+                         "'module:Class'" % name)
+    if module_name.endswith('.py'):
+        spec = importlib.util.spec_from_file_location(
+            os.path.splitext(os.path.basename(module_name))[0], module_name)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = module  # needed to pickle the results
+        spec.loader.exec_module(module)
+    else:
+        module = importlib.import_module(module_name)
+    procedure_class = getattr(module, class_name)
+    if not (isinstance(procedure_class, type) and issubclass(procedure_class, Procedure)):
+        raise ValueError("%s is not a Procedure class" % name)
+    return procedure_class
+
+
+def format_duration(seconds):
+    """ Returns a duration in seconds as a string 'H:MM:SS' """
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return "%d:%02d:%02d" % (hours, minutes, seconds)
+
+
+class BatchRunner(object):
+    """ Runs the procedures of a :class:`.Sequence` without a graphical
+    interface, with the same :class:`.Worker` and :class:`.Recorder` as the
+    :class:`.ManagedWindow`.
+
+    Each procedure records into a file named after its position in the
+    sequence, e.g. 'DATA0042.csv' in the `directory`. The data is written
+    to a '.part' file, which is renamed when the procedure has finished,
+    such that a run which was interrupted can be resumed by running the same
+    sequence again: the procedures with existing results files are skipped.
+
+    If several resources are given, e.g. the addresses of identical
+    instruments, one procedure runs per resource at the same time. The
+    resource is passed to each procedure as the value of the
+    `resource_parameter`, which the :class:`.Procedure` has to declare.
+
+    .. code-block:: python
+
+        sequence = Sequence.load("sequence.txt", MyProcedure)
+        runner = BatchRunner(MyProcedure, sequence, "data",
+                             resources=["GPIB::1", "GPIB::2"])
+        runner.run()
+
+    :param procedure_class: The :class:`.Procedure` class to run
+    :param sequence: The :class:`.Sequence` of parameter sets
+    :param directory: The directory of the results files
+    :param prefix: The prefix of the results file names
+    :param parameters: Dictionary of parameter values common to all procedures
+    :param resources: List of resources, across which the procedures run in
+        parallel
+    :param resource_parameter: The name of the parameter, which takes the
+        resource of a procedure
+    :param resume: Whether procedures with existing results files are skipped
+    :param report: Function called with a message about the progress after
+        each procedure, e.g. print. By default the message is logged.
+    :param index: Whether the results files are added to the
+        :class:`.ResultsIndex` of the directory
+    """
+
+    PART_EXTENSION = '.part'
+
+    def __init__(self, procedure_class, sequence, directory, prefix='DATA',
+                 parameters=None, resources=None, resource_parameter='resource',
+                 resume=True, report=None, log_level=logging.INFO, index=False):
+        self.procedure_class = procedure_class
+        self.sequence = sequence
+        self.directory = directory
+        self.prefix = prefix
+        self.parameters = parameters or {}
+        self.resources = list(resources or [None])
+        self.resource_parameter = resource_parameter
+        self.resume = resume
+        self.report = report or log.info
+        self.log_level = log_level
+        self.index = index
+
+        self.total = len(sequence)
+        self._width = len(str(max(self.total - 1, 0)))
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._workers = set()
+        self.finished = self.failed = self.aborted = self.skipped = 0
+        self._start_time = None
+
+    def filename(self, index):
+        """ Returns the results filename of the procedure at the index of
+        the sequence """
+        return os.path.join(self.directory, "%s%0*d.csv" % (
+            self.prefix, self._width, index))
+
+    def _jobs(self):
+        procedures = self.sequence.procedures(self.procedure_class, **self.parameters)
+        for index, procedure in enumerate(procedures):
+            filename = self.filename(index)
+            if self.resume and os.path.exists(filename):
+                self.skipped += 1
+                continue
+            yield index, procedure
+
+    def run(self):
+        """ Runs the sequence and returns True if all procedures have
+        finished """
+        os.makedirs(self.directory, exist_ok=True)
+        self._start_time = time.perf_counter()
+        self._stop.clear()
+        jobs = self._jobs()
+        lanes = [threading.Thread(target=self._run_lane, args=(jobs, resource))
+                 for resource in self.resources]
+        for lane in lanes:
+            lane.start()
+        try:
+            for lane in lanes:
+                while lane.is_alive():
+                    lane.join(0.1)
+        except (KeyboardInterrupt, SystemExit):
+            log.warning("User stopped the batch run prematurely")
+            self.stop()
+            for lane in lanes:
+                lane.join()
+        self.report(self.summary())
+        return self.finished + self.skipped == self.total
+
+    def stop(self):
+        """ Aborts the running procedures and stops the run """
+        self._stop.set()
+        with self._lock:
+            for worker in self._workers:
+                worker.stop()
+
+    def _run_lane(self, jobs, resource):
+        while not self._stop.is_set():
+            with self._lock:
+                try:
+                    index, procedure = next(jobs)
+                except StopIteration:
+                    return
+            if resource is not None:
+                procedure.set_parameters({self.resource_parameter: resource})
+            try:
+                status = self._run_procedure(index, procedure)
+            except Exception:
+                log.exception("Failed to run procedure %d of the sequence", index)
+                status = Procedure.FAILED
+            with self._lock:
+                if status == Procedure.FINISHED:
+                    self.finished += 1
+                elif status == Procedure.ABORTED:
+                    self.aborted += 1
+                else:
+                    self.failed += 1
+                message = self.progress(index, status)
+            self.report(message)
+
+    def _run_procedure(self, index, procedure):
+        filename = self.filename(index)
+        part_filename = filename + self.PART_EXTENSION
+        if os.path.exists(part_filename):  # left over by an interrupted run
+            os.remove(part_filename)
+        results = Results(procedure, part_filename)
+        worker = Worker(results, log_level=self.log_level, index=self.index)
+        with self._lock:
+            if self._stop.is_set():
+                return Procedure.ABORTED
+            self._workers.add(worker)
+        try:
+            worker.start()
+            worker.join(timeout=None)
+        finally:
+            with self._lock:
+                self._workers.discard(worker)
+        if procedure.status == Procedure.FINISHED:
+            os.replace(part_filename, filename)
+            if self.index:
+                try:
+                    index = ResultsIndex(self.directory)
+                    try:
+                        index.rename(part_filename, filename)
+                    finally:
+                        index.close()
+                except sqlite3.Error:
+                    log.warning("Failed to update the results index of %s", filename)
+        return procedure.status
+
+    def progress(self, index, status):
+        """ Returns a message about the progress, with the throughput and
+        the estimated time until the sequence is completed """
+        done = self.finished + self.failed + self.aborted
+        elapsed = time.perf_counter() - self._start_time
+        rate = done / elapsed if elapsed > 0 else 0.
+        remaining = self.total - done - self.skipped
+        eta = format_duration(remaining / rate) if rate > 0 else "unknown"
+        return "[%d/%d] %s %s, %.2f procedures/min, ETA %s" % (
+            done + self.skipped, self.total, os.path.basename(self.filename(index)),
+            Procedure.STATUS_STRINGS[status], 60 * rate, eta)
+
+    def summary(self):
+        """ Returns a message summarizing the run """
+        elapsed = time.perf_counter() - self._start_time
+        return ("%d finished, %d failed, %d aborted, %d skipped of %d procedures "
+                "in %s" % (self.finished, self.failed, self.aborted, self.skipped,
+                           self.total, format_duration(elapsed)))
+
+
+def main(argv=None):
+    """ Command-line entry point, which runs a sequence file with a
+    :class:`.BatchRunner`. Run with '--help' for the arguments. """
+    parser = argparse.ArgumentParser(
+        prog="python -m pymeasure.experiment.batch",
+        description="Runs the procedures of a sequence file without a "
+                    "graphical interface.")
+    parser.add_argument("procedure",
+                        help="Procedure class, e.g. 'package.module:MyProcedure' "
+                             "or 'procedures.py:MyProcedure'")
+    parser.add_argument("sequence", help="Sequence file, as loaded by the sequencer")
+    parser.add_argument("-d", "--directory", default=".",
+                        help="Directory of the results files (default: '.')")
+    parser.add_argument("-p", "--prefix", default="DATA",
+                        help="Prefix of the results file names (default: 'DATA')")
+    parser.add_argument("-s", "--set", metavar="NAME=VALUE", action="append", default=[],
+                        help="Value of a parameter common to all procedures")
+    parser.add_argument("-r", "--resource", action="append", default=[],
+                        help="Resource to run procedures on in parallel, "
+                             "can be given multiple times")
+    parser.add_argument("--resource-parameter", default="resource",
+                        help="Parameter which takes the resource (default: 'resource')")
+    parser.add_argument("--no-resume", dest="resume", action="store_false",
+                        help="Rerun procedures with existing results files")
+    parser.add_argument("--index", action="store_true",
+                        help="Add the results files to the index of the directory")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="Log the messages of the procedures")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+
+    procedure_class = load_procedure_class(args.procedure)
+    try:
+        parameters = dict(item.split("=", 1) for item in args.set)
+    except ValueError:
+        parser.error("Parameters have to be given as NAME=VALUE")
+    sequence = Sequence.load(args.sequence, procedure_class)
+
+    runner = BatchRunner(procedure_class, sequence, args.directory,
+                         prefix=args.prefix, parameters=parameters,
+                         resources=args.resource,
+                         resource_parameter=args.resource_parameter,
+                         resume=args.resume, report=print, index=args.index,
+                         log_level=logging.INFO if args.verbose else logging.WARNING)
+    return 0 if runner.run() else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
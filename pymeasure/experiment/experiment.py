@@ -27,11 +27,6 @@ import logging
 log = logging.getLogger()
 log.addHandler(logging.NullHandler())
 
-try:
-    from IPython import display
-except ImportError:
-    log.warning("IPython could not be imported")
-
 from .results import unique_filename
 from .config import get_config, set_mpl_rcparams
 from pymeasure.log import setup_logging, console_log
@@ -39,7 +34,6 @@ from pymeasure.experiment import Results, Worker
 from .parameters import Measurable
 import time, signal
 import numpy as np
-import pandas as pd
 import tempfile
 import gc
 
@@ -157,6 +151,7 @@ class Experiment(object):
         """Live plotting loop for jupyter notebook, which automatically updates
         (an) in-line matplotlib graph(s). Will create a new plot as specified by input
         arguments, or will update (an) existing plot(s)."""
+        from IPython import display  # only required for notebooks
         if self.wait_for_data():
             if not (self.plots):
                 self.plot(*args, **kwargs)
@@ -191,6 +186,7 @@ class Experiment(object):
     def update_plot(self):
         """Update the plots in the plots list with new data from the experiment.data
         pandas dataframe."""
+        from IPython import display  # only required for notebooks
         try:
             tasks = []
             self.data
@@ -217,6 +213,7 @@ class Experiment(object):
     def pcolor(self, xname, yname, zname, *args, **kwargs):
         """Plot the results from the experiment.data pandas dataframe in a pcolor graph.
         Store the plots in a plots list attribute."""
+        import pandas as pd
         title = self.title
         x, y, z = self._data[xname], self._data[yname], self._data[zname]
         shape = (len(y.unique()), len(x.unique()))
@@ -238,6 +235,7 @@ class Experiment(object):
 
     def update_pcolor(self, ax, xname, yname, zname):
         """Update a pcolor graph with new data."""
+        import pandas as pd
         x, y, z = self._data[xname], self._data[yname], self._data[zname]
         shape = (len(y.unique()), len(x.unique()))
         diff = shape[0] * shape[1] - len(z)
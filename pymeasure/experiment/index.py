@@ -0,0 +1,312 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2021 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+
+import json
+import logging
+import numbers
+import os
+import pathlib
+import re
+import sqlite3
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+class IndexEntry(object):
+    """ Metadata of a results data file, as stored in a :class:`.ResultsIndex`:
+    the procedure class, the parameters, the data columns, the number of
+    data rows and the minimum and maximum of the numeric columns. It allows
+    previewing a data file without importing its procedure class or reading
+    all of its data.
+
+    :param data_filename: The filename of the data file
+    :param procedure: The name of the procedure class, e.g. 'module.MyProcedure'
+    :param parameters: Dictionary of the parameter values as strings by the
+        parameter names, as written in the header
+    :param columns: List of the column names
+    :param header_lines: Number of comment lines preceding the column names
+    :param rows: Number of data rows
+    :param stats: Dictionary of [minimum, maximum] by column name, or None
+        if unknown
+    :param size: Size of the data file in bytes, when indexed
+    :param mtime: Modification time of the data file, when indexed
+    """
+
+    #: Maximum number of data points of :attr:`data`
+    PREVIEW_POINTS = 2000
+    COMMENT = '#'
+    DELIMITER = ','
+
+    _procedure_pattern = re.compile(r"<(?P<name>[^>]+)>")
+
+    def __init__(self, data_filename, procedure=None, parameters=None, columns=None,
+                 header_lines=0, rows=0, stats=None, size=None, mtime=None):
+        self.data_filename = data_filename
+        self.procedure = procedure
+        self.parameters = parameters or {}
+        self.columns = columns or []
+        self.header_lines = header_lines
+        self.rows = rows
+        self.stats = stats
+        self.size = size
+        self.mtime = mtime
+        self._data = None
+
+    @classmethod
+    def scan(cls, data_filename):
+        """ Returns the IndexEntry of a data file by reading its header and
+        counting its lines, without parsing its data. The column statistics
+        are unknown. Raises a ValueError if it is not a results data file.
+        """
+        procedure, parameters, header_lines = None, {}, 0
+        with open(data_filename, 'rb') as f:
+            for line in f:
+                line = line.decode()
+                if not line.startswith(cls.COMMENT):
+                    break
+                header_lines += 1
+                line = line[1:].rstrip('\r\n')
+                if line.startswith("Procedure"):
+                    match = cls._procedure_pattern.search(line)
+                    procedure = match.group("name") if match else None
+                elif line.startswith("\t"):
+                    name, separator, value = line[1:].partition(": ")
+                    if separator:
+                        parameters[name] = value
+            else:
+                line = ''
+            if procedure is None:
+                raise ValueError("%s is not a results file, as its header "
+                                 "does not contain the Procedure class" % data_filename)
+            columns = [column for column in line.rstrip('\r\n').split(cls.DELIMITER) if column]
+            rows, last = 0, b'\n'
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                rows += chunk.count(b'\n')
+                last = chunk[-1:]
+            if last != b'\n':  # unterminated last line
+                rows += 1
+        entry = cls(data_filename, procedure, parameters, columns, header_lines, rows)
+        entry.stamp()
+        return entry
+
+    def stamp(self):
+        """ Records the current size and modification time of the data file """
+        stat = os.stat(self.data_filename)
+        self.size, self.mtime = stat.st_size, stat.st_mtime
+
+    def is_current(self):
+        """ Returns True if the data file has not changed since indexing """
+        try:
+            stat = os.stat(self.data_filename)
+        except OSError:
+            return False
+        return (stat.st_size, stat.st_mtime) == (self.size, self.mtime)
+
+    def add(self, record):
+        """ Accounts for a data point, which was appended to the data file
+
+        :param record: Dictionary of the values by column name
+        """
+        self.rows += 1
+        if self.stats is None:
+            return
+        if not isinstance(record, dict):
+            self.stats = None  # unknown for other kinds of records
+            return
+        for column, value in record.items():
+            if not isinstance(value, numbers.Real) or isinstance(value, bool):
+                continue
+            value = float(value)
+            if value != value:  # NaN
+                continue
+            bounds = self.stats.get(column)
+            if bounds is None:
+                self.stats[column] = [value, value]
+            elif value < bounds[0]:
+                bounds[0] = value
+            elif value > bounds[1]:
+                bounds[1] = value
+
+    def read(self, max_points=None):
+        """ Returns the data as a pandas DataFrame. If `max_points` is given,
+        only every n-th row is read, such that at most `max_points` rows are
+        returned.
+        """
+        import pandas as pd  # imported here to keep the import of pymeasure fast
+        skiprows = None
+        if max_points and self.rows > max_points:
+            step = -(-self.rows // max_points)
+            first = self.header_lines + 1
+
+            def skiprows(i):
+                return i >= first and (i - first) % step != 0
+
+        return pd.read_csv(self.data_filename, comment=self.COMMENT, skiprows=skiprows)
+
+    @property
+    def data(self):
+        """ The data downsampled to at most :attr:`PREVIEW_POINTS` rows, which
+        is read once. This allows to display the entry like a :class:`.Results`
+        object with a :class:`~pymeasure.display.curves.ResultsCurve`. """
+        if self._data is None:
+            self._data = self.read(self.PREVIEW_POINTS)
+        return self._data
+
+    def __repr__(self):
+        return "<%s(filename='%s',procedure=%s,rows=%d)>" % (
+            self.__class__.__name__, self.data_filename, self.procedure, self.rows)
+
+
+class ResultsIndex(object):
+    """ Index of the metadata of the results data files in a directory, which
+    is stored in an SQLite database in a hidden file of that directory. A
+    :class:`.Recorder` created with `index=True` adds the files it writes, and
+    files which are not indexed yet, or were modified, are scanned once when
+    they are looked up with :meth:`entry`.
+
+    A read-only index only opens an existing database, and files which are
+    not indexed are scanned without storing their entries, e.g. to preview
+    files without writing to the directory of the user.
+
+    .. code-block:: python
+
+        entry = ResultsIndex.lookup('data/DATA1.csv')
+        entry.parameters, entry.rows
+        preview = entry.read(max_points=1000)
+
+    :param directory: The directory of the data files
+    :param read_only: Whether the index is only read, in which case the
+        database has to exist already
+    """
+
+    FILENAME = '.pymeasure_index.sqlite'
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS results (
+            filename TEXT PRIMARY KEY,
+            procedure TEXT,
+            parameters TEXT,
+            columns TEXT,
+            header_lines INTEGER,
+            rows INTEGER,
+            stats TEXT,
+            size INTEGER,
+            mtime REAL
+        )
+    """
+
+    def __init__(self, directory, read_only=False):
+        self.directory = os.path.abspath(directory)
+        self.read_only = read_only
+        filename = os.path.join(self.directory, self.FILENAME)
+        if read_only:
+            self._connection = sqlite3.connect(pathlib.Path(filename).as_uri() + '?mode=ro',
+                                               uri=True, timeout=10)
+        else:
+            self._connection = sqlite3.connect(filename, timeout=10)
+            with self._connection:
+                self._connection.execute(self.SCHEMA)
+
+    @classmethod
+    def lookup(cls, data_filename, read_only=False):
+        """ Returns the current :class:`.IndexEntry` of a data file, as
+        given by :meth:`entry`, using the index of its directory. The file is
+        only scanned if the index can not be used, e.g. in a read-only
+        directory, or if a read-only index does not exist.
+        """
+        try:
+            index = cls(os.path.dirname(os.path.abspath(data_filename)), read_only)
+        except sqlite3.Error:
+            log.debug("No results index for %s", data_filename, exc_info=True)
+            return IndexEntry.scan(data_filename)
+        try:
+            return index.entry(data_filename)
+        finally:
+            index.close()
+
+    def _key(self, data_filename):
+        return os.path.relpath(os.path.abspath(data_filename), self.directory)
+
+    def get(self, data_filename):
+        """ Returns the stored :class:`.IndexEntry` of a data file, or None """
+        row = self._connection.execute(
+            "SELECT procedure, parameters, columns, header_lines, rows, stats, size, mtime "
+            "FROM results WHERE filename = ?", (self._key(data_filename),)).fetchone()
+        if row is None:
+            return None
+        procedure, parameters, columns, header_lines, rows, stats, size, mtime = row
+        return IndexEntry(data_filename, procedure, json.loads(parameters),
+                          json.loads(columns), header_lines, rows,
+                          json.loads(stats) if stats is not None else None, size, mtime)
+
+    def put(self, entry):
+        """ Stores an :class:`.IndexEntry` """
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self._key(entry.data_filename), entry.procedure,
+                 json.dumps(entry.parameters), json.dumps(entry.columns),
+                 entry.header_lines, entry.rows,
+                 json.dumps(entry.stats) if entry.stats is not None else None,
+                 entry.size, entry.mtime))
+
+    def entry(self, data_filename):
+        """ Returns the :class:`.IndexEntry` of a data file, which is scanned
+        and stored if it is not indexed or the file has changed since. Entries
+        are not stored in a read-only index. Raises a ValueError if it is not a
+        results data file. """
+        try:
+            entry = self.get(data_filename)
+        except sqlite3.Error:  # e.g. a read-only index of another version
+            log.debug("Failed to read the results index", exc_info=True)
+            entry = None
+        if entry is None or not entry.is_current():
+            entry = IndexEntry.scan(data_filename)
+            if not self.read_only:
+                self.put(entry)
+        return entry
+
+    def rename(self, old_filename, new_filename):
+        """ Updates the index after a data file was renamed """
+        with self._connection:
+            self._connection.execute(
+                "UPDATE OR REPLACE results SET filename = ? WHERE filename = ?",
+                (self._key(new_filename), self._key(old_filename)))
+
+    def remove(self, data_filename):
+        """ Removes a data file from the index """
+        with self._connection:
+            self._connection.execute(
+                "DELETE FROM results WHERE filename = ?", (self._key(data_filename),))
+
+    def close(self):
+        self._connection.close()
+
+    def __len__(self):
+        return self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def __repr__(self):
+        return "<%s(directory='%s')>" % (self.__class__.__name__, self.directory)
@@ -0,0 +1,192 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2021 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+from .procedure import Procedure
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+JournalEntry = namedtuple(
+    'JournalEntry', ['data_filename', 'procedure', 'parameters', 'status', 'queued', 'updated'])
+JournalEntry.__doc__ = """ Experiment recorded in a :class:`.QueueJournal`, with the
+class name and parameter values of its procedure, its last status and the times
+of queuing and of the last status change """
+
+
+class QueueJournal(object):
+    """ Persistent record of the queued experiments in an SQLite database,
+    which stores the parameters of their procedures, the transitions of their
+    status and the filenames of their results. Every change is committed
+    immediately, such that the state of a queue can be restored after a crash,
+    without parsing the data files.
+
+    .. code-block:: python
+
+        journal = QueueJournal('queue.db')
+        journal.add(results)
+        journal.update_status(results.data_filename, Procedure.RUNNING)
+
+        for entry in QueueJournal('queue.db').entries():
+            print(entry.data_filename, Procedure.STATUS_STRINGS[entry.status])
+
+    :param filename: The filename of the database, which is created if it
+        does not exist
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS experiments (
+            id INTEGER PRIMARY KEY,
+            data_filename TEXT UNIQUE NOT NULL,
+            procedure TEXT,
+            parameters TEXT,
+            status INTEGER,
+            queued REAL,
+            updated REAL
+        );
+        CREATE TABLE IF NOT EXISTS transitions (
+            experiment INTEGER REFERENCES experiments(id) ON DELETE CASCADE,
+            status INTEGER,
+            time REAL
+        );
+        CREATE INDEX IF NOT EXISTS transitions_experiment ON transitions(experiment);
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(filename, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("PRAGMA foreign_keys=ON")
+        with self._connection:
+            self._connection.executescript(self.SCHEMA)
+
+    @staticmethod
+    def _key(data_filename):
+        return os.path.abspath(data_filename)
+
+    def add(self, results, status=Procedure.QUEUED):
+        """ Records the experiment of a :class:`.Results` object, or
+        re-queues it if it is already recorded.
+
+        :param results: The :class:`.Results` of the experiment
+        :param status: The initial status
+        """
+        procedure = results.procedure
+        parameters = json.dumps(procedure.parameter_values(), default=str)
+        name = "%s.%s" % (procedure.__class__.__module__, procedure.__class__.__name__)
+        now = time.time()
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                "INSERT INTO experiments "
+                "(data_filename, procedure, parameters, status, queued, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(data_filename) DO UPDATE SET "
+                "procedure=excluded.procedure, parameters=excluded.parameters, "
+                "status=excluded.status, updated=excluded.updated",
+                (self._key(results.data_filename), name, parameters, status, now, now))
+            self._connection.execute(
+                "INSERT INTO transitions (experiment, status, time) "
+                "SELECT id, ?, ? FROM experiments WHERE data_filename = ?",
+                (status, now, self._key(results.data_filename)))
+        return cursor.lastrowid
+
+    def update_status(self, data_filename, status):
+        """ Records a status transition of an experiment, which is ignored
+        if the experiment is not in the journal """
+        now = time.time()
+        key = self._key(data_filename)
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                "UPDATE experiments SET status = ?, updated = ? WHERE data_filename = ?",
+                (status, now, key))
+            if cursor.rowcount:
+                self._connection.execute(
+                    "INSERT INTO transitions (experiment, status, time) "
+                    "SELECT id, ?, ? FROM experiments WHERE data_filename = ?",
+                    (status, now, key))
+
+    def remove(self, data_filename):
+        """ Removes an experiment and its transitions from the journal """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM experiments WHERE data_filename = ?",
+                (self._key(data_filename),))
+
+    def clear(self):
+        """ Removes all experiments from the journal """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM experiments")
+
+    def status(self, data_filename):
+        """ Returns the last status of an experiment, or None if it is
+        not in the journal """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT status FROM experiments WHERE data_filename = ?",
+                (self._key(data_filename),)).fetchone()
+        return None if row is None else row[0]
+
+    def entries(self):
+        """ Returns a list of the :class:`.JournalEntry` objects of the
+        experiments, in the order of queuing """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT data_filename, procedure, parameters, status, queued, updated "
+                "FROM experiments ORDER BY id").fetchall()
+        return [JournalEntry(filename, procedure, json.loads(parameters), status,
+                             queued, updated)
+                for filename, procedure, parameters, status, queued, updated in rows]
+
+    def transitions(self, data_filename):
+        """ Returns a list of the (status, time) tuples of the status
+        transitions of an experiment """
+        with self._lock:
+            return self._connection.execute(
+                "SELECT transitions.status, transitions.time FROM transitions "
+                "JOIN experiments ON transitions.experiment = experiments.id "
+                "WHERE experiments.data_filename = ? ORDER BY transitions.rowid",
+                (self._key(data_filename),)).fetchall()
+
+    def close(self):
+        """ Closes the database """
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM experiments").fetchone()[0]
+
+    def __repr__(self):
+        return "<%s(filename='%s')>" % (self.__class__.__name__, self.filename)
@@ -23,22 +23,16 @@
 #
 
 import logging
+import os
 from logging import StreamHandler, FileHandler
 
+from .index import IndexEntry, ResultsIndex
 from ..log import QueueListener
 from ..thread import StoppableThread
 
 log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
-try:
-    import zmq
-    import cloudpickle
-except ImportError:
-    zmq = None
-    cloudpickle = None
-    log.warning("ZMQ and cloudpickle are required for TCP communication")
-
 
 class Monitor(QueueListener):
     def __init__(self, results, queue):
@@ -62,6 +56,7 @@ class Listener(StoppableThread):
         :param timeout: Timeout in seconds to recheck stop flag
         """
         super().__init__()
+        import zmq  # only required for TCP communication
 
         self.port = port
         self.topic = topic
@@ -78,6 +73,7 @@ class Listener(StoppableThread):
         self.timeout = timeout
 
     def receive(self, flags=0):
+        import cloudpickle
         topic, record = self.subscriber.recv_serialized(
             deserialize=lambda msg: (msg[0].decode(), cloudpickle.loads(msg[1])),
             flags=flags
@@ -97,9 +93,14 @@ class Recorder(QueueListener):
     """ Recorder loads the initial Results for a filepath and
     appends data by listening for it over a queue. The queue
     ensures that no data is lost between the Recorder and Worker.
+
+    The metadata of the data files, with the number of data points and the
+    range of their values, is added to the :class:`.ResultsIndex` of their
+    directory when the Recorder stops, if `index` is True. This creates or
+    writes the hidden index file in that directory.
     """
 
-    def __init__(self, results, queue, **kwargs):
+    def __init__(self, results, queue, index=False, **kwargs):
         """ Constructs a Recorder to record the Procedure data into
         the file path, by waiting for data on the subscription port
         """
@@ -112,8 +113,44 @@ class Recorder(QueueListener):
 
         super().__init__(queue, *handlers)
 
+        self.metadata = None
+        if index:
+            try:
+                self.metadata = IndexEntry.scan(results.data_filename)
+            except (OSError, ValueError):
+                log.warning("Data file %s can not be indexed", results.data_filename)
+            else:
+                if self.metadata.rows == 0:
+                    self.metadata.stats = {}
+        self.data_filenames = results.data_filenames
+        self.results = results
+
+    def handle(self, record):
+        super().handle(record)
+        self.results.notify()
+        if self.metadata is not None:
+            self.metadata.add(record)
+
     def stop(self):
         for handler in self.handlers:
             handler.close()
 
         super().stop()
+
+        if self.metadata is not None:
+            self.update_index()
+
+    def update_index(self):
+        """ Adds the metadata of the data files to the index of their
+        directory """
+        for filename in self.data_filenames:
+            try:
+                self.metadata.data_filename = filename
+                self.metadata.stamp()
+                index = ResultsIndex(os.path.dirname(os.path.abspath(filename)))
+                try:
+                    index.put(self.metadata)
+                finally:
+                    index.close()
+            except Exception:
+                log.warning("Failed to index the data file %s", filename, exc_info=True)
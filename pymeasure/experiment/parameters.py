@@ -56,6 +56,13 @@ class Parameter(object):
         """
         return self._value is not None
 
+    def __copy__(self):
+        # Procedures copy their class parameters upon every instantiation,
+        # which is faster without the generic copy protocol
+        parameter = self.__class__.__new__(self.__class__)
+        parameter.__dict__.update(self.__dict__)
+        return parameter
+
     def __str__(self):
         return str(self._value) if self.is_set() else ''
 
@@ -436,34 +443,44 @@ class Measurable(object):
     property will return the latest set value of the parameter (or default
     if never set).
 
+    The measurables of a :class:`.Procedure` define the columns of its
+    :meth:`measurement schema <pymeasure.experiment.procedure.Procedure.measurement_schema>`
+    and, if it does not define `DATA_COLUMNS`, its data columns.
+
     :var value: The value of the parameter
 
     :param name: The parameter name
     :param fget: The parameter fget function (e.g. an instrument parameter)
+    :param units: The units of the values
+    :param measure: Whether the value is read when producing a datapoint
     :param default: The default value
+    :param dtype: The data type of the values (e.g. float), or None if it
+        should be inferred when the data is read
     """
-    DATA_COLUMNS = []
 
-    def __init__(self, name, fget=None, units=None, measure=True, default=None, **kwargs):
+    def __init__(self, name, fget=None, units=None, measure=True, default=None,
+                 dtype=None, **kwargs):
         self.name = name
         self.units = units
         self.measure = measure
+        self.dtype = dtype
         if fget is not None:
             self.fget = fget
-            self._value = fget()
-        else:
-            self._value = default
-        Measurable.DATA_COLUMNS.append(name)
+        self._value = default
 
     def fget(self):
         return self._value
 
     @property
     def value(self):
-        if hasattr(self, 'fget'):
-            self._value = self.fget()
+        self._value = self.fget()
         return self._value
 
     @value.setter
     def value(self, value):
         self._value = value
+
+    def __repr__(self):
+        return "<%s(name=%s,units=%s,dtype=%s)>" % (
+            self.__class__.__name__, self.name, self.units,
+            getattr(self.dtype, '__name__', self.dtype))
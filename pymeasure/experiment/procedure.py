@@ -24,10 +24,11 @@
 
 import logging
 import sys
-from copy import deepcopy
+from copy import copy
 from importlib.machinery import SourceFileLoader
 
 from .parameters import Parameter, Measurable
+from .schema import Column, MeasurementSchema
 
 log = logging.getLogger()
 log.addHandler(logging.NullHandler())
@@ -51,6 +52,11 @@ class Procedure(object):
     
     If keyword arguments are provided, they are added to the object as
     attributes.
+
+    The data columns are defined by `DATA_COLUMNS`. Procedures which do not
+    define them get the names of their :class:`.Measurable` attributes, which
+    are measured, as data columns, whose values are read by
+    :meth:`get_datapoint`.
     """
 
     DATA_COLUMNS = []
@@ -63,6 +69,18 @@ class Procedure(object):
     }
 
     _parameters = {}
+    _derived_columns = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if 'DATA_COLUMNS' in vars(cls):
+            return
+        columns = [measurable.name for measurable in cls._class_measurables().values()
+                   if measurable.measure]
+        if columns and (not cls.DATA_COLUMNS or cls._derived_columns):
+            # Derive the data columns from the measurables of this class
+            cls.DATA_COLUMNS = columns
+            cls._derived_columns = True
 
     def __init__(self, **kwargs):
         self.status = Procedure.QUEUED
@@ -73,22 +91,104 @@ class Procedure(object):
                 log.info('Setting parameter %s to %s' % (key, kwargs[key]))
         self.gen_measurement()
 
+    @classmethod
+    def _class_attributes(cls):
+        """ Returns the names of the Parameter and the Measurable class
+        attributes, which are collected only once per class
+        """
+        attributes = cls.__dict__.get('_attributes')
+        if attributes is None:
+            parameters, measurables = [], []
+            for item in dir(cls):
+                attribute = getattr(cls, item, None)
+                if isinstance(attribute, Parameter):
+                    parameters.append(item)
+                elif isinstance(attribute, Measurable):
+                    measurables.append(item)
+            attributes = (tuple(parameters), tuple(measurables))
+            cls._attributes = attributes
+        return attributes
+
+    @classmethod
+    def _class_measurables(cls):
+        """ Returns a dictionary of the Measurable class attributes in the
+        order of their definition
+        """
+        measurables = {}
+        for klass in reversed(cls.__mro__):
+            for item, attribute in vars(klass).items():
+                if isinstance(attribute, Measurable):
+                    measurables[item] = attribute
+        return measurables
+
+    @classmethod
+    def measurement_schema(cls):
+        """ Returns the :class:`.MeasurementSchema` of the data columns, with
+        the data types and units of the corresponding measurables. The schema
+        is created only once per class, as long as its data columns stay the
+        same.
+        """
+        names = tuple(cls.DATA_COLUMNS)
+        cached = cls.__dict__.get('_schema')
+        if cached is not None and cached[0] == names:
+            return cached[1]
+        measurables = {measurable.name: measurable
+                       for measurable in cls._class_measurables().values()}
+        columns = []
+        for name in names:
+            measurable = measurables.get(name)
+            if measurable is None:
+                columns.append(Column(name))
+            else:
+                columns.append(Column(name, measurable.dtype, measurable.units))
+        schema = MeasurementSchema(columns)
+        cls._schema = (names, schema)
+        return schema
+
+    def _attribute_names(self, names, attribute_class):
+        """ Adds the names of instance attributes of a class to the names of
+        the class attributes, keeping the alphabetical order of dir()
+        """
+        instance_names = [item for item, value in vars(self).items()
+                          if isinstance(value, attribute_class)]
+        if instance_names:
+            return sorted(set(names).union(instance_names))
+        return names
+
     def gen_measurement(self):
         """Create MEASURE and DATA_COLUMNS variables for get_datapoint method."""
         # TODO: Refactor measurable-s implementation to be consistent with parameters
 
         self.MEASURE = {}
-        for item in dir(self):
+        names = self._attribute_names(self._class_attributes()[1], Measurable)
+        for item in names:
             parameter = getattr(self, item)
             if isinstance(parameter, Measurable):
                 if parameter.measure:
                     self.MEASURE.update({parameter.name: item})
 
         if not self.DATA_COLUMNS:
-            self.DATA_COLUMNS = Measurable.DATA_COLUMNS
+            self.DATA_COLUMNS = list(self.MEASURE)
+
+    def read_measurables(self):
+        """ Returns a dictionary of values of measurables by their names,
+        which are read together, e.g. in one instrument transaction. The
+        measurables not contained are read one by one by :meth:`get_datapoint`.
+        Reimplement this method to read several values at once.
+
+        .. code-block:: python
+
+            def read_measurables(self):
+                voltage, current = self.meter.values("READ?")
+                return {'Voltage': voltage, 'Current': current}
+        """
+        return {}
 
     def get_datapoint(self):
-        data = {key: getattr(self, self.MEASURE[key]).value for key in self.MEASURE}
+        data = self.read_measurables()
+        for key, item in self.MEASURE.items():
+            if key not in data:
+                data[key] = getattr(self, item).value
         return data
 
     def measure(self):
@@ -103,10 +203,11 @@ class Procedure(object):
         """
         if not self._parameters:
             self._parameters = {}
-        for item in dir(self):
+        names = self._attribute_names(self._class_attributes()[0], Parameter)
+        for item in names:
             parameter = getattr(self, item)
             if isinstance(parameter, Parameter):
-                self._parameters[item] = deepcopy(parameter)
+                self._parameters[item] = copy(parameter)
                 if parameter.is_set():
                     setattr(self, item, parameter.value)
                 else:
@@ -28,11 +28,11 @@ import os
 import re
 import sys
 from copy import deepcopy
+from functools import lru_cache
+from importlib import import_module
 from importlib.machinery import SourceFileLoader
 from datetime import datetime
 
-import pandas as pd
-
 from .procedure import Procedure, UnknownProcedure
 from .parameters import Parameter
 
@@ -40,6 +40,59 @@ log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
 
+@lru_cache(maxsize=1024)
+def _read_header_cached(data_filename, size, mtime):
+    """ Returns the header of a data file, which is cached by the filename,
+    size and modification time of the file """
+    return Results.read_header(data_filename)
+
+
+@lru_cache(maxsize=1024)
+def _parse_header_text(header):
+    """ Returns the module and class names of the procedure and a tuple of
+    the (name, value) pairs of the parameters of a header text """
+    procedure_module = procedure_class = None
+    parameters = {}
+    for line in header.split(Results.LINE_BREAK):
+        if line.startswith(Results.COMMENT):
+            line = line[1:]  # Uncomment
+        else:
+            raise ValueError("Parsing a header which contains "
+                             "uncommented sections")
+        if line.startswith("Procedure"):
+            regex = r"<(?:(?P<module>[^>]+)\.)?(?P<class>[^.>]+)>"
+            search = re.search(regex, line)
+            procedure_module = search.group("module")
+            procedure_class = search.group("class")
+        elif line.startswith("\t"):
+            separator = ": "
+            partitioned_line = line[1:].partition(separator)
+            if partitioned_line[1] != separator:
+                raise Exception("Error partitioning header line %s." % line)
+            else:
+                parameters[partitioned_line[0]] = partitioned_line[2]
+    return procedure_module, procedure_class, tuple(parameters.items())
+
+
+_procedure_classes = {}  # by module and class name, only those imported successfully
+
+
+def _import_procedure_class(module_name, class_name):
+    """ Returns the procedure class of a header, or None if its module can
+    not be imported. Failed imports are not cached, so that they are tried
+    again, e.g. after the module was installed. """
+    if not module_name:
+        return None
+    cls = _procedure_classes.get((module_name, class_name))
+    if cls is None:
+        try:
+            module = import_module(module_name)
+        except ImportError:
+            return None
+        cls = _procedure_classes[module_name, class_name] = getattr(module, class_name)
+    return cls
+
+
 def unique_filename(directory, prefix='DATA', suffix='', ext='csv',
                     dated_folder=False, index=True, datetimeformat="%Y-%m-%d"):
     """ Returns a unique filename based on the directory and prefix
@@ -64,20 +117,38 @@ def unique_filename(directory, prefix='DATA', suffix='', ext='csv',
     return filename
 
 
+def _format_value(value, dtype):
+    """ Returns the text of a value, which is converted to the data type of
+    its column first, if possible """
+    if dtype is not None:
+        try:
+            value = dtype(value)
+        except (TypeError, ValueError):
+            pass
+    return '{}'.format(value)
+
+
 class CSVFormatter(logging.Formatter):
     """ Formatter of data results """
 
-    def __init__(self, columns, delimiter=','):
+    def __init__(self, columns, delimiter=',', schema=None):
         """Creates a csv formatter for a given list of columns (=header).
 
         :param columns: list of column names.
         :type columns: list
         :param delimiter: delimiter between columns.
         :type delimiter: str
+        :param schema: :class:`.MeasurementSchema`, whose data types the values
+            are converted to before they are written, such that they are read
+            back with the same data types.
+        :type schema: MeasurementSchema
         """
         super().__init__()
         self.columns = columns
         self.delimiter = delimiter
+        dtypes = schema.dtypes if schema is not None else {}
+        self._dtypes = [dtypes.get(column) if callable(dtypes.get(column)) else None
+                        for column in columns]
 
     def format(self, record):
         """Formats a record as csv.
@@ -86,7 +157,8 @@ class CSVFormatter(logging.Formatter):
         :type record: dict
         :return: a string
         """
-        return self.delimiter.join('{}'.format(record[x]) for x in self.columns)
+        return self.delimiter.join(_format_value(record[x], dtype)
+                                   for x, dtype in zip(self.columns, self._dtypes))
 
     def format_header(self):
         return self.delimiter.join(self.columns)
@@ -99,17 +171,28 @@ class Results(object):
     :cvar COMMENT: The character used to identify a comment (default: #)
     :cvar DELIMITER: The character used to delimit the data (default: ,)
     :cvar LINE_BREAK: The character used for line breaks (default \\n)
-    :cvar CHUNK_SIZE: The length of the data chuck that is read
+    :cvar CHUNK_SIZE: The length of the data chunks that are read
 
     :param procedure: Procedure object
     :param data_filename: The data filename where the data is or should be
                           stored
+
+    The :attr:`version` of the results is increased by :meth:`notify` when
+    data is written, e.g. by the :class:`.Recorder`, or when the size or
+    modification time of the data file changed, e.g. as it is written by
+    another process, so that plots only read the data of results which
+    changed.
+
+    While the results are live, between :meth:`start_live` and
+    :meth:`stop_live`, the data is extended by the records published by the
+    :class:`.Worker` with :meth:`add_records` instead of reading the file,
+    which is then only written for persistence.
     """
 
     COMMENT = '#'
     DELIMITER = ','
     LINE_BREAK = "\n"
-    CHUNK_SIZE = 1000
+    CHUNK_SIZE = 100000
 
     def __init__(self, procedure, data_filename):
         if not isinstance(procedure, Procedure):
@@ -118,8 +201,13 @@ class Results(object):
         self.procedure_class = procedure.__class__
         self.parameters = procedure.parameter_objects()
         self._header_count = -1
+        self._version = 0
+        self._file_state = None
+        self._live = False
+        self._records = []
 
-        self.formatter = CSVFormatter(columns=self.procedure.DATA_COLUMNS)
+        self.formatter = CSVFormatter(columns=self.procedure.DATA_COLUMNS,
+                                      schema=self.procedure.measurement_schema())
 
         if isinstance(data_filename, (list, tuple)):
             data_filenames, data_filename = data_filename, data_filename[0]
@@ -130,9 +218,9 @@ class Results(object):
         self.data_filenames = data_filenames
 
         if os.path.exists(data_filename):  # Assume header is already written
-            self.reload()
+            self._data = None  # the data is read on first access
+            # The actual status of a queued experiment is kept by a QueueJournal
             self.procedure.status = Procedure.FINISHED
-            # TODO: Correctly store and retrieve status
         else:
             for filename in self.data_filenames:
                 with open(filename, 'w') as f:
@@ -212,48 +300,26 @@ class Results(object):
     @staticmethod
     def parse_header(header, procedure_class=None):
         """ Returns a Procedure object with the parameters as defined in the
-        header text.
+        header text. The parsed headers and the imported procedure classes
+        are cached.
         """
         if procedure_class is not None:
             procedure = procedure_class()
         else:
             procedure = None
 
-        header = header.split(Results.LINE_BREAK)
-        procedure_module = None
-        parameters = {}
-        for line in header:
-            if line.startswith(Results.COMMENT):
-                line = line[1:]  # Uncomment
-            else:
-                raise ValueError("Parsing a header which contains "
-                                 "uncommented sections")
-            if line.startswith("Procedure"):
-                regex = r"<(?:(?P<module>[^>]+)\.)?(?P<class>[^.>]+)>"
-                search = re.search(regex, line)
-                procedure_module = search.group("module")
-                procedure_class = search.group("class")
-            elif line.startswith("\t"):
-                separator = ": "
-                partitioned_line = line[1:].partition(separator)
-                if partitioned_line[1] != separator:
-                    raise Exception("Error partitioning header line %s." % line)
-                else:
-                    parameters[partitioned_line[0]] = partitioned_line[2]
+        procedure_module, procedure_class, parameters = _parse_header_text(header)
+        parameters = dict(parameters)
 
         if procedure is None:
             if procedure_class is None:
                 raise ValueError("Header does not contain the Procedure class")
-            try:
-                from importlib import import_module
-                procedure_module = import_module(procedure_module)
-                procedure_class = getattr(procedure_module, procedure_class)
-                procedure = procedure_class()
-            except ImportError:
+            cls = _import_procedure_class(procedure_module, procedure_class)
+            if cls is not None:
+                procedure = cls()
+            else:
                 procedure = UnknownProcedure(parameters)
                 log.warning("Unknown Procedure being used")
-            except Exception as e:
-                raise e
 
         # Fill the procedure with the parameters found
         for name, parameter in procedure.parameter_objects().items():
@@ -267,33 +333,101 @@ class Results(object):
         procedure.refresh_parameters()  # Enforce update of meta data
         return procedure
 
+    @staticmethod
+    def read_header(data_filename):
+        """ Returns the header text of a data file and its number of lines """
+        header = []
+        with open(data_filename, 'r') as f:
+            for line in f:
+                if not line.startswith(Results.COMMENT):
+                    break
+                header.append(line.strip())
+        return Results.LINE_BREAK.join(header), len(header)
+
     @staticmethod
     def load(data_filename, procedure_class=None):
-        """ Returns a Results object with the associated Procedure object and
-        data
+        """ Returns a Results object with the associated Procedure object,
+        for which only the header of the file is read. The data is read when
+        it is first accessed.
         """
-        header = ""
-        header_read = False
-        header_count = 0
-        with open(data_filename, 'r') as f:
-            while not header_read:
-                line = f.readline()
-                if line.startswith(Results.COMMENT):
-                    header += line.strip() + Results.LINE_BREAK
-                    header_count += 1
-                else:
-                    header_read = True
-        procedure = Results.parse_header(header[:-1], procedure_class)
+        stat = os.stat(data_filename)
+        header, header_count = _read_header_cached(
+            os.path.abspath(data_filename), stat.st_size, stat.st_mtime_ns)
+        procedure = Results.parse_header(header, procedure_class)
         results = Results(procedure, data_filename)
         results._header_count = header_count
         return results
 
+    def notify(self):
+        """ Marks the data as changed after new data was written """
+        self._file_state = self._stat()
+        self._version += 1
+
+    @property
+    def version(self):
+        """ Number which changes whenever the data changes. While the
+        results are not live, the data file is checked with a call of
+        :func:`os.stat`, which is cheap compared to reading it. """
+        if not self._live:
+            file_state = self._stat()
+            if file_state != self._file_state:
+                self._file_state = file_state
+                self._version += 1
+        return self._version
+
+    def _stat(self):
+        """ Returns the size and modification time of the data file """
+        try:
+            stat = os.stat(self.data_filename)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def start_live(self):
+        """ Reads the data already in the file, and extends it afterwards only
+        by the records of :meth:`add_records`. Call this before the worker
+        starts writing, so that no record is read from both sources. """
+        self._data = self.data
+        self._live = True
+
+    def stop_live(self):
+        """ Returns to reading new data from the file, e.g. when the worker
+        has finished. The file holds all the records, since they are written
+        before they are published. """
+        self._data = self.data
+        self._live = False
+
+    def unload(self):
+        """ Drops the data from memory, which is read from the file again on
+        the next access. The data of live results is kept. """
+        if not self._live:
+            self._data = None
+
+    def add_records(self, records):
+        """ Appends records, dictionaries of the data by column name as
+        emitted by the procedure, to the data of live results """
+        if not self._live:
+            raise ValueError("Records can only be added to live results")
+        self._records.extend(records)
+        self.notify()
+
     @property
     def data(self):
+        import pandas as pd  # imported here to keep the import of pymeasure fast
+        if self._live:
+            if self._records:
+                records = pd.DataFrame.from_records(self._records,
+                                                    columns=self._data.columns)
+                records = records.astype(self.dtypes or {})
+                if len(self._data) == 0:  # keep the data types of the records
+                    self._data = records
+                else:
+                    self._data = pd.concat([self._data, records], ignore_index=True)
+                self._records = []
+            return self._data
         # Need to update header count for correct referencing
         if self._header_count == -1:
-            self._header_count = len(
-                self.header()[-1].split(Results.LINE_BREAK))
+            self._header_count = self.read_header(self.data_filename)[1]
         if self._data is None or len(self._data) == 0:
             # Data has not been read
             try:
@@ -308,6 +442,7 @@ class Results(object):
                 comment=Results.COMMENT,
                 header=0,
                 names=self._data.columns,
+                dtype=self.dtypes or None,
                 chunksize=Results.CHUNK_SIZE, skiprows=skiprows, iterator=True
             )
             try:
@@ -323,13 +458,21 @@ class Results(object):
                 pass  # All data is up to date
         return self._data
 
+    @property
+    def dtypes(self):
+        """ Dictionary of the data types of the columns, as defined by the
+        measurement schema of the procedure """
+        return self.procedure_class.measurement_schema().dtypes
+
     def reload(self):
         """ Preforms a full reloading of the file data, neglecting
         any changes in the comments
         """
+        import pandas as pd  # imported here to keep the import of pymeasure fast
         chunks = pd.read_csv(
             self.data_filename,
             comment=Results.COMMENT,
+            dtype=self.dtypes or None,
             chunksize=Results.CHUNK_SIZE,
             iterator=True
         )
@@ -0,0 +1,121 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2021 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+
+import logging
+import re
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+class Column(object):
+    """ Describes a data column of a :class:`.Procedure` with its name, data
+    type and units.
+
+    :param name: The column name, as used in `DATA_COLUMNS`
+    :param dtype: The data type of the values (e.g. float, int, str), or None
+        if it should be inferred when the data is read
+    :param units: The units of the values
+    """
+
+    # units given in parentheses in the column name, e.g. 'Voltage (V)'
+    UNITS_PATTERN = re.compile(r"\((?P<units>\w+)\)")
+
+    def __init__(self, name, dtype=None, units=None):
+        self.name = name
+        self.dtype = dtype
+        if units is None:
+            match = self.UNITS_PATTERN.search(name)
+            if match:
+                units = match.group('units')
+        self.units = units
+
+    def __eq__(self, other):
+        return (isinstance(other, Column) and
+                (self.name, self.dtype, self.units) ==
+                (other.name, other.dtype, other.units))
+
+    def __repr__(self):
+        return "<%s(name=%s,dtype=%s,units=%s)>" % (
+            self.__class__.__name__, self.name,
+            getattr(self.dtype, '__name__', self.dtype), self.units)
+
+
+class MeasurementSchema(object):
+    """ Ordered collection of the :class:`.Column` objects of a
+    :class:`.Procedure`, which is obtained with
+    :meth:`Procedure.measurement_schema <pymeasure.experiment.procedure.Procedure.measurement_schema>`.
+    It provides the data types for reading and writing data and the units for
+    labeling plot axes.
+
+    :param columns: Iterable of :class:`.Column` objects
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self._columns = {column.name: column for column in self.columns}
+
+    @property
+    def names(self):
+        """ List of the column names """
+        return [column.name for column in self.columns]
+
+    @property
+    def dtypes(self):
+        """ Dictionary of the data types of the columns, for which one is
+        defined, e.g. for :func:`pandas.read_csv` """
+        return {column.name: column.dtype for column in self.columns
+                if column.dtype is not None}
+
+    @property
+    def units(self):
+        """ Dictionary of the units of the columns, for which they are known """
+        return {column.name: column.units for column in self.columns
+                if column.units is not None}
+
+    def numpy_dtype(self, default=float):
+        """ Returns a structured NumPy data type with one field per column,
+        e.g. for storing data points in binary form
+
+        :param default: Data type of the columns without a defined data type
+        """
+        import numpy as np
+        return np.dtype([(column.name, column.dtype or default)
+                         for column in self.columns])
+
+    def __getitem__(self, name):
+        return self._columns[name]
+
+    def __contains__(self, name):
+        return name in self._columns
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def __len__(self):
+        return len(self.columns)
+
+    def __repr__(self):
+        return "<%s(columns=%s)>" % (self.__class__.__name__, self.names)
@@ -0,0 +1,283 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2021 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+
+import logging
+import re
+
+import numpy
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+""" This defines a list of functions that can be used to generate a sequence. """
+SAFE_FUNCTIONS = {
+    'range': range,
+    'sorted': sorted,
+    'list': list,
+    'arange': numpy.arange,
+    'linspace': numpy.linspace,
+    'arccos': numpy.arccos,
+    'arcsin': numpy.arcsin,
+    'arctan': numpy.arctan,
+    'arctan2': numpy.arctan2,
+    'ceil': numpy.ceil,
+    'cos': numpy.cos,
+    'cosh': numpy.cosh,
+    'degrees': numpy.degrees,
+    'e': numpy.e,
+    'exp': numpy.exp,
+    'fabs': numpy.fabs,
+    'floor': numpy.floor,
+    'fmod': numpy.fmod,
+    'frexp': numpy.frexp,
+    'hypot': numpy.hypot,
+    'ldexp': numpy.ldexp,
+    'log': numpy.log,
+    'log10': numpy.log10,
+    'modf': numpy.modf,
+    'pi': numpy.pi,
+    'power': numpy.power,
+    'radians': numpy.radians,
+    'sin': numpy.sin,
+    'sinh': numpy.sinh,
+    'sqrt': numpy.sqrt,
+    'tan': numpy.tan,
+    'tanh': numpy.tanh,
+}
+
+# line of a sequence file, e.g. '-- "Random Seed", "[1, 4, 8]"'
+SEQUENCE_LINE = re.compile("([-]+) \"(.*?)\", \"(.*?)\"")
+
+
+class SequenceEvaluationException(Exception):
+    """Raised when the evaluation of a sequence string goes wrong."""
+    pass
+
+
+def eval_string(string, name=None, depth=None):
+    """
+    Evaluate the given string. The string is evaluated using a list of
+    pre-defined functions that are deemed safe to use, to prevent the
+    execution of malicious code. For this purpose, also any built-in
+    functions or global variables are not available.
+
+    :param string: String to be interpreted.
+    :param name: Name of the to-be-interpreted string, only used for
+        error messages.
+    :param depth: Depth of the to-be-interpreted string, only used
+        for error messages.
+    """
+
+    evaluated_string = None
+    if len(string) > 0:
+        try:
+            evaluated_string = eval(
+                string, {"__builtins__": None}, SAFE_FUNCTIONS
+            )
+        except TypeError:
+            log.error("TypeError, likely a typo in one of the " +
+                      "functions for parameter '{}', depth {}".format(
+                          name, depth
+                      ))
+            raise SequenceEvaluationException()
+        except SyntaxError:
+            log.error("SyntaxError, likely unbalanced brackets " +
+                      "for parameter '{}', depth {}".format(name, depth))
+            raise SequenceEvaluationException()
+        except ValueError:
+            log.error("ValueError, likely wrong function argument " +
+                      "for parameter '{}', depth {}".format(name, depth))
+            raise SequenceEvaluationException()
+    else:
+        log.error("No sequence entered for " +
+                  "for parameter '{}', depth {}".format(name, depth))
+        raise SequenceEvaluationException()
+
+    evaluated_string = numpy.array(evaluated_string)
+    return evaluated_string
+
+
+def read_sequence_file(filename):
+    """
+    Returns a list of (level, parameter name, sequence string) tuples of the
+    entries of a sequence file, in which each line describes one parameter
+    and its sequence, and the number of leading dashes gives the level.
+
+    .. code-block:: none
+
+        - "Delay Time", "arange(0.25, 1, 0.25)"
+        -- "Random Seed", "[1, 4, 8]"
+
+    :param filename: Filename (string) of the sequence file.
+    """
+    entries = []
+    with open(filename, "r") as file:
+        for line in file:
+            match = SEQUENCE_LINE.search(line.strip())
+            if not match:
+                continue
+            level = len(match.group(1)) - 1
+            if level < 0:
+                continue
+            entries.append((level, match.group(2), match.group(3)))
+    return entries
+
+
+class SequenceItem(object):
+    """ A parameter with the values it takes in a :class:`.Sequence`. For each
+    of the values, all the parameter sets of the child items are generated.
+
+    :param parameter: The name of the parameter, as used by
+        :meth:`Procedure.set_parameters <pymeasure.experiment.procedure.Procedure.set_parameters>`
+    :param values: A sequence string (see :func:`.eval_string`) or an
+        iterable of values
+    :param children: A list of child :class:`.SequenceItem` objects
+    :param depth: The depth of the item, only used for error messages
+    """
+
+    def __init__(self, parameter, values, children=None, depth=0):
+        self.parameter = parameter
+        if isinstance(values, str):
+            values = eval_string(values, parameter, depth)
+        self.values = list(numpy.atleast_1d(values))
+        self.children = list(children or [])
+
+    def __iter__(self):
+        for value in self.values:
+            if self.children:
+                for parameters in _iterate_items(self.children):
+                    yield {self.parameter: value, **parameters}
+            else:
+                yield {self.parameter: value}
+
+    def __len__(self):
+        return len(self.values) * (
+            sum(len(child) for child in self.children) if self.children else 1)
+
+    def __repr__(self):
+        return "<%s(parameter=%s,values=%d,children=%d)>" % (
+            self.__class__.__name__, self.parameter, len(self.values),
+            len(self.children))
+
+
+def _iterate_items(items):
+    for item in items:
+        yield from item
+
+
+class Sequence(object):
+    """ A sequence of parameter sets, which are generated lazily from a tree
+    of :class:`.SequenceItem` objects. The items on the same level are run one
+    after the other and each value of an item is combined with all parameter
+    sets of its children, such that only the parameter set which is about to
+    be used is held in memory, independent of the size of the sequence.
+
+    .. code-block:: python
+
+        sequence = Sequence([
+            SequenceItem('delay', 'arange(0.25, 1, 0.25)', children=[
+                SequenceItem('seed', '[1, 4, 8]'),
+            ]),
+        ])
+        len(sequence)  # 9
+        for parameters in sequence:
+            procedure = RandomProcedure()
+            procedure.set_parameters(parameters)
+
+    :param items: A list of the root :class:`.SequenceItem` objects
+    """
+
+    def __init__(self, items):
+        self.items = list(items)
+
+    @classmethod
+    def from_entries(cls, entries):
+        """ Returns a Sequence from a list of (level, parameter, values) tuples,
+        in which the items of a level are children of the preceding item
+        on the level above, as in a sequence file.
+        """
+        items = []
+        parents = []
+        for level, parameter, values in entries:
+            if level > len(parents):
+                log.error("Parameter '{}' at level {} has no parent item, "
+                          "it is added to level {}".format(
+                              parameter, level, len(parents)))
+                level = len(parents)
+            item = SequenceItem(parameter, values, depth=level)
+            del parents[level:]
+            if parents:
+                parents[-1].children.append(item)
+            else:
+                items.append(item)
+            parents.append(item)
+        return cls(items)
+
+    @classmethod
+    def load(cls, filename, procedure_class=None):
+        """ Returns a Sequence from a sequence file, see
+        :func:`.read_sequence_file`.
+
+        :param filename: Filename (string) of the sequence file.
+        :param procedure_class: If given, the parameter names of the file are
+            translated into the attribute names of this :class:`.Procedure`
+            class, as needed by its `set_parameters` method.
+        """
+        entries = read_sequence_file(filename)
+        if procedure_class is not None:
+            names = {parameter.name: key for key, parameter
+                     in procedure_class().parameter_objects().items()}
+            try:
+                entries = [(level, names[name], values)
+                           for level, name, values in entries]
+            except KeyError as e:
+                raise ValueError("Parameter %s of the sequence is not a parameter "
+                                 "of %s" % (e, procedure_class.__name__))
+        return cls.from_entries(entries)
+
+    def procedures(self, procedure_class, **parameters):
+        """ Returns a generator of procedures with the parameter sets of
+        the sequence, which are created one by one when they are needed.
+
+        :param procedure_class: :class:`.Procedure` class to instantiate, or
+            any callable returning a new procedure, e.g. `make_procedure` of a
+            :class:`.ManagedWindow`
+        :param parameters: Parameter values that are common to all procedures
+        """
+        for entry in self:
+            procedure = procedure_class()
+            procedure.set_parameters({**parameters, **entry})
+            yield procedure
+
+    def __iter__(self):
+        return _iterate_items(self.items)
+
+    def __len__(self):
+        return sum(len(item) for item in self.items)
+
+    def __repr__(self):
+        return "<%s(items=%d,length=%d)>" % (
+            self.__class__.__name__, len(self.items), len(self))
@@ -39,22 +39,23 @@ from ..thread import StoppableThread
 log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
-try:
-    import zmq
-    import cloudpickle
-except ImportError:
-    zmq = None
-    cloudpickle = None
-    log.warning("ZMQ and cloudpickle are required for TCP communication")
-
 
 class Worker(StoppableThread):
     """ Worker runs the procedure and emits information about
     the procedure and its status over a ZMQ TCP port. In a child
     thread, a Recorder is run to write the results to
+
+    If `monitor_results` is True, the results are also put into the
+    monitor queue after they are recorded, so that a :class:`.Monitor` can
+    pass them on to the plots without reading them back from the file.
+
+    If `index` is True, the :class:`.Recorder` adds the data file to the
+    :class:`.ResultsIndex` of its directory, which writes the index file
+    there.
     """
 
-    def __init__(self, results, log_queue=None, log_level=logging.INFO, port=None):
+    def __init__(self, results, log_queue=None, log_level=logging.INFO, port=None,
+                 monitor_results=False, index=False):
         """ Constructs a Worker to perform the Procedure
         defined in the file at the filepath
         """
@@ -71,6 +72,8 @@ class Worker(StoppableThread):
         self.recorder_queue = Queue()
 
         self.monitor_queue = Queue()
+        self.monitor_results = monitor_results
+        self.index = index
         if log_queue is None:
             log_queue = Queue()
         self.log_queue = log_queue
@@ -85,18 +88,28 @@ class Worker(StoppableThread):
 
         self.context = None
         self.publisher = None
-        if self.port is not None and zmq is not None:
-            try:
-                self.context = zmq.Context()
-                log.debug("Worker ZMQ Context: %r" % self.context)
-                self.publisher = self.context.socket(zmq.PUB)
-                self.publisher.bind('tcp://*:%d' % self.port)
-                log.info("Worker connected to tcp://*:%d" % self.port)
-                time.sleep(0.3)  # wait so that the socket will be ready before starting to emit messages
-            except Exception:
-                log.exception("Couldn't establish ZMQ publisher!")
-                self.context = None
-                self.publisher = None
+        if self.port is not None:
+            self._connect_publisher()
+
+    def _connect_publisher(self):
+        """ Establishes the ZMQ publisher over which the messages are emitted """
+        try:
+            import zmq
+            import cloudpickle  # noqa: F401, required by emit
+        except ImportError:
+            log.warning("ZMQ and cloudpickle are required for TCP communication")
+            return
+        try:
+            self.context = zmq.Context()
+            log.debug("Worker ZMQ Context: %r" % self.context)
+            self.publisher = self.context.socket(zmq.PUB)
+            self.publisher.bind('tcp://*:%d' % self.port)
+            log.info("Worker connected to tcp://*:%d" % self.port)
+            time.sleep(0.3)  # wait so that the socket will be ready before starting to emit messages
+        except Exception:
+            log.exception("Couldn't establish ZMQ publisher!")
+            self.context = None
+            self.publisher = None
 
     def join(self, timeout=0):
         try:
@@ -110,15 +123,16 @@ class Worker(StoppableThread):
         """ Emits data of some topic over TCP """
         log.debug("Emitting message: %s %s", topic, record)
 
-        try:
+        if self.publisher is not None:
+            import cloudpickle  # imported with ZMQ when creating the publisher
             self.publisher.send_serialized(
                 record,
                 serialize=lambda rec: (topic.encode(), cloudpickle.dumps(rec)),
             )
-        except (NameError, AttributeError):
-            pass  # No dumps defined
         if topic == 'results':
             self.recorder.handle(record)
+            if self.monitor_results:
+                self.monitor_queue.put((topic, record))
         elif topic == 'status' or topic == 'progress':
             self.monitor_queue.put((topic, record))
 
@@ -159,7 +173,7 @@ class Worker(StoppableThread):
 
         self.procedure = self.results.procedure
 
-        self.recorder = Recorder(self.results, self.recorder_queue)
+        self.recorder = Recorder(self.results, self.recorder_queue, index=self.index)
         self.recorder.start()
 
         #locals()[self.procedures_file] = __import__(self.procedures_file)
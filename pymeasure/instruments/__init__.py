@@ -22,33 +22,55 @@
 # THE SOFTWARE.
 #
 
+import importlib
+
 from ..errors import RangeError, RangeException
 from .instrument import Instrument
 from .mock import Mock
-from .resources import list_resources
 from .validators import discreteTruncate
 
-from . import advantest
-from . import agilent
-from . import ametek
-from . import ami
-from . import anapico
-from . import anritsu
-from . import attocube
-from . import danfysik
-from . import deltaelektronika
-from . import fwbell
-from . import hp
-from . import keithley
-from . import keysight
-from . import lakeshore
-from . import newport
-from . import ni
-from . import oxfordinstruments
-from . import parker
-from . import razorbill
-from . import signalrecovery
-from . import srs
-from . import tektronix
-from . import thorlabs
-from . import yokogawa
+# Vendor packages and the resource functions are imported upon first access,
+# such that importing a single driver does not load all other drivers and
+# their dependencies
+_vendor_packages = (
+    'advantest',
+    'agilent',
+    'ametek',
+    'ami',
+    'anapico',
+    'anritsu',
+    'attocube',
+    'danfysik',
+    'deltaelektronika',
+    'fwbell',
+    'hp',
+    'keithley',
+    'keysight',
+    'lakeshore',
+    'newport',
+    'ni',
+    'oxfordinstruments',
+    'parker',
+    'razorbill',
+    'signalrecovery',
+    'srs',
+    'tektronix',
+    'thorlabs',
+    'yokogawa',
+)
+_resource_functions = ('list_resources', 'find_resources',
+                       'find_resources_in_background')
+
+
+def __getattr__(name):
+    if name in _vendor_packages:
+        return importlib.import_module('.' + name, __name__)
+    if name in _resource_functions:
+        value = getattr(importlib.import_module('.resources', __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_vendor_packages) | set(_resource_functions))
@@ -336,3 +336,4 @@ class Agilent8257D(Instrument):
         """
         self.disable_modulation()
         self.disable()
+        super().shutdown()
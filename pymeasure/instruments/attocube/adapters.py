@@ -39,18 +39,20 @@ class AttocubeConsoleAdapter(TelnetAdapter):
     """
     # compiled regular expression for finding numerical values in reply strings
     _reg_value = re.compile(r"\w+\s+=\s+(\w+)")
+    # compiled regular expression for the acknowledgement line closing a reply
+    _reg_ack = re.compile(rb"(?:^|\n)(OK|ERROR)\r?\n")
 
     def __init__(self, host, port, passwd, **kwargs):
-        self.read_termination = '\r\n'
-        self.write_termination = self.read_termination
+        kwargs.setdefault('read_termination', '\r\n')
         kwargs.setdefault('preprocess_reply', self.extract_value)
         super().__init__(host, port, **kwargs)
+        self.write_termination = self.read_termination
         time.sleep(self.query_delay)
-        super().read()  # clear messages sent upon opening the connection
+        self._read_available()  # clear messages sent upon opening the connection
         # send password and check authorization
         self.write(passwd, check_ack=False)
         time.sleep(self.query_delay)
-        ret = super().read()
+        ret = self._read_available()
         authmsg = ret.split(self.read_termination)[1]
         if authmsg != 'Authorization success':
             raise Exception(f"Attocube authorization failed '{authmsg}'")
@@ -88,18 +90,23 @@ class AttocubeConsoleAdapter(TelnetAdapter):
     def read(self):
         """ Reads a reply of the instrument which consists of two or more
         lines. The first ones are the reply to the command while the last one
-        is 'OK' or 'ERROR' to indicate any problem. In case the reply is not OK
+        is 'OK' or 'ERROR' to indicate any problem. The method returns as soon
+        as the acknowledgement line is received. In case the reply is not OK
         a ValueError is raised.
 
         :returns: String ASCII response of the instrument.
         """
-        raw = super().read().strip(self.read_termination)
-        # one would want to use self.read_termination as 'sep' below, but this
-        # is not possible because of a firmware bug resulting in inconsistent
-        # line endings
-        ret, ack = raw.rsplit(sep='\n', maxsplit=1)
-        ret = ret.strip('\r')  # strip possible CR char
-        self.check_acknowledgement(ack, ret)
+        _, match, raw = self.connection.expect([self._reg_ack], self.timeout)
+        if match is None:
+            raise TimeoutError("AttocubeConsoleAdapter: no acknowledgement "
+                               f"after command {self.lastcommand} received "
+                               f"within {self.timeout} s, received {raw!r}")
+        # one would want to use self.read_termination to split the lines, but
+        # this is not possible because of a firmware bug resulting in
+        # inconsistent line endings
+        ret = raw[:match.start()].decode().strip('\r\n')
+        ack = match.group(1).decode()
+        self.check_acknowledgement(ack, ret or ack)
         return ret
 
     def write(self, command, check_ack=True):
@@ -113,8 +120,7 @@ class AttocubeConsoleAdapter(TelnetAdapter):
         self.lastcommand = command
         super().write(command + self.write_termination)
         if check_ack:
-            reply = self.connection.read_until(self.read_termination.encode())
-            msg = reply.decode().strip(self.read_termination)
+            msg = super().read()
             self.check_acknowledgement(msg)
 
     def ask(self, command):
@@ -125,5 +131,4 @@ class AttocubeConsoleAdapter(TelnetAdapter):
         :returns: String ASCII response of the instrument
         """
         self.write(command, check_ack=False)
-        time.sleep(self.query_delay)
         return self.read()
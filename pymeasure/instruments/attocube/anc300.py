@@ -208,7 +208,9 @@ class ANC300Controller(Instrument):
     :param axisnames: a list of axis names which will be used to create
                       properties with these names
     :param passwd: password for the attocube standard console
-    :param query_delay: delay between sending and reading (default 0.05 sec)
+    :param query_delay: delay used for settling of the console while
+                        logging in (default 0.05 sec). Replies to commands are
+                        read as soon as they are complete.
     :param kwargs: Any valid key-word argument for TelnetAdapter
     """
     version = Instrument.measurement(
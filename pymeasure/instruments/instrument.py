@@ -28,7 +28,6 @@ import re
 import numpy as np
 
 from pymeasure.adapters import FakeAdapter
-from pymeasure.adapters.visa import VISAAdapter
 
 log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
@@ -43,13 +42,24 @@ class Instrument(object):
     :param adapter: An :class:`Adapter<pymeasure.adapters.Adapter>` object
     :param name: A string name
     :param includeSCPI: A boolean, which toggles the inclusion of standard SCPI commands
+    :param shared: A boolean, which toggles whether a VISA resource given by its name is
+                   obtained from the process-wide :data:`connections <pymeasure.adapters.connections>`
+                   registry, such that an already open connection is reused. The connection is
+                   released by :meth:`shutdown`.
     """
 
     # noinspection PyPep8Naming
-    def __init__(self, adapter, name, includeSCPI=True, **kwargs):
+    def __init__(self, adapter, name, includeSCPI=True, shared=False, **kwargs):
         try:
             if isinstance(adapter, (int, str)):
-                adapter = VISAAdapter(adapter, **kwargs)
+                # imported here to not load PyVISA for other adapters
+                from pymeasure.adapters.registry import connections
+                from pymeasure.adapters.visa import VISAAdapter
+                if shared:
+                    adapter = connections.acquire(adapter, **kwargs)
+                    self._registry = connections
+                else:
+                    adapter = VISAAdapter(adapter, **kwargs)
         except ImportError:
             raise Exception("Invalid Adapter provided for Instrument since "
                             "PyVISA is not present")
@@ -184,6 +194,10 @@ class Instrument(object):
 
         # Add the specified document string to the getter
         fget.__doc__ = docs
+        # Expose the commands, e.g. for simulating the instrument
+        fget.get_command, fset.set_command = get_command, set_command
+        fget.values = fset.values = values
+        fget.map_values = fset.map_values = map_values
 
         return property(fget, fset)
 
@@ -234,6 +248,9 @@ class Instrument(object):
 
         # Add the specified document string to the getter
         fget.__doc__ = docs
+        # Expose the command, e.g. for simulating the instrument
+        fget.get_command = get_command
+        fget.values, fget.map_values = values, map_values
 
         return property(fget)
 
@@ -286,6 +303,9 @@ class Instrument(object):
 
         # Add the specified document string to the getter
         fget.__doc__ = docs
+        # Expose the command, e.g. for simulating the instrument
+        fset.set_command = set_command
+        fset.values, fset.map_values = values, map_values
 
         return property(fget, fset)
 
@@ -301,9 +321,15 @@ class Instrument(object):
         self.write("*RST")
 
     def shutdown(self):
-        """Brings the instrument to a safe and stable state"""
+        """Brings the instrument to a safe and stable state, and releases a
+        shared connection. Subclasses should call this method at the end of
+        their own implementation."""
         self.isShutdown = True
         log.info("Shutting down %s" % self.name)
+        # release only once, as the connection might still be used by others
+        registry, self._registry = getattr(self, '_registry', None), None
+        if registry is not None:
+            registry.release(self.adapter)
 
     def check_errors(self):
         """Return any accumulated errors. Must be reimplemented by subclasses.
@@ -741,10 +741,10 @@ class Keithley2400(Instrument, KeithleyBuffer):
     def shutdown(self):
         """ Ensures that the current or voltage is turned to zero
         and disables the output. """
-        log.info("Shutting down %s." % self.name)
         if self.source_mode == 'current':
             self.ramp_to_current(0.0)
         else:
             self.ramp_to_voltage(0.0)
         self.stop_buffer()
         self.disable_source()
+        super().shutdown()
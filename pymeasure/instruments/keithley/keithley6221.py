@@ -389,8 +389,8 @@ class Keithley6221(Instrument, KeithleyBuffer):
 
     def shutdown(self):
         """ Disables the output. """
-        log.info("Shutting down %s." % self.name)
         self.disable_source()
+        super().shutdown()
 
     ###############
     # Status bits #
@@ -342,7 +342,7 @@ class Keithley6517B(Instrument, KeithleyBuffer):
     def shutdown(self):
         """ Ensures that the current or voltage is turned to zero
         and disables the output. """
-        log.info("Shutting down %s.", self.name)
         self.ramp_to_voltage(0.0)
         self.stop_buffer()
         self.disable_source()
+        super().shutdown()
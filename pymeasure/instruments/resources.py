@@ -22,12 +22,28 @@
 # THE SOFTWARE.
 #
 
-import pyvisa
+import json
+import logging
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from pymeasure.adapters.registry import connections
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+ResourceInfo = namedtuple('ResourceInfo', ['resource', 'idn', 'latency', 'error'])
+ResourceInfo.__doc__ = """ Result of the discovery of a single VISA resource,
+with its identification string (None on failure), the time in seconds it took
+to obtain it and the error message (None on success). """
 
 
 def list_resources():
     """
-    Prints the available resources, and returns a list of VISA resource names
+    Prints the available resources, and returns a list of VISA resource names.
+    The resources are identified concurrently by :func:`find_resources`.
     
     .. code-block:: python
 
@@ -38,23 +54,109 @@ def list_resources():
         dmm = Agilent34410(resources[0])
     
     """
-    rm = pyvisa.ResourceManager()
-    instrs = rm.list_resources()
-    for n, instr in enumerate(instrs):
-        # trying to catch errors in comunication
-        try:
-            res = rm.open_resource(instr)
-            # try to avoid errors from *idn?
-            try:
-                # noinspection PyUnresolvedReferences
-                idn = res.ask('*idn?')[:-1]
-            except pyvisa.Error:
-                idn = "Not known"
-            finally:
-                res.close()
-                print(n, ":", instr, ":", idn)
-        except pyvisa.VisaIOError as e:
-            print(n, ":", instr, ":", "Visa IO Error: check connections")
-            print(e)
-    rm.close()
-    return instrs
+    infos = find_resources()
+    for n, info in enumerate(infos):
+        if info.error is None:
+            print(n, ":", info.resource, ":", info.idn)
+        else:
+            print(n, ":", info.resource, ":", "check connections,", info.error)
+    return tuple(info.resource for info in infos)
+
+
+def _identify(resource, visa_library, timeout, refresh):
+    start = time.perf_counter()
+    try:
+        idn = connections.identify(resource, visa_library, refresh=refresh,
+                                   timeout=int(timeout * 1000))
+        error = None
+    except Exception as e:
+        idn, error = None, str(e)
+    return ResourceInfo(resource, idn, time.perf_counter() - start, error)
+
+
+def _load_cache(cache_file, query, visa_library, ttl):
+    """ Returns the cached list of :class:`ResourceInfo`, or None if the cache
+    is missing, stale, or cannot be read, e.g. as it has an older format """
+    try:
+        with open(cache_file) as f:
+            cache = json.load(f)
+        if (cache.get('query') != query or
+                cache.get('visa_library') != visa_library or
+                time.time() - cache.get('timestamp', 0) > ttl):
+            return None
+        return [ResourceInfo(*info) for info in cache['resources']]
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+        log.debug("Ignoring the resource cache %s: %s" % (cache_file, e))
+        return None
+
+
+def _save_cache(cache_file, query, visa_library, infos):
+    cache = {'timestamp': time.time(), 'query': query,
+             'visa_library': visa_library,
+             'resources': [list(info) for info in infos]}
+    tmp_file = cache_file + '.tmp'
+    with open(tmp_file, 'w') as f:
+        json.dump(cache, f)
+    os.replace(tmp_file, cache_file)
+
+
+def find_resources(query='?*::INSTR', visa_library='', timeout=1.0,
+                   max_workers=8, cache_file=None, ttl=3600, refresh=False):
+    """
+    Identifies the available VISA resources concurrently and returns a list of
+    :class:`ResourceInfo` tuples in the order of the VISA resource list. Each
+    resource is opened with a short timeout, so unresponsive addresses do not
+    delay the discovery of the others.
+
+    .. code-block:: python
+
+        for info in find_resources(cache_file="resources.json"):
+            print(info.resource, info.idn or info.error)
+
+    :param query: VISA resource query, see :meth:`pyvisa.ResourceManager.list_resources`
+    :param visa_library: VisaLibrary Instance, path of the VISA library or
+        VisaLibrary spec string (@py or @ni).
+    :param timeout: Timeout in seconds for each resource
+    :param max_workers: Number of resources which are identified at once
+    :param cache_file: Optional path of a JSON file to store the results in
+        and to read them from while they are younger than `ttl`
+    :param ttl: Time to live of the cached results in seconds
+    :param refresh: Ignores cached results, both in the `cache_file` and of
+        the identifications in the :data:`connections <pymeasure.adapters.connections>`
+        registry
+    :returns: List of :class:`ResourceInfo`
+    """
+    if cache_file is not None and not refresh:
+        infos = _load_cache(cache_file, query, visa_library, ttl)
+        if infos is not None:
+            return infos
+
+    resources = connections.resource_manager(visa_library).list_resources(query)
+    if resources:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            infos = list(executor.map(
+                lambda resource: _identify(resource, visa_library, timeout, refresh),
+                resources))
+    else:
+        infos = []
+    log.info("Found %d VISA resources, %d identified." % (
+        len(infos), sum(info.error is None for info in infos)))
+
+    if cache_file is not None:
+        _save_cache(cache_file, query, visa_library, infos)
+    return infos
+
+
+def find_resources_in_background(**kwargs):
+    """
+    Runs :func:`find_resources` with `refresh` in a background thread, for
+    example to update its `cache_file` while an application starts up.
+
+    :param kwargs: Key-word arguments of :func:`find_resources`
+    :returns: :class:`concurrent.futures.Future` of the list of :class:`ResourceInfo`
+    """
+    kwargs['refresh'] = True
+    executor = ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(find_resources, **kwargs)
+    executor.shutdown(wait=False)
+    return future
@@ -290,6 +290,5 @@ class DSP7265(Instrument):
             return [0.0]
 
     def shutdown(self):
-        log.info("Shutting down %s." % self.name)
         self.voltage = 0.
-        self.isShutdown = True
+        super().shutdown()
@@ -31,6 +31,11 @@ setup(
     author='PyMeasure Developers',
     packages=find_packages(),
     scripts=[],
+    entry_points={
+        'console_scripts': [
+            'pymeasure-batch = pymeasure.experiment.batch:main',
+        ],
+    },
     url='https://github.com/pymeasure/pymeasure',
     download_url='https://github.com/pymeasure/pymeasure/tarball/v0.9.0',
     license='MIT License',
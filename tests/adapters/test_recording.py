@@ -0,0 +1,93 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2021 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from pymeasure.adapters import (FakeAdapter, RecordingAdapter, ReplayAdapter)
+
+
+class BinaryFakeAdapter(FakeAdapter):
+    def binary_values(self, command, header_bytes=0, dtype=np.float32):
+        return np.arange(4, dtype=dtype)
+
+
+@pytest.fixture(params=["traffic.jsonl", "traffic.jsonl.gz"])
+def recording(tmp_path, request):
+    filename = str(tmp_path / request.param)
+    with RecordingAdapter(BinaryFakeAdapter(), filename) as adapter:
+        adapter.write("VOLT 5")
+        assert adapter.read() == "VOLT 5"
+        assert adapter.values("1.5,2.5") == [1.5, 2.5]
+        adapter.binary_values("CURV?", dtype=np.int16)
+    return filename
+
+
+def test_replay(recording):
+    adapter = ReplayAdapter(recording)
+    assert adapter.remaining == 4
+    adapter.write("VOLT 5")
+    assert adapter.read() == "VOLT 5"
+    assert adapter.values("1.5,2.5") == [1.5, 2.5]
+    data = adapter.binary_values("CURV?")
+    assert data.dtype == np.int16
+    np.testing.assert_array_equal(data, [0, 1, 2, 3])
+    assert adapter.remaining == 0
+    with pytest.raises(ValueError):
+        adapter.read()
+    adapter.rewind()
+    adapter.write("VOLT 5")
+
+
+def test_replay_checks_commands(recording):
+    adapter = ReplayAdapter(recording)
+    with pytest.raises(ValueError):
+        adapter.write("VOLT 6")
+    adapter = ReplayAdapter(recording, check_commands=False)
+    adapter.write("VOLT 6")
+
+
+def test_recording_is_flushed(tmp_path):
+    filename = str(tmp_path / "traffic.jsonl")
+    adapter = RecordingAdapter(FakeAdapter(), filename)
+    adapter.write("VOLT 5")
+    assert ReplayAdapter(filename).remaining == 1  # before closing
+    adapter.close()
+
+
+def test_compressed_recording_is_flushed_periodically(tmp_path):
+    filename = str(tmp_path / "traffic.jsonl.gz")
+    adapter = RecordingAdapter(FakeAdapter(), filename, flush_interval=60.)
+    with mock.patch.object(adapter._file, 'flush') as flush:
+        for i in range(10):
+            adapter.write("VOLT %d" % i)
+        assert not flush.called
+        adapter.flush_interval = 0.
+        adapter.write("VOLT 10")
+        assert flush.call_count == 1
+    adapter.close()
+    assert ReplayAdapter(filename).remaining == 11
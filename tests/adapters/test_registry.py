@@ -0,0 +1,118 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2021 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+
+import importlib.util
+import time
+
+import pytest
+import pyvisa
+
+from pymeasure.adapters import ConnectionRegistry, SharedVISAAdapter, connections
+from pymeasure.adapters.visa import get_resource_manager
+from pymeasure.instruments import Instrument
+
+SIM_RESOURCE = 'ASRL2::INSTR'
+
+is_pyvisa_sim_installed = bool(importlib.util.find_spec('pyvisa_sim'))
+if not is_pyvisa_sim_installed:
+    pytest.skip('PyVISA tests require the pyvisa-sim library', allow_module_level=True)
+
+
+@pytest.fixture
+def registry():
+    registry = ConnectionRegistry()
+    yield registry
+    registry.close()
+
+
+def test_resource_manager_is_shared():
+    assert get_resource_manager('@sim') is get_resource_manager('@sim')
+
+
+def test_acquire_returns_shared_adapter(registry):
+    first = registry.acquire(SIM_RESOURCE, visa_library='@sim')
+    second = registry.acquire(SIM_RESOURCE, visa_library='@sim')
+    assert isinstance(first, SharedVISAAdapter)
+    assert first is second
+    assert registry.refcount(SIM_RESOURCE, '@sim') == 2
+    assert first.ask("*IDN?") == "SCPI,MOCK,VERSION_1.0\n"
+
+
+def test_release_closes_after_last_user(registry):
+    first = registry.acquire(SIM_RESOURCE, visa_library='@sim')
+    registry.acquire(SIM_RESOURCE, visa_library='@sim')
+    registry.release(first)
+    assert first.connection is not None
+    registry.release(first)
+    assert first.connection is None
+    assert registry.refcount(SIM_RESOURCE, '@sim') == 0
+    with pytest.raises(ValueError):
+        registry.release(first)
+
+
+def test_identify_is_cached(registry):
+    assert registry.identify(SIM_RESOURCE, '@sim') == "SCPI,MOCK,VERSION_1.0"
+    registry.acquire(SIM_RESOURCE, visa_library='@sim').write("garbage")
+    assert registry.identify(SIM_RESOURCE, '@sim') == "SCPI,MOCK,VERSION_1.0"
+
+
+def test_identify_error(registry):
+    with pytest.raises(ConnectionError, match="ASRL5::INSTR.*VI_ERROR_TMO") as info:
+        registry.identify('ASRL5::INSTR', '@sim', timeout=200)
+    assert isinstance(info.value.__cause__, pyvisa.VisaIOError)
+    assert info.value.__cause__.error_code == pyvisa.constants.StatusCode.error_timeout
+
+
+def test_identify_applies_the_timeout_to_an_open_connection(registry):
+    adapter = registry.acquire('ASRL5::INSTR', visa_library='@sim', timeout=5000)
+    start = time.perf_counter()
+    with pytest.raises(ConnectionError):
+        registry.identify('ASRL5::INSTR', '@sim', timeout=200)
+    assert time.perf_counter() - start < 2
+    assert adapter.connection.timeout == 5000
+    registry.release(adapter)
+
+
+def test_shared_instruments():
+    first = Instrument(SIM_RESOURCE, "first", shared=True, visa_library='@sim')
+    second = Instrument(SIM_RESOURCE, "second", shared=True, visa_library='@sim')
+    assert first.adapter is second.adapter
+    assert second.id == "SCPI,MOCK,VERSION_1.0"
+    connections.close()
+
+
+def test_shared_instruments_release_on_shutdown():
+    first = Instrument(SIM_RESOURCE, "first", shared=True, visa_library='@sim')
+    second = Instrument(SIM_RESOURCE, "second", shared=True, visa_library='@sim')
+    adapter = first.adapter
+    assert connections.refcount(SIM_RESOURCE, '@sim') == 2
+    first.shutdown()
+    first.shutdown()  # releases only once
+    assert connections.refcount(SIM_RESOURCE, '@sim') == 1
+    assert adapter.connection is not None
+    assert second.id == "SCPI,MOCK,VERSION_1.0"
+    second.shutdown()
+    assert connections.refcount(SIM_RESOURCE, '@sim') == 0
+    assert adapter.connection is None
@@ -0,0 +1,93 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2021 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+
+import time
+
+import numpy as np
+import pytest
+
+from pymeasure.adapters import CommandModel, SimulatedAdapter
+from pymeasure.instruments import Instrument
+from pymeasure.instruments.validators import strict_discrete_set
+
+
+class SimulatedInstrument(Instrument):
+    voltage = Instrument.control(
+        "VOLT?", "VOLT %g", """ Voltage """)
+    mode = Instrument.control(
+        "MODE?", "MODE %s", """ Mode """,
+        validator=strict_discrete_set,
+        values={'voltage': 'VOLT', 'current': 'CURR'}, map_values=True)
+    current = Instrument.measurement("MEAS:CURR?", """ Current """)
+    trigger = Instrument.setting("TRIG %d", """ Trigger count """)
+
+    def __init__(self, adapter, **kwargs):
+        super().__init__(adapter, "Simulated instrument", **kwargs)
+
+
+def make_instrument(**kwargs):
+    model = CommandModel.from_instrument(SimulatedInstrument, current="1e-6")
+    return SimulatedInstrument(SimulatedAdapter(model, **kwargs))
+
+
+def test_model_from_instrument():
+    instr = make_instrument()
+    assert instr.voltage == 0
+    instr.voltage = 2.5
+    assert instr.voltage == 2.5
+    assert instr.mode == 'voltage'
+    instr.mode = 'current'
+    assert instr.mode == 'current'
+    assert instr.current == 1e-6
+    instr.trigger = 3
+    assert instr.adapter.model.state['trigger'] == '3'
+
+
+def test_unknown_command():
+    instr = make_instrument()
+    with pytest.raises(ValueError):
+        instr.write("UNKNOWN")
+    instr.adapter.model.strict = False
+    assert instr.ask("UNKNOWN?") == ""
+
+
+def test_binary_block():
+    model = CommandModel()
+    model.add_binary("CURV?", np.arange(10, dtype=np.float32))
+    adapter = SimulatedAdapter(model)
+    data = adapter.binary_values("CURV?", header_bytes=4)
+    np.testing.assert_array_equal(data, np.arange(10))
+
+
+def test_latency_and_throughput():
+    model = CommandModel()
+    model.add_query("*IDN?", "SIMULATED")
+    adapter = SimulatedAdapter(model, latency=0.02, jitter=0.01,
+                               throughput=1000, seed=1)
+    start = time.perf_counter()
+    for i in range(5):
+        assert adapter.ask("*IDN?") == "SIMULATED"
+    # each query takes 20 ms latency plus 14 ms for transferring 14 bytes
+    assert time.perf_counter() - start >= 5 * 0.034
@@ -0,0 +1,104 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2021 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import socket
+import threading
+import time
+
+import pytest
+
+from pymeasure.adapters import TelnetAdapter
+from pymeasure.instruments.attocube.adapters import AttocubeConsoleAdapter
+
+
+@pytest.fixture
+def server(request):
+    """ Local TCP server which answers every received chunk with the replies
+    given in its 'replies' list, sending each reply in two parts. An optional
+    greeting, given by indirect parametrization, is sent upon connecting. """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(('127.0.0.1', 0))
+    sock.listen(1)
+    replies = []
+
+    def serve():
+        conn, _ = sock.accept()
+        with conn:
+            if getattr(request, 'param', None):
+                conn.sendall(request.param)
+            while conn.recv(1024):
+                reply = replies.pop(0)
+                conn.sendall(reply[:2])
+                time.sleep(0.05)
+                conn.sendall(reply[2:])
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    yield sock.getsockname()[1], replies
+    sock.close()
+
+
+def test_ask_reads_until_termination(server):
+    port, replies = server
+    replies.extend([b"1.234\r\n", b"OK\r\n"])
+    adapter = TelnetAdapter('127.0.0.1', port, read_termination='\r\n',
+                            timeout=1)
+    assert adapter.ask("geto 1\r\n") == "1.234"
+    assert adapter.ask("setv 1 10\r\n") == "OK"
+
+
+def test_read_timeout_without_termination(server):
+    port, replies = server
+    replies.append(b"1.234")
+    adapter = TelnetAdapter('127.0.0.1', port, read_termination='\r\n',
+                            timeout=0.2)
+    with pytest.raises(TimeoutError):
+        adapter.ask("geto 1\r\n")
+
+
+def attocube_console(port, replies, timeout):
+    replies.extend([b"********\r\nAuthorization success\r\n",
+                    b"echo off\r\nOK\r\n"])
+    return AttocubeConsoleAdapter('127.0.0.1', port, "passwd", query_delay=0.1,
+                                  timeout=timeout)
+
+
+@pytest.mark.parametrize('server', [b"Attocube Console\r\n"], indirect=True)
+def test_attocube_read_until_acknowledgement(server):
+    port, replies = server
+    adapter = attocube_console(port, replies, timeout=1)
+    replies.append(b"voltage = 10 V\r\nOK\r\n")
+    start = time.perf_counter()
+    assert adapter.ask("getv 1") == "voltage = 10 V"
+    assert time.perf_counter() - start < 0.5
+    assert adapter.extract_value("voltage = 10 V") == "10"
+
+
+@pytest.mark.parametrize('server', [b"Attocube Console\r\n"], indirect=True)
+def test_attocube_read_timeout_without_acknowledgement(server):
+    port, replies = server
+    adapter = attocube_console(port, replies, timeout=0.2)
+    replies.append(b"voltage = 10 V\r\n")
+    with pytest.raises(TimeoutError, match="getv 1"):
+        adapter.ask("getv 1")
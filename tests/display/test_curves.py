@@ -0,0 +1,205 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2021 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pyqtgraph as pg
+import pytest
+
+from pymeasure.display.curves import (BufferCurve, ResultsCurve, ResultsImage, decimation_step,
+                                      peak_indices)
+
+
+class CurveResults(object):
+    def __init__(self, data):
+        self.data = data
+
+    def reload(self):
+        pass
+
+
+class ImageResults(object):
+    def __init__(self, data):
+        self.procedure = SimpleNamespace(x_start=0., x_end=2., x_step=1.,
+                                         y_start=0., y_end=1., y_step=0.5)
+        self.data = data
+
+    def reload(self):
+        pass
+
+
+@pytest.fixture
+def image(qtbot):
+    results = ImageResults(pd.DataFrame({'x': [0., 1.], 'y': [0., 0.5], 'z': [1., 3.]}))
+    return ResultsImage(results, 'x', 'y', 'z')
+
+
+def test_find_img_index(image):
+    assert image.find_img_index(1.4, 0.8) == [1, 2]
+    assert image.find_img_index(5., -1.) == [2, 2]  # out of range
+    xidx, yidx = image.find_img_index(np.array([0., 0.5, 2.]), np.array([0.26, 1., 0.]))
+    assert list(xidx) == [0, 1, 2] and list(yidx) == [1, 2, 0]
+
+
+def test_update_img_is_incremental(image):
+    image.update_img()
+    assert image.img_data[0, 0] == 1. and image.img_data[1, 1] == 3.
+    assert np.isnan(image.img_data).sum() == image.img_data.size - 2
+    assert image._levels == (1., 3.)
+
+    image.img_data[0, 0] = -1.  # is not recomputed
+    image.results.data = pd.concat([image.results.data, pd.DataFrame(
+        {'x': [2.], 'y': [1.], 'z': [5.]})], ignore_index=True)
+    image.update_img()
+    assert image.img_data[0, 0] == -1.
+    assert image.img_data[2, 2] == 5.
+    assert image._levels == (1., 5.)
+
+    image.clear_img()
+    image.update_img()
+    assert image.img_data[0, 0] == 1.
+
+
+def test_lut(image):
+    assert image.lut.shape == (256, 4)
+    assert image.lut.dtype == np.ubyte
+
+
+def test_decimation_step():
+    assert decimation_step(100, 50) == 1
+    assert decimation_step(1000, 100) == 16
+    assert decimation_step(1024, 100) == 16
+
+
+def test_peak_indices_keep_peaks():
+    y = np.array([0., 5., 1., np.nan, -3., 2., np.nan, np.nan, 7.])
+    assert list(peak_indices(y, 3)) == [0, 1, 4, 5, 8, 8]
+    assert list(peak_indices(np.array([np.nan, np.nan]), 2)) == [0, 0]
+
+
+def test_curve_is_decimated_incrementally(qtbot):
+    x = np.arange(100000, dtype=float)
+    y = np.sin(x / 1000)
+    y[31415] = 10.
+    results = CurveResults(pd.DataFrame({'x': x[:50000], 'y': y[:50000]}))
+    curve = ResultsCurve(results, 'x', 'y')
+    curve.DECIMATION_WIDTH = 100
+    curve.update()
+    xdata, ydata = curve.getData()
+    assert len(xdata) <= 2 * 100 + 4
+    assert ydata.max() == 10.
+    assert xdata[0] == 0. and xdata[-1] == 49999.
+
+    results.data = pd.DataFrame({'x': x, 'y': y})
+    curve.update()
+    xdata, ydata = curve.getData()
+    assert curve._rows == 100000
+    assert len(xdata) <= 2 * 100 + 4
+    assert ydata.max() == 10. and ydata.min() == pytest.approx(-1, abs=1e-3)
+    assert xdata[-1] == 99999.
+    # incremental peaks equal those of decimating all the points at once
+    step = decimation_step(100000, 100)
+    assert set(peak_indices(y[:curve._peaks_end], step)) <= set(curve._peaks)
+
+    results.data = pd.DataFrame({'x': x[:10], 'y': y[:10]})
+    curve.update()
+    assert np.array_equal(curve.getData()[0], x[:10])
+
+
+def test_curve_is_clipped_to_view(qtbot):
+    widget = pg.PlotWidget()
+    qtbot.addWidget(widget)
+    x = np.arange(10000, dtype=float)
+    results = CurveResults(pd.DataFrame({'x': x, 'y': x ** 2}))
+    curve = ResultsCurve(results, 'x', 'y')
+    widget.addItem(curve)
+    curve.update()
+    widget.setXRange(100, 200, padding=0)
+    xdata, _ = curve.getData()
+    assert xdata[0] == 99. and xdata[-1] == 201.
+    assert curve._view[2] == 10000
+
+
+def test_buffer_curve_overflow(qtbot):
+    curve = BufferCurve(redraw_time=None)
+    curve.prepare(3)
+    curve.extend([0, 1], [2, 3])
+    curve.append(2, 4)
+    assert list(curve.getData()[1]) == [2, 3, 4]
+    with pytest.raises(Exception, match="overflow"):
+        curve.append(3, 5)
+
+
+def test_buffer_curve_rolls(qtbot):
+    curve = BufferCurve(errors=True, redraw_time=None)
+    curve.prepare(4, rolling=True)
+    curve.extend(np.arange(3), np.arange(3) * 2, yErrors=[0.1, 0.5, 0.2])
+    curve.extend(np.arange(3, 6), np.arange(3, 6) * 2)
+    assert list(curve.points[:, 0]) == [2, 3, 4, 5]
+    assert list(curve.getData()[1]) == [4, 6, 8, 10]
+    assert curve._beam == pytest.approx(0.5)
+    curve.extend(np.arange(10, 20), np.arange(10, 20))
+    assert list(curve.points[:, 0]) == [16, 17, 18, 19]
+    for i in range(5):
+        curve.append(20 + i, 0)
+    assert list(curve.points[:, 0]) == [21, 22, 23, 24]
+
+
+def test_buffer_curve_redraws_are_throttled(qtbot):
+    curve = BufferCurve(redraw_time=0.05)
+    curve.prepare(10)
+    with qtbot.waitSignal(curve.data_updated):
+        for i in range(5):
+            curve.append(i, i)
+        assert curve.getData()[0] is None
+    assert len(curve.getData()[0]) == 5
+
+
+def test_curve_error_bars(qtbot):
+    x = np.arange(1000, dtype=float)
+    results = CurveResults(pd.DataFrame({'x': x[:10], 'y': -x[:10], 'dx': x[:10] / 10,
+                                         'dy': x[:10] / 100}))
+    curve = ResultsCurve(results, 'x', 'y', xerr='dx', yerr='dy')
+    curve.update()
+    opts = curve._errorBars.opts
+    assert np.array_equal(opts['left'], x[:10] / 10)
+    assert np.array_equal(opts['right'], x[:10] / 10)
+    assert np.array_equal(opts['top'], x[:10] / 100)
+    assert np.array_equal(opts['bottom'], x[:10] / 100)
+    assert opts['beam'] == pytest.approx(0.9)
+
+    # new rows are appended and the error bars are decimated with the curve
+    results.data = pd.DataFrame({'x': x, 'y': -x, 'dx': x / 10, 'dy': x / 100})
+    curve.DECIMATION_WIDTH = 100
+    curve.update()
+    xdata, _ = curve.getData()
+    assert curve._rows == 1000
+    assert len(xdata) < 1000
+    assert np.array_equal(opts['x'], xdata)
+    assert np.array_equal(opts['left'], xdata / 10)
+    assert np.array_equal(opts['top'], xdata / 100)
+    assert opts['beam'] == pytest.approx(99.9)
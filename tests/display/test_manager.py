@@ -0,0 +1,192 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2021 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+
+import pytest
+from unittest import mock
+
+import pyqtgraph as pg
+
+from pymeasure.display.Qt import QtCore
+from pymeasure.display.manager import Manager, Experiment, ExperimentQueue
+from pymeasure.display.curves import ResultsCurve
+from pymeasure.experiment import Procedure, Results
+
+
+def test_queue_sequence_pulls_procedures_lazily():
+    manager = Manager(mock.MagicMock(), mock.MagicMock())
+    manager._start_on_add = False
+    pulled = []
+
+    def procedures():
+        for i in range(3):
+            pulled.append(i)
+            yield i
+
+    queued = []
+
+    def queue(procedure):
+        queued.append(procedure)
+
+    manager.queue_sequence(procedures(), queue)
+    assert pulled == [0]  # one procedure is taken ahead
+    assert manager.has_next()
+    for i in range(3):
+        assert manager._pull_sequence()
+        assert pulled == list(range(min(i + 2, 3)))
+    # the last procedure has been queued, there is no further one
+    assert queued == [0, 1, 2]
+    assert not manager.has_next()
+    assert not manager._pull_sequence()
+    assert not manager._sequences
+
+    manager.queue_sequence(iter([]), queue)
+    assert not manager.has_next()
+
+
+def test_clear_drops_pending_sequences():
+    manager = Manager(mock.MagicMock(), mock.MagicMock())
+    manager._start_on_add = False
+    manager.queue_sequence(iter(range(3)), mock.MagicMock())
+    manager.clear()
+    assert not manager.has_next()
+
+
+def make_experiment(filename, status=Procedure.QUEUED):
+    results = mock.MagicMock()
+    results.data_filename = filename
+    results.procedure.status = status
+    return Experiment(results, mock.MagicMock(), mock.MagicMock())
+
+
+def test_experiment_queue():
+    queue = ExperimentQueue()
+    finished = make_experiment('/data/finished.csv', Procedure.FINISHED)
+    first, second = make_experiment('/data/first.csv'), make_experiment('/data/second.csv')
+    for experiment in (finished, first, second):
+        queue.append(experiment)
+
+    assert len(queue) == 3
+    assert queue[0] is finished and list(queue) == [finished, first, second]
+    assert queue[-1] is second and queue[1:] == [first, second]
+    assert queue.queue == [finished, first, second] and queue.queue[1] is first
+    assert first in queue and 'first.csv' in queue and '/other/second.csv' in queue
+    assert 'third.csv' not in queue
+    assert queue.with_browser_item(second.browser_item) is second
+    assert queue.with_browser_item(mock.MagicMock()) is None
+
+    assert queue.next() is first
+    first.procedure.status = Procedure.RUNNING
+    with pytest.raises(Exception):
+        queue.remove(first)
+    assert queue.next() is second
+    queue.remove(second)
+    assert second not in queue and 'second.csv' not in queue
+    assert not queue.has_next()
+    with pytest.raises(StopIteration):
+        queue.next()
+    with pytest.raises(Exception):
+        queue.remove(second)
+    assert queue[1] is first and queue[-1] is first
+
+
+def test_experiment_queue_view_is_deprecated():
+    queue = ExperimentQueue()
+    first, second = make_experiment('/data/first.csv'), make_experiment('/data/second.csv')
+    with pytest.warns(FutureWarning):
+        queue.queue.append(first)
+    with pytest.warns(FutureWarning):
+        queue.queue.extend([second])
+    assert list(queue) == [first, second] and 'second.csv' in queue
+    with pytest.warns(FutureWarning):
+        queue.queue.remove(first)
+    with pytest.warns(FutureWarning):
+        del queue.queue[0]
+    assert len(queue) == 0 and queue.queue == []
+    with pytest.raises(TypeError):
+        queue.queue[0] = first
+
+
+class LineProcedure(Procedure):
+    DATA_COLUMNS = ['x', 'y']
+
+
+def make_finished_experiment(directory, name):
+    procedure = LineProcedure()
+    results = Results(procedure, str(directory.join(name)))
+    with open(results.data_filename, 'a') as f:
+        for i in range(100):
+            f.write(results.format({'x': i, 'y': i % 7}) + Results.LINE_BREAK)
+    procedure.status = Procedure.FINISHED
+    curve = ResultsCurve(results, 'x', 'y')
+    curve.update()
+    return Experiment(results, curve, mock.MagicMock())
+
+
+def test_least_recently_used_experiments_are_evicted(qtbot, tmpdir):
+    manager = Manager(mock.MagicMock(), mock.MagicMock(), max_loaded=2)
+    experiments = [make_finished_experiment(tmpdir, 'data%d.csv' % i) for i in range(3)]
+    for experiment in experiments:
+        manager.load(experiment)
+
+    first, second, third = experiments
+    assert first.evicted and not second.evicted and not third.evicted
+    assert first.results._data is None
+    assert first.curve._size == 0
+    assert len(first.curve.xData) == 100  # preview
+
+    manager.touch(first)  # e.g. shown again
+    assert not first.evicted and second.evicted
+    assert len(first.results.data) == 100
+    assert first.curve._size == 100
+
+    manager.remove(third)
+    manager.touch(second)
+    assert not second.evicted and not first.evicted
+
+
+def test_evicted_curves_keep_their_preview(qtbot, tmpdir):
+    widget = pg.PlotWidget()
+    qtbot.addWidget(widget)
+    manager = Manager(widget.getPlotItem(), mock.MagicMock(), max_loaded=1)
+    first, second = (make_finished_experiment(tmpdir, 'data%d.csv' % i) for i in range(2))
+    manager.load(first)
+    manager.load(second)
+    assert first.evicted
+
+    widget.setXRange(10, 20)  # changes of the view do not read the data again
+    assert first.evicted and first.results._data is None
+    assert not first.curve.needs_update()
+    assert len(first.curve.xData) == 100
+
+
+def test_hidden_experiments_are_evicted_first(qtbot, tmpdir):
+    manager = Manager(mock.MagicMock(), mock.MagicMock(), max_loaded=2)
+    experiments = [make_finished_experiment(tmpdir, 'data%d.csv' % i) for i in range(3)]
+    shown, hidden, last = experiments
+    shown.browser_item.checkState.return_value = QtCore.Qt.Checked
+    hidden.browser_item.checkState.return_value = QtCore.Qt.Unchecked
+    for experiment in experiments:
+        manager.load(experiment)
+    assert hidden.evicted and not shown.evicted and not last.evicted
@@ -0,0 +1,74 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2021 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+
+from queue import Queue
+
+from pandas.testing import assert_frame_equal
+
+from pymeasure.display.listeners import Monitor
+from pymeasure.experiment import IntegerParameter, Procedure
+from pymeasure.experiment.results import Results
+from pymeasure.experiment.workers import Worker
+
+
+class CountingProcedure(Procedure):
+    iterations = IntegerParameter('Loop Iterations', default=20)
+    DATA_COLUMNS = ['Iteration', 'Square']
+
+    def execute(self):
+        for i in range(self.iterations):
+            self.emit('results', {'Iteration': i, 'Square': i ** 2 / 3})
+
+
+def test_monitor_emits_waiting_results_together(qtbot):
+    queue = Queue()
+    for message in [('results', 1), ('results', 2), ('progress', 50.), ('results', 3), None]:
+        queue.put(message)
+    monitor = Monitor(queue)
+    batches, progress = [], []
+    monitor.results.connect(batches.append)
+    monitor.progress.connect(progress.append)
+    monitor.run()
+    assert batches == [[1, 2], [3]]
+    assert progress == [50.]
+
+
+def test_live_results_from_worker(qtbot, tmpdir):
+    procedure = CountingProcedure()
+    results = Results(procedure, str(tmpdir.join('data.csv')))
+    results.start_live()
+    worker = Worker(results, monitor_results=True)
+    monitor = Monitor(worker.monitor_queue)
+    monitor.results.connect(results.add_records)
+    worker.start()
+    worker.join(timeout=None)
+    monitor.run()
+
+    assert results.version > 0
+    live = results.data.copy()
+    results.stop_live()
+    assert len(live) == 20
+    assert_frame_equal(live, Results.load(results.data_filename, CountingProcedure).data)
+    assert results.data.equals(live)
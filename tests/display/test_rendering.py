@@ -0,0 +1,121 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2021 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+
+""" Tests of the accelerated rendering of plots, and a benchmark of the
+software and accelerated rendering. Run this file as a script to print the
+time to update and draw dense curves, e.g. headless with
+QT_QPA_PLATFORM=offscreen. """
+
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from pymeasure.display.Qt import QtGui
+from pymeasure.display.curves import ResultsCurve
+from pymeasure.display.widgets import PlotFrame
+from pymeasure.experiment import Procedure
+
+
+class DenseResults(object):
+    def __init__(self, points, nans=False):
+        x = np.arange(points, dtype=float)
+        y = np.random.default_rng(0).normal(size=points)
+        if nans:
+            y[::100] = np.nan
+        self.procedure = SimpleNamespace(status=Procedure.RUNNING)
+        self.data = pd.DataFrame({'x': x, 'y': y})
+
+
+def make_frame(curves, points, accelerated, nans=False):
+    frame = PlotFrame('x', 'y', accelerated=accelerated)
+    frame.timer.stop()
+    frame.resize(800, 600)
+    for i in range(curves):
+        frame.plot.addItem(ResultsCurve(DenseResults(points, nans), 'x', 'y'))
+    return frame
+
+
+def test_accelerated_curves_skip_finite_check(qtbot):
+    frame = make_frame(1, 1000, accelerated=True)
+    qtbot.addWidget(frame)
+    frame.refresh()
+    curve = frame.plot.items[-1]
+    assert frame.accelerating and curve.accelerated
+    assert curve.opts['skipFiniteCheck'] and curve.opts['connect'] == 'all'
+
+
+def test_accelerated_curves_with_nans_connect_finite(qtbot):
+    frame = make_frame(1, 1000, accelerated=True, nans=True)
+    qtbot.addWidget(frame)
+    frame.refresh()
+    curve = frame.plot.items[-1]
+    assert not curve.opts['skipFiniteCheck'] and curve.opts['connect'] == 'finite'
+
+
+def test_automatic_acceleration_by_point_count(qtbot):
+    frame = make_frame(3, 100, accelerated='auto')
+    qtbot.addWidget(frame)
+    frame.ACCELERATION_POINTS = 250
+    frame.refresh()
+    assert frame.drawn_points() == 300
+    assert frame.accelerating
+    curve = frame.plot.items[-1]
+    assert curve.opts['skipFiniteCheck']
+
+    frame.plot.removeItem(curve)
+    frame.plot.removeItem(frame.plot.items[-1])
+    frame.choose_rendering()
+    assert not frame.accelerating
+    assert not frame.plot.items[-1].opts['skipFiniteCheck']
+
+
+def benchmark(curves, points, accelerated, repeat=5):
+    """ Returns the average time in seconds to update and draw the curves """
+    frame = make_frame(curves, points, accelerated)
+    frame.show()
+    frame.refresh()
+    frame.grab()
+    start = time.perf_counter()
+    for i in range(repeat):
+        for item in frame.plot.items:
+            if isinstance(item, ResultsCurve):
+                item.clear_data()
+        frame.refresh()
+        frame.grab()
+    elapsed = (time.perf_counter() - start) / repeat
+    frame.close()
+    return elapsed
+
+
+if __name__ == "__main__":
+    app = QtGui.QApplication([])
+    print("platform: %s" % app.platformName())
+    for curves, points in [(1, 100000), (10, 100000), (10, 1000000)]:
+        for accelerated in (False, True):
+            print("%3d curves of %8d points, %-11s %8.1f ms" % (
+                curves, points, "accelerated" if accelerated else "software",
+                benchmark(curves, points, accelerated) * 1000))
@@ -0,0 +1,179 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2021 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+
+import logging
+from types import SimpleNamespace
+
+import pandas as pd
+
+from pymeasure.display.curves import ResultsCurve, ResultsImage
+from pymeasure.display.widgets import (DashboardWidget, ImageFrame, LogWidget, PlotFrame,
+                                      RefreshTimer)
+from pymeasure.experiment import Procedure
+
+
+class NotifiedResults(object):
+    def __init__(self):
+        self.procedure = SimpleNamespace(status=Procedure.RUNNING)
+        self.data = pd.DataFrame({'x': [0., 1.], 'y': [2., 3.]})
+        self.data_filename = 'data.csv'
+        self.version = 0
+
+    def notify(self):
+        self.version += 1
+
+
+def test_refresh_timer_backs_off(qtbot):
+    timer = RefreshTimer(0.1)
+    assert timer.interval() == 100
+    with qtbot.waitSignal(timer.frame_time_changed) as blocker:
+        timer.record(0.08)
+    assert blocker.args == [0.08, 0.2]
+    for i in range(10):
+        timer.record(1.)
+    assert timer.interval() == 1600
+    timer.record(0.01)
+    assert timer.interval() == 800
+    for i in range(10):
+        timer.record(0.01)
+    assert timer.interval() == 100
+
+
+def test_plot_frame_updates_changed_curves(qtbot):
+    frame = PlotFrame('x', 'y')
+    qtbot.addWidget(frame)
+    frame.timer.stop()
+    results = NotifiedResults()
+    curve = ResultsCurve(results, 'x', 'y')
+    frame.plot.addItem(curve)
+    assert frame.update_curves() == 1
+    assert frame.update_curves() == 0
+
+    results.data = pd.DataFrame({'x': [0., 1., 2.], 'y': [2., 3., 4.]})
+    results.notify()
+    results.notify()  # notifications are coalesced
+    assert frame.update_curves() == 1
+    assert len(curve.getData()[0]) == 3
+    assert frame.update_curves() == 0
+
+    results.notify()
+    results.procedure.status = Procedure.FINISHED
+    assert frame.update_curves() == 0
+
+    frame.refresh()
+    frame.update_frame_time(0.5, 1.6)
+    assert frame.frame_time.text() == "500 ms, refreshing every 1.6 s"
+
+
+def test_image_frame_updates_changed_images(qtbot):
+    frame = ImageFrame('x', 'y', 'z')
+    qtbot.addWidget(frame)
+    frame.timer.stop()
+    results = NotifiedResults()
+    results.procedure = SimpleNamespace(status=Procedure.RUNNING, x_start=0., x_end=2.,
+                                        x_step=1., y_start=0., y_end=1., y_step=0.5)
+    results.data = pd.DataFrame({'x': [0., 1.], 'y': [0., 0.5], 'z': [1., 3.]})
+    image = ResultsImage(results, 'x', 'y', 'z')
+    frame.plot.addItem(image)
+    assert frame.update_curves() == 1
+    assert frame.update_curves() == 0
+
+    results.data = pd.DataFrame({'x': [0., 1., 2.], 'y': [0., 0.5, 1.], 'z': [1., 3., 5.]})
+    results.notify()
+    frame.refresh()
+    assert image.img_data[2, 2] == 5.
+    assert frame.update_curves() == 0
+
+
+def test_log_widget_is_bounded_and_filtered(qtbot):
+    widget = LogWidget(max_lines=5)
+    qtbot.addWidget(widget)
+    widget.timer.stop()
+    logger = logging.getLogger('test_log_widget')
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(widget.handler)
+    try:
+        for i in range(8):
+            logger.log(logging.INFO if i % 2 else logging.DEBUG, "Message %d", i)
+    finally:
+        logger.removeHandler(widget.handler)
+
+    assert widget.handler.count == 8
+    assert len(widget.handler.records) == 5
+    widget.update_view()
+    lines = widget.view.toPlainText().splitlines()
+    assert [line.split(' : ')[1] for line in lines] == [
+        "Message %d (%s)" % (i, 'INFO' if i % 2 else 'DEBUG') for i in range(3, 8)]
+    widget.update_view()
+    assert widget.view.blockCount() == 5
+
+    widget.level.setCurrentText('INFO')
+    assert widget.view.toPlainText().count("Message") == 3
+    widget.search.setText("message 5")
+    assert "Message 5" in widget.view.toPlainText()
+    assert widget.view.toPlainText().count("Message") == 1
+
+
+class CountingResults(NotifiedResults):
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+
+    @property
+    def data(self):
+        self.reads += 1
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        self._data = data
+
+
+def test_dashboard_views_share_one_subscription(qtbot):
+    dashboard = DashboardWidget(plots=[('x', 'y'), ('y', 'x'), ('x', 'y')],
+                                readouts=['x', 'y'], units={'y': 'V'})
+    qtbot.addWidget(dashboard)
+    dashboard.timer.stop()
+    results = CountingResults()
+    dashboard.set_results(results)
+    assert results.reads == 1
+    curves = [frame.plot.items[-1] for frame in dashboard.plot_frames]
+    assert all(curve.results is dashboard.subscription for curve in curves)
+    assert dashboard.readout.values['y'].text() == "3 V"
+
+    dashboard.refresh()  # unchanged
+    assert results.reads == 1
+
+    results.data = pd.DataFrame({'x': [0., 1., 2.], 'y': [2., 3., 5.]})
+    results.notify()
+    dashboard.refresh()
+    assert results.reads == 2
+    assert [len(curve.getData()[0]) for curve in curves] == [3, 3, 3]
+    assert list(curves[1].getData()[0]) == [2., 3., 5.]
+    assert dashboard.readout.values['x'].text() == "2"
+
+    dashboard.clear()
+    assert dashboard.subscription is None
+    assert not any(isinstance(item, ResultsCurve) for item in dashboard.plot_frames[0].plot.items)
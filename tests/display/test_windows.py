@@ -26,7 +26,8 @@ import pytest
 from unittest import mock
 
 from pymeasure.display.Qt import QtGui, QtCore
-from pymeasure.display.windows import ManagedWindow
+from pymeasure.display.windows import ManagedDashboardWindow, ManagedImageWindow, ManagedWindow
+from pymeasure.experiment import FloatParameter, Results, unique_filename
 from pymeasure.experiment.procedure import Procedure
 
 # TODO: Repair this unit test
@@ -49,3 +50,104 @@ from pymeasure.experiment.procedure import Procedure
 #         w = ManagedWindow(mock_procedure)
 #         qtbot.addWidget(w)
 #         mock_sp.assert_called_once_with(w.plot)
+
+
+class SequenceProcedure(Procedure):
+    value = FloatParameter('Value', default=0.)
+    DATA_COLUMNS = ['Value', 'Square']
+
+    def execute(self):
+        self.emit('results', {'Value': self.value, 'Square': self.value ** 2})
+
+
+class SequenceWindow(ManagedWindow):
+    def __init__(self, directory):
+        self.data_directory = directory
+        super().__init__(SequenceProcedure, inputs=['value'], x_axis='Value', y_axis='Square')
+
+    def queue(self, procedure=None):
+        if procedure is None:
+            procedure = self.make_procedure()
+        results = Results(procedure, unique_filename(self.data_directory))
+        self.manager.queue(self.new_experiment(results))
+
+
+def test_buttons_after_the_last_procedure_of_a_sequence(qtbot, tmpdir):
+    window = SequenceWindow(str(tmpdir))
+    qtbot.addWidget(window)
+    finished = []
+    window.manager.finished.connect(finished.append)
+
+    procedures = [SequenceProcedure(value=value) for value in (1., 2.)]
+    window.manager.queue_sequence(procedures, window.queue)
+    qtbot.waitUntil(lambda: len(finished) == 2, timeout=10000)
+
+    assert [e.procedure.value for e in finished] == [1., 2.]
+    assert not window.manager.has_next()
+    assert not window.abort_button.isEnabled()
+    assert window.browser_widget.clear_button.isEnabled()
+
+
+class ImageProcedure(Procedure):
+    X_start = FloatParameter('X start', default=0.)
+    X_end = FloatParameter('X end', default=1.)
+    X_step = FloatParameter('X step', default=1.)
+    Y_start = FloatParameter('Y start', default=0.)
+    Y_end = FloatParameter('Y end', default=1.)
+    Y_step = FloatParameter('Y step', default=1.)
+    DATA_COLUMNS = ['X', 'Y', 'Z']
+
+
+class ImageWindow(ManagedImageWindow):
+    def __init__(self, directory, journal_file):
+        self.data_directory = directory
+        super().__init__(ImageProcedure, x_axis='X', y_axis='Y', z_axis='Z',
+                         journal_file=journal_file)
+
+    def queue(self, procedure=None):
+        if procedure is None:
+            procedure = self.make_procedure()
+        results = Results(procedure, unique_filename(self.data_directory))
+        self.manager.queue(self.new_experiment(results))
+
+
+def test_image_window_restores_the_journal(qtbot, tmpdir):
+    journal_file = str(tmpdir.join('queue.journal'))
+    window = ImageWindow(str(tmpdir), journal_file)
+    qtbot.addWidget(window)
+    window.manager._start_on_add = False
+    window.queue()
+    filename = window.manager.experiments[0].data_filename
+
+    restored = ImageWindow(str(tmpdir), journal_file)
+    qtbot.addWidget(restored)
+    assert len(restored.manager.experiments) == 1
+    experiment = restored.manager.experiments[0]
+    assert experiment.data_filename == filename
+    assert experiment.procedure.status == Procedure.QUEUED
+    assert restored.abort_button.text() == "Resume"
+
+
+class DashboardWindow(ManagedDashboardWindow):
+    def __init__(self, directory):
+        self.data_directory = directory
+        super().__init__(SequenceProcedure, plots=[('Value', 'Square')], inputs=['value'],
+                         x_axis='Value', y_axis='Square')
+
+    queue = SequenceWindow.queue
+
+
+def test_main_plot_reads_the_dashboard_subscription(qtbot, tmpdir):
+    window = DashboardWindow(str(tmpdir))
+    qtbot.addWidget(window)
+    sources = []
+    window.manager.running.connect(lambda experiment: sources.append(experiment.curve.results))
+    finished = []
+    window.manager.finished.connect(finished.append)
+
+    window.queue()
+    qtbot.waitUntil(lambda: len(finished) == 1, timeout=10000)
+    experiment = finished[0]
+    assert sources == [window.dashboard.subscription]
+    assert experiment.curve.results is experiment.results
+    assert list(experiment.curve.getData()[1]) == [0.]
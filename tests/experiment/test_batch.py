@@ -0,0 +1,100 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2021 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+
+import os
+import time
+
+import pytest
+
+from pymeasure.experiment import Procedure, Parameter, IntegerParameter
+from pymeasure.experiment.batch import BatchRunner, load_procedure_class, main
+from pymeasure.experiment.sequencer import Sequence, SequenceItem
+
+from data.procedure_for_testing import RandomProcedure
+
+
+class ResourceProcedure(Procedure):
+    index = IntegerParameter('Index', default=0)
+    resource = Parameter('Resource')
+
+    DATA_COLUMNS = ['Index', 'Start', 'Stop']
+
+    def execute(self):
+        start = time.perf_counter()
+        time.sleep(0.05)
+        if self.index == 2:
+            raise ValueError("Procedure fails")
+        self.emit('results', {'Index': self.index, 'Start': start,
+                              'Stop': time.perf_counter()})
+
+
+def data_files(directory):
+    return sorted(name for name in os.listdir(str(directory)) if name.startswith('DATA'))
+
+
+def test_load_procedure_class():
+    assert load_procedure_class('data.procedure_for_testing:RandomProcedure') is RandomProcedure
+    path = os.path.join(os.path.dirname(__file__), 'data', 'procedure_for_testing.py')
+    cls = load_procedure_class(path + ':RandomProcedure')
+    assert cls.__name__ == 'RandomProcedure'
+    with pytest.raises(ValueError):
+        load_procedure_class('os:path')
+
+
+def test_batch_runner_resumes(tmpdir):
+    sequence = Sequence([SequenceItem('index', range(4))])
+    messages = []
+    runner = BatchRunner(ResourceProcedure, sequence, str(tmpdir),
+                         parameters={'resource': 'A'}, report=messages.append)
+    assert not runner.run()
+    assert (runner.finished, runner.failed, runner.skipped) == (3, 1, 0)
+    assert data_files(tmpdir) == [
+        'DATA0.csv', 'DATA1.csv', 'DATA2.csv.part', 'DATA3.csv']
+    assert len(messages) == 5 and 'ETA' in messages[0]
+
+    runner = BatchRunner(ResourceProcedure, sequence, str(tmpdir),
+                         parameters={'resource': 'A'}, report=messages.append)
+    runner.run()
+    assert (runner.finished, runner.failed, runner.skipped) == (0, 1, 3)
+
+
+def test_batch_runner_in_parallel(tmpdir):
+    sequence = Sequence([SequenceItem('index', [0, 1, 3, 4])])
+    runner = BatchRunner(ResourceProcedure, sequence, str(tmpdir),
+                         resources=['A', 'B'], report=lambda message: None)
+    assert runner.run()
+    headers = [open(os.path.join(str(tmpdir), name)).read()
+               for name in data_files(tmpdir)]
+    assert sum('Resource: A' in header for header in headers) >= 1
+    assert sum('Resource: B' in header for header in headers) >= 1
+
+
+def test_main(tmpdir, capsys):
+    sequence_file = tmpdir.join('sequence.txt')
+    sequence_file.write('- "Loop Iterations", "[2, 3]"\n')
+    assert main(['data.procedure_for_testing:RandomProcedure', str(sequence_file),
+                 '-d', str(tmpdir.join('data')), '-s', 'delay=0']) == 0
+    assert data_files(tmpdir.join('data')) == ['DATA0.csv', 'DATA1.csv']
+    assert '2 finished' in capsys.readouterr().out
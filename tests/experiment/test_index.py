@@ -0,0 +1,135 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2021 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+
+import os
+from queue import Queue
+
+import pytest
+
+from pymeasure.experiment import Results, Worker
+from pymeasure.experiment.index import IndexEntry, ResultsIndex
+from pymeasure.experiment.listeners import Recorder
+
+from data.procedure_for_testing import RandomProcedure
+
+
+def make_results(directory, rows, name='data.csv'):
+    procedure = RandomProcedure()
+    procedure.iterations = rows
+    results = Results(procedure, os.path.join(str(directory), name))
+    with open(results.data_filename, 'a') as f:
+        for i in range(rows):
+            f.write(results.format({'Iteration': i, 'Random Number': i / 2}) + '\n')
+    return results
+
+
+def test_scan(tmpdir):
+    results = make_results(tmpdir, 10)
+    entry = IndexEntry.scan(results.data_filename)
+    assert entry.procedure.endswith('RandomProcedure')
+    assert entry.parameters['Loop Iterations'] == '10'
+    assert entry.columns == ['Iteration', 'Random Number']
+    assert entry.rows == 10
+    assert entry.stats is None
+    assert entry.is_current()
+    assert list(entry.data['Iteration']) == list(range(10))
+
+
+def test_scan_of_other_file(tmpdir):
+    filename = tmpdir.join('other.csv')
+    filename.write('x,y\n1,2\n')
+    with pytest.raises(ValueError):
+        IndexEntry.scan(str(filename))
+
+
+def test_downsampled_read(tmpdir):
+    results = make_results(tmpdir, 1000)
+    entry = IndexEntry.scan(results.data_filename)
+    data = entry.read(max_points=100)
+    assert len(data) == 100
+    assert list(data['Iteration'][:3]) == [0, 10, 20]
+
+
+def test_index_entry_is_rescanned_when_changed(tmpdir):
+    results = make_results(tmpdir, 5)
+    index = ResultsIndex(str(tmpdir))
+    assert index.get(results.data_filename) is None
+    assert index.entry(results.data_filename).rows == 5
+    assert index.get(results.data_filename).rows == 5
+    with open(results.data_filename, 'a') as f:
+        f.write('5,2.5\n6,3\n')
+    assert not index.get(results.data_filename).is_current()
+    assert ResultsIndex.lookup(results.data_filename).rows == 7
+    index.close()
+
+
+def test_recorder_indexes_results(tmpdir):
+    procedure = RandomProcedure()
+    procedure.iterations = 20
+    procedure.delay = 0
+    results = Results(procedure, str(tmpdir.join('data.csv')))
+    worker = Worker(results, index=True)
+    worker.start()
+    worker.join(timeout=None)
+
+    index = ResultsIndex(str(tmpdir))
+    entry = index.get(results.data_filename)
+    assert entry.is_current()
+    assert entry.rows == 20
+    assert entry.stats['Iteration'] == [0, 19]
+    assert 0 <= entry.stats['Random Number'][0] <= entry.stats['Random Number'][1] <= 1
+
+
+def test_recorder_without_index(tmpdir):
+    results = make_results(tmpdir, 0)
+    recorder = Recorder(results, Queue(), index=False)
+    recorder.start()
+    recorder.handle({'Iteration': 0, 'Random Number': 0.5})
+    recorder.stop()
+    assert results.version == 1
+    assert not os.path.exists(str(tmpdir.join(ResultsIndex.FILENAME)))
+
+
+def test_read_only_lookup_does_not_write(tmpdir):
+    results = make_results(tmpdir, 5)
+    index_filename = str(tmpdir.join(ResultsIndex.FILENAME))
+    assert ResultsIndex.lookup(results.data_filename, read_only=True).rows == 5
+    assert not os.path.exists(index_filename)
+
+    ResultsIndex.lookup(results.data_filename)
+    with open(results.data_filename, 'a') as f:
+        f.write('5,2.5\n')
+    mtime = os.stat(index_filename).st_mtime_ns
+    assert ResultsIndex.lookup(results.data_filename, read_only=True).rows == 6
+    assert os.stat(index_filename).st_mtime_ns == mtime
+    assert ResultsIndex.lookup(results.data_filename).rows == 6
+
+
+def test_recorder_does_not_index_by_default(tmpdir):
+    results = make_results(tmpdir, 0)
+    worker = Worker(results)
+    worker.start()
+    worker.join(timeout=None)
+    assert not os.path.exists(str(tmpdir.join(ResultsIndex.FILENAME)))
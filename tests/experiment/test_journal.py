@@ -0,0 +1,91 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2021 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+
+import os
+
+from pymeasure.experiment import Procedure, Results
+from pymeasure.experiment.journal import QueueJournal
+
+from data.procedure_for_testing import RandomProcedure
+
+
+def make_results(directory, name, iterations):
+    procedure = RandomProcedure()
+    procedure.iterations = iterations
+    return Results(procedure, os.path.join(str(directory), name))
+
+
+def test_journal_records_experiments(tmpdir):
+    journal = QueueJournal(str(tmpdir.join('queue.db')))
+    first = make_results(tmpdir, 'first.csv', 10)
+    second = make_results(tmpdir, 'second.csv', 20)
+    journal.add(first)
+    journal.add(second)
+    journal.update_status(first.data_filename, Procedure.RUNNING)
+    journal.update_status(first.data_filename, Procedure.FINISHED)
+    journal.update_status('unknown.csv', Procedure.FAILED)
+
+    assert len(journal) == 2
+    assert journal.status(first.data_filename) == Procedure.FINISHED
+    assert journal.status(second.data_filename) == Procedure.QUEUED
+    assert journal.status('unknown.csv') is None
+    assert [status for status, _ in journal.transitions(first.data_filename)] == [
+        Procedure.QUEUED, Procedure.RUNNING, Procedure.FINISHED]
+
+    journal.remove(second.data_filename)
+    assert len(journal) == 1
+    assert journal.transitions(second.data_filename) == []
+    journal.close()
+
+
+def test_journal_is_restored(tmpdir):
+    filename = str(tmpdir.join('queue.db'))
+    journal = QueueJournal(filename)
+    results = make_results(tmpdir, 'data.csv', 42)
+    journal.add(results)
+    journal.update_status(results.data_filename, Procedure.RUNNING)
+    journal.close()
+
+    entries = QueueJournal(filename).entries()
+    assert len(entries) == 1
+    entry = entries[0]
+    assert entry.data_filename == os.path.abspath(results.data_filename)
+    assert entry.procedure.endswith('RandomProcedure')
+    assert entry.status == Procedure.RUNNING
+    assert entry.parameters['iterations'] == 42
+
+    procedure = RandomProcedure()
+    procedure.set_parameters(entry.parameters)
+    assert procedure.parameter_values() == results.procedure.parameter_values()
+
+
+def test_requeue_updates_entry(tmpdir):
+    journal = QueueJournal(str(tmpdir.join('queue.db')))
+    results = make_results(tmpdir, 'data.csv', 1)
+    journal.add(results)
+    journal.update_status(results.data_filename, Procedure.ABORTED)
+    journal.add(results)
+    assert len(journal) == 1
+    assert journal.status(results.data_filename) == Procedure.QUEUED
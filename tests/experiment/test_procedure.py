@@ -26,7 +26,8 @@ import pytest
 import pickle
 
 from pymeasure.experiment.procedure import Procedure, ProcedureWrapper
-from pymeasure.experiment.parameters import Parameter
+from pymeasure.experiment.parameters import Parameter, Measurable
+from pymeasure.experiment.schema import Column
 
 from data.procedure_for_testing import RandomProcedure
 
@@ -44,7 +45,85 @@ def test_parameters():
     assert 'x' in objs
     assert objs['x'].value == p.x
 
-# TODO: Add tests for measureables
+
+def test_parameters_are_independent_between_instances():
+    class TestProcedure(Procedure):
+        x = Parameter('X', default=5)
+        y = Parameter('Y')
+
+    first, second = TestProcedure(), TestProcedure()
+    first.x = 10
+    assert first.parameter_objects()['x'].value == 10
+    assert second.parameter_objects()['x'].value == 5
+    assert TestProcedure.x.value == 5
+    assert second.y is None
+    assert list(first.parameter_objects()) == ['x', 'y']
+
+
+def test_class_attributes_are_cached():
+    class TestProcedure(Procedure):
+        x = Parameter('X', default=5)
+
+    class SubProcedure(TestProcedure):
+        z = Parameter('Z', default=1)
+
+    TestProcedure()
+    assert TestProcedure._class_attributes() is TestProcedure._class_attributes()
+    assert TestProcedure._class_attributes()[0] == ('x',)
+    assert SubProcedure._class_attributes()[0] == ('x', 'z')
+
+
+def test_measurables_define_data_columns():
+    class TestProcedure(Procedure):
+        voltage = Measurable('Voltage (V)', dtype=float)
+        current = Measurable('Current', units='A')
+
+    class SubProcedure(TestProcedure):
+        count = Measurable('Count', dtype=int)
+        temperature = Measurable('Temperature', measure=False)
+
+    assert TestProcedure.DATA_COLUMNS == ['Voltage (V)', 'Current']
+    assert SubProcedure.DATA_COLUMNS == ['Voltage (V)', 'Current', 'Count']
+    assert Procedure.DATA_COLUMNS == []
+    assert not hasattr(Measurable, 'DATA_COLUMNS')
+
+
+def test_measurables_are_not_read_on_definition():
+    calls = []
+
+    class TestProcedure(Procedure):
+        x = Measurable('X', fget=lambda: calls.append(1) or len(calls))
+
+    assert calls == []
+    p = TestProcedure()
+    assert p.get_datapoint() == {'X': 1}
+
+
+def test_read_measurables_in_one_batch():
+    class TestProcedure(Procedure):
+        x = Measurable('X', fget=lambda: pytest.fail("X read individually"))
+        y = Measurable('Y', default=3)
+
+        def read_measurables(self):
+            return {'X': 1}
+
+    assert TestProcedure().get_datapoint() == {'X': 1, 'Y': 3}
+
+
+def test_measurement_schema():
+    class TestProcedure(Procedure):
+        DATA_COLUMNS = ['Time (s)', 'Voltage', 'Counts']
+        voltage = Measurable('Voltage', units='V', dtype=float)
+
+    schema = TestProcedure.measurement_schema()
+    assert schema.names == TestProcedure.DATA_COLUMNS
+    assert schema['Voltage'] == Column('Voltage', float, 'V')
+    assert schema.dtypes == {'Voltage': float}
+    assert schema.units == {'Time (s)': 's', 'Voltage': 'V'}
+    assert schema.numpy_dtype().names == ('Time (s)', 'Voltage', 'Counts')
+    assert TestProcedure.measurement_schema() is schema  # cached per class
+    TestProcedure.DATA_COLUMNS = ['Voltage']
+    assert TestProcedure.measurement_schema().names == ['Voltage']
 
 def test_procedure_wrapper():
     assert RandomProcedure.iterations.value == 100
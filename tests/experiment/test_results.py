@@ -31,9 +31,9 @@ import pickle
 from importlib.machinery import SourceFileLoader
 import pandas as pd
 import numpy as np
-from pymeasure.experiment.results import Results, CSVFormatter
+from pymeasure.experiment.results import Results, CSVFormatter, _import_procedure_class
 from pymeasure.experiment.procedure import Procedure, Parameter
-from pymeasure.experiment import BooleanParameter
+from pymeasure.experiment import BooleanParameter, Column, MeasurementSchema
 
 # Load the procedure, without it being in a module
 #data_path = os.path.join(os.path.dirname(__file__), 'data/procedure_for_testing.py')
@@ -64,6 +64,14 @@ def test_csv_formatter_format():
     assert formatter.format(data) == '1,-1,2,3.0,abc'
 
 
+def test_csv_formatter_converts_to_schema_dtypes():
+    schema = MeasurementSchema([Column('t', dtype=int), Column('x', dtype=float),
+                                Column('V', units='V')])
+    formatter = CSVFormatter(columns=['t', 'x', 'V'], schema=schema)
+    assert formatter.format({'t': 3.0, 'x': 1, 'V': 'abc'}) == '3,1.0,abc'
+    assert formatter.format({'t': float('nan'), 'x': None, 'V': 2}) == 'nan,None,2'
+
+
 def test_procedure_wrapper():
     assert RandomProcedure.iterations.value == 100
     procedure = RandomProcedure()
@@ -82,7 +90,7 @@ class TestResults:
 
     @mock.patch('pymeasure.experiment.results.open', mock.mock_open(), create=True)
     @mock.patch('os.path.exists', return_value=True)
-    @mock.patch('pymeasure.experiment.results.pd.read_csv')
+    @mock.patch('pandas.read_csv')
     def test_regression_attr_data_when_up_to_date_should_retain_dtype(self,
             read_csv_mock, path_exists_mock):
         procedure_mock = mock.MagicMock(spec=Procedure)
@@ -138,3 +146,63 @@ def test_parameter_reading():
     assert results.parameters["check_true"].value == True
     assert results.parameters["check_false"].value == False
     assert results.parameters["check_dir"].value == test_string
+
+
+def test_load_reads_only_the_header(tmpdir):
+    filename = os.path.join(str(tmpdir), 'data.csv')
+    results = Results(RandomProcedure(), filename)
+    with open(filename, 'a') as f:
+        f.write('1,0.5\n2,0.25\n')
+
+    with mock.patch('pandas.read_csv') as read_csv_mock:
+        loaded = Results.load(filename, procedure_class=RandomProcedure)
+    read_csv_mock.assert_not_called()
+    assert loaded._header_count == results._header_count
+    assert list(loaded.data['Iteration']) == [1, 2]
+
+
+def test_header_count_of_existing_file(tmpdir):
+    filename = os.path.join(str(tmpdir), 'data.csv')
+    Results(RandomProcedure(), filename)
+    with open(filename, 'a') as f:
+        f.write('1,0.5\n')
+    results = Results(RandomProcedure(), filename)
+    assert len(results.data) == 1
+    with open(filename, 'a') as f:
+        f.write('2,0.25\n')
+    assert list(results.data['Iteration']) == [1, 2]
+
+
+def test_parsed_headers_are_cached(tmpdir):
+    filename = os.path.join(str(tmpdir), 'data.csv')
+    Results(RandomProcedure(), filename)
+    with mock.patch('pymeasure.experiment.results.import_module') as import_mock:
+        import_mock.return_value.RandomProcedure = RandomProcedure
+        first = Results.load(filename)
+        second = Results.load(filename)
+    assert import_mock.call_count <= 1
+    assert type(first.procedure) is type(second.procedure) is RandomProcedure
+
+
+def test_version_changes_when_the_file_grows(tmpdir):
+    filename = os.path.join(str(tmpdir), 'data.csv')
+    results = Results(RandomProcedure(), filename)
+    version = results.version
+    assert results.version == version
+    with open(filename, 'a') as f:  # e.g. written by another process
+        f.write('1,0.5\n')
+    assert results.version != version
+    version = results.version
+    results.notify()
+    assert results.version == version + 1
+
+
+def test_failed_procedure_imports_are_not_cached():
+    with mock.patch('pymeasure.experiment.results.import_module') as import_mock:
+        import_mock.side_effect = ImportError
+        assert _import_procedure_class('not_installed', 'MyProcedure') is None
+        import_mock.side_effect = None  # e.g. the module was installed meanwhile
+        import_mock.return_value.MyProcedure = RandomProcedure
+        assert _import_procedure_class('not_installed', 'MyProcedure') is RandomProcedure
+        assert _import_procedure_class('not_installed', 'MyProcedure') is RandomProcedure
+    assert import_mock.call_count == 2
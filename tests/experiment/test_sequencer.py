@@ -0,0 +1,94 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2021 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+
+import pytest
+
+from pymeasure.experiment import Procedure, FloatParameter
+from pymeasure.experiment.sequencer import (Sequence, SequenceItem,
+                                            SequenceEvaluationException,
+                                            read_sequence_file)
+
+from data.procedure_for_testing import RandomProcedure
+
+SEQUENCE_FILE = '''\
+- "Delay Time", "arange(0.25, 1, 0.25)"
+-- "Random Seed", "[1, 4, 8]"
+--- "Loop Iterations", "[10, 20]"
+-- "Random Seed", "arange(10, 40, 10)"
+'''
+
+
+@pytest.fixture
+def sequence_file(tmp_path):
+    filename = tmp_path / 'sequence.txt'
+    filename.write_text(SEQUENCE_FILE)
+    return str(filename)
+
+
+def test_read_sequence_file(sequence_file):
+    entries = read_sequence_file(sequence_file)
+    assert entries[0] == (0, 'Delay Time', 'arange(0.25, 1, 0.25)')
+    assert [level for level, _, _ in entries] == [0, 1, 2, 1]
+
+
+def test_sequence_from_file(sequence_file):
+    sequence = Sequence.load(sequence_file, RandomProcedure)
+    assert len(sequence) == 3 * (3 * 2 + 3)
+    parameters = list(sequence)
+    assert len(parameters) == len(sequence)
+    assert parameters[0] == {'delay': 0.25, 'seed': 1, 'iterations': 10}
+    assert parameters[1] == {'delay': 0.25, 'seed': 1, 'iterations': 20}
+    assert parameters[6] == {'delay': 0.25, 'seed': 10}
+    assert parameters[9] == {'delay': 0.5, 'seed': 1, 'iterations': 10}
+
+
+def test_sequence_with_unknown_parameter(sequence_file):
+    class OtherProcedure(Procedure):
+        delay = FloatParameter('Delay Time')
+
+    with pytest.raises(ValueError):
+        Sequence.load(sequence_file, OtherProcedure)
+
+
+def test_sequence_is_generated_lazily():
+    sequence = Sequence([SequenceItem(name, range(100), children=[
+        SequenceItem('y', range(100))]) for name in 'abc'])
+    assert len(sequence) == 30000
+    iterator = iter(sequence)
+    assert next(iterator) == {'a': 0, 'y': 0}
+    assert next(iterator) == {'a': 0, 'y': 1}
+
+
+def test_sequence_procedures():
+    sequence = Sequence([SequenceItem('seed', '[1, 2]')])
+    procedures = sequence.procedures(RandomProcedure, iterations=5)
+    first = next(procedures)
+    assert (first.seed, first.iterations) == (1, 5)
+    assert next(procedures).seed == 2
+
+
+def test_invalid_sequence_string():
+    with pytest.raises(SequenceEvaluationException):
+        SequenceItem('seed', 'arange(1, 2')
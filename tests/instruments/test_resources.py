@@ -0,0 +1,97 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2021 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+
+import importlib.util
+import time
+
+import pytest
+
+from pymeasure.adapters import connections
+from pymeasure.instruments import find_resources, find_resources_in_background
+from pymeasure.instruments.resources import ResourceInfo
+
+is_pyvisa_sim_installed = bool(importlib.util.find_spec('pyvisa_sim'))
+if not is_pyvisa_sim_installed:
+    pytest.skip('PyVISA tests require the pyvisa-sim library', allow_module_level=True)
+
+QUERY = 'ASRL?*::INSTR'
+
+
+@pytest.fixture(autouse=True)
+def clear_connections():
+    yield
+    connections.close()
+
+
+def test_find_resources():
+    infos = find_resources(QUERY, visa_library='@sim', timeout=0.2)
+    resources = {info.resource: info for info in infos}
+    assert resources['ASRL2::INSTR'].idn == "SCPI,MOCK,VERSION_1.0"
+    assert resources['ASRL2::INSTR'].error is None
+    assert resources['ASRL5::INSTR'].idn is None
+    assert "VI_ERROR_TMO" in resources['ASRL5::INSTR'].error
+    assert "ASRL5::INSTR" in resources['ASRL5::INSTR'].error
+    assert all(info.latency >= 0 for info in infos)
+
+
+def test_find_resources_in_parallel():
+    start = time.perf_counter()
+    infos = find_resources('?*::INSTR', visa_library='@sim', timeout=0.2,
+                           max_workers=32)
+    assert len([info for info in infos if info.error]) > 5
+    # sequential discovery takes at least the sum of all timeouts
+    assert time.perf_counter() - start < sum(info.latency for info in infos)
+
+
+def test_find_resources_cache(tmp_path):
+    cache_file = str(tmp_path / "resources.json")
+    infos = find_resources(QUERY, visa_library='@sim', timeout=0.2,
+                           cache_file=cache_file)
+    cached = find_resources(QUERY, visa_library='@sim', cache_file=cache_file)
+    assert cached == infos
+    assert all(isinstance(info, ResourceInfo) for info in cached)
+    expired = find_resources(QUERY, visa_library='@sim', timeout=0.2,
+                             cache_file=cache_file, ttl=0)
+    assert expired != infos  # new latencies
+
+
+@pytest.mark.parametrize('content', [
+    '[]',
+    '{"query": "ASRL?*::INSTR", "visa_library": "@sim"}',
+    '{"query": "ASRL?*::INSTR", "visa_library": "@sim", "resources": [[1]]}'])
+def test_find_resources_ignores_malformed_cache(tmp_path, content):
+    cache_file = tmp_path / "resources.json"
+    cache_file.write_text(content)
+    infos = find_resources(QUERY, visa_library='@sim', timeout=0.2,
+                           cache_file=str(cache_file), ttl=float('inf'))
+    assert 'ASRL2::INSTR' in [info.resource for info in infos]
+
+
+def test_find_resources_in_background(tmp_path):
+    cache_file = str(tmp_path / "resources.json")
+    future = find_resources_in_background(query=QUERY, visa_library='@sim',
+                                          timeout=0.2, cache_file=cache_file)
+    infos = future.result(timeout=10)
+    assert find_resources(QUERY, visa_library='@sim', cache_file=cache_file) == infos
@@ -0,0 +1,89 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2021 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+
+""" Regression tests and benchmark of the import time of pymeasure. Run this
+file as a script to print the cumulative import times. """
+
+import re
+import subprocess
+import sys
+
+import pytest
+
+
+def imported_modules(module):
+    """ Returns the set of modules loaded by importing a module in a fresh
+    interpreter """
+    code = f"import sys, {module}; print(' '.join(sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], check=True,
+                            capture_output=True, text=True)
+    return set(result.stdout.split())
+
+
+def import_time(module):
+    """ Returns the cumulative import time of a module in seconds as reported
+    by 'python -X importtime' in a fresh interpreter """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c",
+                             f"import {module}"],
+                            check=True, capture_output=True, text=True)
+    pattern = r"import time:\s+\d+ \|\s+(\d+) \| %s$" % re.escape(module)
+    return int(re.search(pattern, result.stderr, re.MULTILINE).group(1)) * 1e-6
+
+
+@pytest.mark.parametrize("module", ["pymeasure.instruments.keithley",
+                                    "pymeasure.instruments.ni",
+                                    "pandas",
+                                    "pyvisa",
+                                    "serial"])
+def test_instruments_import_is_lazy(module):
+    assert module not in imported_modules("pymeasure.instruments")
+
+
+def test_vendor_packages_are_accessible():
+    import pymeasure.instruments
+    assert pymeasure.instruments.keithley.Keithley2000.__name__ == "Keithley2000"
+    assert callable(pymeasure.instruments.list_resources)
+    assert "srs" in dir(pymeasure.instruments)
+
+
+@pytest.mark.parametrize("module", ["pandas",
+                                    "zmq",
+                                    "cloudpickle",
+                                    "IPython",
+                                    "pyqtgraph"])
+def test_experiment_import_is_lazy(module):
+    assert module not in imported_modules("pymeasure.experiment")
+
+
+@pytest.mark.parametrize("module", ["pandas", "pyqtgraph", "PyQt5", "PySide2"])
+def test_display_import_is_lazy(module):
+    assert module not in imported_modules("pymeasure.display")
+
+
+if __name__ == "__main__":
+    for module in ("pymeasure", "pymeasure.adapters", "pymeasure.instruments",
+                   "pymeasure.experiment", "pymeasure.display",
+                   "pymeasure.display.windows"):
+        print(f"{module:30s} {import_time(module) * 1000:8.1f} ms")